@@ -1,40 +1,71 @@
+import startup #timpi de pornire (importat primul ca sa prinda tot)
+import perf_trace #masuratori pe caile fierbinti (db, ml, harta, UI) + tab-ul ascuns de diagnoza
 import os #cai/fisiere/foldere, join, exists, dirname, etc.
-import json # citire/scriere fisiere .json (liste/dict-uri)
+import importlib #importuri amanate (matplotlib) + verificare ca un modul e instalat
+import importlib.util
 import random #alegeri random (quiz random, nickname random)
-import sqlite3 #baza de date locala (fisier .db) fara server, SQL direct din Python
-import datetime as dt #data/ora curenta
-import webbrowser #deschide browserul implicit (ex: map.html)
+import time #numele fisierelor exportate din diagnoza
+import webbrowser #deschide browserul implicit (ex: harta html)
+from pathlib import Path #cale -> URL file:// corect pe orice OS
 import customtkinter as ctk #UI modern cu Tkinter
 import tkinter.messagebox as mb #mesaje pop-up (Tkinter) (yes/no, warning, info)
-from PIL import Image, ImageTk #manipulare(lucrat cu ) imagini(Pillow) & pt afisare in Tkinter(ImageTk)
+from PIL import Image #manipulare(lucrat cu ) imagini(Pillow); cache-ul de PhotoImage e in assets_cache.py
 from functools import partial #intr-un fel lipeste param intr-o functie ex util pt butoane
 # ML (local) - predictor reciclare
-from ml_model import load_or_train, predict_proba
-
-
-try:
-    import matplotlib #librarie de grafice (fol pt acele bare de la statistici)
-    matplotlib.use("TkAgg") #pentru a merge graficele in Tkinter
-    from matplotlib.figure import Figure
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg #pune figura matplotlib in Tkinter
-    MPL = True
-except Exception:
-    #daca nu e instalat sau nu merge aplicatia doar dezactiveaza graficele
-    MPL = False
-
-try:
-    import folium #harta interactiva (html)
-    FOLIUM_OK = True
-except Exception:
-    #daca lipseste ,harta iti spune sa dai pip install folium
-    FOLIUM_OK = False
+# (sklearn se importa abia pe thread-ul de incarcare, nu aici)
+from ml_model import ML_TO_UI_CAT, BackgroundLoader, PredictionCache, normalize_text, predict_proba #ML_TO_UI_CAT: label ML -> categoria din UI/harta
+from ml_online import ONLINE_MODEL_FILE, load_online_model #modelul care invata din corecturile userilor
+# DB (SQLite cu pool de conexiuni + scrieri grupate)
+from db import DB
+from review_feed import ReviewFeed #lista virtualizata de recenzii (paginata pe id)
+
+
+# matplotlib (graficul din Statistici) se importa abia la primul grafic; aici doar verificam ca e instalat
+MPL = importlib.util.find_spec("matplotlib") is not None
+
+# harta: randare folium + cache (FOLIUM_OK e False daca folium lipseste; folium se importa la prima randare)
+from map_render import FOLIUM_OK, MAP_CATEGORIES, MAP_CENTER, MapCache, filter_page
+from geo_index import PointIndex #cel mai apropiat punct de colectare pt o categorie
+from text_index import TextIndex, normalize_prefix #texte de antrenare asemanatoare ("ai vrut sa scrii", exemple apropiate)
+from autocomplete import Autocomplete #sugestii pe masura ce userul scrie in tab-ul AI
+from assets_cache import ImageCache, zoom_sizes #imagini decodate/redimensionate o singura data
+from scheduler import TkScheduler #sarcini lente pe thread-uri, rezultatul inapoi pe Tk prin after()
 
 APP_TITLE = "GreenVision"
-DB_PATH = "greenvision.db"
 BASE_DIR = os.path.dirname(__file__)
 ASSETS_DIR = os.path.join(BASE_DIR, "assets")
-MAP_HTML = os.path.join(BASE_DIR, "map.html")
-COLLECT_JSON = os.path.join(BASE_DIR, "collect_points.json")
+MASCOT_IMG = os.path.join(ASSETS_DIR, "144294ed-a719-4caf-b446-6de72ac4e46c.png")
+# marimile imaginii de container din ghid: mare (apare) -> mica (se aseaza sub text)
+GUIDE_IMG_SIZES = ((420, 420), (240, 240))
+
+
+# param: none
+# importa matplotlib (backend TkAgg) la primul grafic; intoarce (Figure, FigureCanvasTkAgg) sau None daca nu merge
+def _load_matplotlib():
+    global MPL
+    try:
+        import matplotlib #librarie de grafice (fol pt acele bare de la statistici)
+        matplotlib.use("TkAgg") #pentru a merge graficele in Tkinter
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg #pune figura matplotlib in Tkinter
+        return Figure, FigureCanvasTkAgg
+    except Exception:
+        #daca nu e instalat sau nu merge aplicatia doar dezactiveaza graficele
+        MPL = False
+        return None
+
+
+# param: none
+# locatia kiosk-ului pt "unde il duc?": GREENVISION_LOCATION="lat,lon", altfel centrul hartii
+def _kiosk_location():
+    try:
+        lat, lon = (float(x) for x in os.environ["GREENVISION_LOCATION"].split(","))
+        return lat, lon
+    except (KeyError, ValueError):
+        return MAP_CENTER
+
+
+startup.mark("importuri app.py")
 #print("CWD (de unde ruleaza):", os.getcwd())
 
 #print("DB absolute path:", os.path.abspath(DB_PATH))
@@ -47,87 +78,6 @@ FONT_BODY_B= ("Segoe UI", 16, "bold")
 TEXT_DARK  = "#1B4332"  
 
 
-class DB:
-# param: none
-# constructor, seteaza calea db-ului si initializeaza tabelele daca nu exista
-    def __init__(self):
-        self.path = DB_PATH
-        self._init_db()
-# returneaza un connection sqlite catre fisierul db (folosit cu "with")
-    def _conn(self):
-        return sqlite3.connect(self.path)
-#creeaza tabelele necesare (stats, recycle, quiz, reviews) + seed pt stats (id=1)
-    def _init_db(self):
-        with self._conn() as con:
-            con.execute("CREATE TABLE IF NOT EXISTS stats(id INTEGER PRIMARY KEY CHECK (id=1), stars INTEGER DEFAULT 0)")
-            con.execute("INSERT OR IGNORE INTO stats(id, stars) VALUES (1, 0)")
-            con.execute("CREATE TABLE IF NOT EXISTS recycle(category TEXT, created_at TEXT)")
-            con.execute("CREATE TABLE IF NOT EXISTS quiz(score INT, total INT, created_at TEXT)")
-            con.execute("""
-                CREATE TABLE IF NOT EXISTS reviews(
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    nickname TEXT NOT NULL,
-                    rating INTEGER NOT NULL CHECK(rating BETWEEN 1 AND 5),
-                    comment TEXT NOT NULL,
-                    created_at TEXT NOT NULL
-                )
-            """)
-
-# param: n=1 (int)->cate stelute adauga
-#  creste numarul de stelute din stats (id=1)
-    def add_star(self, n=1):
-        with self._conn() as con:
-            con.execute("UPDATE stats SET stars = stars + ? WHERE id=1", (n,))
-# param: none
-# citeste cate stelute ai strans pana acum (fallback 0 daca nu gaseste randul)
-    def get_stars(self):
-        with self._conn() as con:
-            row = con.execute("SELECT stars FROM stats WHERE id=1").fetchone()
-            return row[0] if row else 0
-
-# param: cat (str)->categoria reciclata (ex: "Plastic")
-# salveaza un log in tabelul recycle cu timestamp
-    def log_recycle(self, cat):
-        with self._conn() as con:
-            con.execute("INSERT INTO recycle VALUES (?, ?)", (cat, dt.datetime.now().isoformat()))
-
-# param: score (int), total (int)
-# salveaza un log in tabelul quiz cu scor + total + timestamp
-    def log_quiz(self, score, total):
-        with self._conn() as con:
-            con.execute("INSERT INTO quiz VALUES (?, ?, ?)", (score, total, dt.datetime.now().isoformat()))
-    # param: none
-    # calculeaza statistici quiz:
-    # - best = cel mai mare scor
-    # - avg = media procentuala (scor/total)
-    # - count = cate quizuri s-au dat
-    def quiz_stats(self):
-        with self._conn() as con:
-            rows = con.execute("SELECT score, total FROM quiz").fetchall()
-        if not rows:
-            return 0, 0.0, 0
-        best = max((s for s, _ in rows))
-        avg = sum(s/t for s, t in rows) / len(rows) * 100
-        count = len(rows)
-        return best, avg, count
-
-# param: nickname (str), rating (int 1..5), comment (str)
-#  adauga o recenzie in tabela reviews cu timestamp
-    def add_review(self, nickname, rating, comment):
-        with self._conn() as con:
-            con.execute(
-                "INSERT INTO reviews(nickname, rating, comment, created_at) VALUES (?,?,?,?)",
-                (nickname, rating, comment, dt.datetime.now().isoformat()),
-            )
-# param: none
-# ia lista de recenzii (cele mai noi primele)
-    def get_reviews(self):
-        with self._conn() as con:
-            return con.execute(
-                "SELECT nickname, rating, comment, created_at FROM reviews ORDER BY id DESC"
-            ).fetchall()
-
-
 GUIDE = {
     "Plastic": ("Container galben", ["PET-uri curate", "Doze aluminiu", "Folie curată"], ["Plastic murdar", "Jucării"], "Strivește și clătește înainte de reciclare."),
     "Hârtie": ("Container albastru", ["Ziare, cutii carton", "Caiete"], ["Hârtie cerată", "Șervețele murdare"], "Îndepărtează capsele și pliază cartonul."),
@@ -174,17 +124,19 @@ QUIZ_POOL = [
     ("Ambalaje din plastic cu resturi...", ["Se clătesc sau NU se reciclează", "La plastic oricum", "La sticlă"], 0),
 ]
 QUIZ_LENGTH = 8
-# ML labels (fara diacritice) -> categories din UI (cu diacritice unde ai in GUIDE)
-ML_TO_UI_CAT = {
-    "Plastic": "Plastic",
-    "Hartie": "Hârtie",
-    "Sticla": "Sticlă",
-    "Metal": "Metal",
-    "Electronice": "Electronice",   # atentie: GUIDE nu are Electronice (doar harta are)
-    "Ulei uzat": "Ulei uzat",       # GUIDE nu are Ulei uzat
-    "Baterii": "Baterii",
-    "Nereciclabil": "Nereciclabil"  # nu exista in GUIDE
-}
+GUIDE_TAB = " Ghid"
+STATS_TAB = " Statistici"
+# cat asteapta refresh-ul de statistici ca sa comaseze actualizarile venite una dupa alta
+STATS_DEBOUNCE_MS = 150
+# tab-ul de diagnoza e ascuns: apare cu Ctrl+Shift+D (sau din start daca masuratorile sunt pornite)
+DIAG_TAB = " Diagnoză"
+DIAG_DIR = os.path.join(BASE_DIR, "diagnostics")
+DIAG_REFRESH_MS = 1000
+# autocomplete in tab-ul AI: cat asteapta dupa ultima tasta inainte sa caute + cate sugestii arata
+COMPLETE_DEBOUNCE_MS = 120
+COMPLETE_K = 5
+# invers: categoria aleasa de user la corectura -> label ML
+UI_TO_ML_CAT = {ui: ml for ml, ui in ML_TO_UI_CAT.items()}
 
 
 class SplashScreen(ctk.CTkToplevel):
@@ -198,12 +150,12 @@ class SplashScreen(ctk.CTkToplevel):
         self.configure(fg_color="#F2F7F2")
         self.resizable(False, False)
 
-        mascot = os.path.join(ASSETS_DIR, "144294ed-a719-4caf-b446-6de72ac4e46c.png")
         self.img_label = ctk.CTkLabel(self, text="")
         self.img_label.pack(pady=(30,10))
-        if os.path.exists(mascot):
-            self._img = Image.open(mascot)
-            self._zoom_scale = 0.30
+        if os.path.exists(MASCOT_IMG):
+            # cadrele se calculeaza in fundal (GreenVision le porneste inainte de splash)
+            self._zoom = zoom_sizes()
+            self._zoom_i = 0
             self.after(40, self._animate_zoom)
 
         ctk.CTkLabel(self, text="GreenVision", font=FONT_TITLE, text_color=TEXT_DARK).pack(pady=(4,2))
@@ -211,14 +163,17 @@ class SplashScreen(ctk.CTkToplevel):
         ctk.CTkButton(self, text="🌱 Intră în aplicație", fg_color="#52B788", hover_color="#2D6A4F",
                       corner_radius=14, command=self._close).pack(pady=10)
 # param: none
-#  animatie zoom-in la imaginea mascot (creste treptat marimea)
+#  animatie zoom-in la imaginea mascot (creste treptat marimea); cadrele vin gata calculate din cache,
+#  iar daca un cadru nu e inca gata ramane cel de dinainte (animatia nu asteapta niciodata)
     def _animate_zoom(self):
-        if self._zoom_scale < 1.0:
-            self._zoom_scale += 0.015
-            size = max(40, int(260 * self._zoom_scale))
-            frame = self._img.resize((size, size), Image.LANCZOS)
-            self.tk_img = ImageTk.PhotoImage(frame)
-            self.img_label.configure(image=self.tk_img)
+        if self._zoom_i < len(self._zoom):
+            size = self._zoom[self._zoom_i]
+            self._zoom_i += 1
+            last = self._zoom_i == len(self._zoom)
+            assets = self.master.assets
+            if last or assets.ready(MASCOT_IMG, (size, size), Image.BILINEAR) is not None:
+                self.tk_img = assets.photo(MASCOT_IMG, (size, size), Image.BILINEAR)
+                self.img_label.configure(image=self.tk_img)
             self.after(40, self._animate_zoom)
 # param: none
 #  inchide splash-ul si apeleaza callback-ul (porneste ecranul principal)
@@ -232,9 +187,40 @@ class GreenVision(ctk.CTk):
 #  fereastra principala a aplicatiei (setup db, tema, splash, etc)
     def __init__(self):
         super().__init__()
+        startup.mark("fereastra Tk creata")
         self.db = DB()
-        # incarca modelul ML (daca nu exista, il antreneaza din json)
-        self.ml_bundle = load_or_train()
+        # tot ce e lent (predictii, citiri db pt statistici, harta, invatare) ruleaza aici, nu in callback-urile Tk;
+        # predictiile si autocomplete-ul au lane-ul lor ("interactive") ca sa nu astepte dupa harta sau statistici
+        self.tasks = TkScheduler(self)
+        # refresh-ul de statistici programat (debounce) + graficul ramas de desenat cat tab-ul e ascuns
+        self._stats_after = None
+        self._stats_pending = None
+        # tab-ul de diagnoza (ascuns pana la Ctrl+Shift+D)
+        self.diag_tab = self.diag_text = None
+        self._diag_after = None
+        # incarca modelul ML in fundal (daca nu exista, il antreneaza din json + feedback-ul din db); UI-ul nu il asteapta
+        self.ml_online = None
+        self._ai_pending = []
+        self._ai_last = None
+        self.ml_loader = BackgroundLoader(load=lambda: load_online_model(self.db), name="ml-loader").start()
+        # cererile repetate la kiosk ("pet de apa", "doza aluminiu"...) nu mai trec prin TF-IDF + NB
+        self.ml_cache = PredictionCache(model_file=ONLINE_MODEL_FILE)
+        self.after(100, self._poll_model)
+        # imaginile: cadrele de zoom din splash + containerele din ghid se pregatesc in fundal
+        self.assets = ImageCache()
+        if os.path.exists(MASCOT_IMG):
+            self.assets.zoom_frames(MASCOT_IMG, zoom_sizes())
+        for name in sorted(set(IMG_MAP.values())):
+            img_path = os.path.join(ASSETS_DIR, name)
+            if os.path.exists(img_path):
+                self.assets.prefetch(img_path, GUIDE_IMG_SIZES)
+        # indexul spatial al punctelor de colectare se construieste tot in fundal
+        self.point_loader = BackgroundLoader(load=PointIndex.from_file, name="point-index-loader").start()
+        # la fel indexul de trigrame peste textele de antrenare (reconstruit doar cand se schimba ml_recycle_data.json);
+        # autocomplete-ul merge (doar cu istoricul cererilor) si pana e gata indexul
+        self.autocomplete = Autocomplete()
+        self._complete_after = None
+        self.text_loader = BackgroundLoader(load=self._load_text_index, name="text-index-loader").start()
 
         self.title(APP_TITLE)
         self.geometry("1120x740")
@@ -242,6 +228,7 @@ class GreenVision(ctk.CTk):
         ctk.set_default_color_theme("green")
         ctk.set_appearance_mode("light")
         self.protocol("WM_DELETE_WINDOW", self._confirm_exit)
+        self.bind("<Control-D>", lambda e: self._toggle_diagnostics())
 
         self.withdraw()
         self.after(300, self._show_splash)
@@ -249,6 +236,25 @@ class GreenVision(ctk.CTk):
 #  arata fereastra de splash
     def _show_splash(self):
         SplashScreen(self, self._start_main)
+        startup.mark("splash afisat")
+# param: none
+# verifica periodic daca modelul ML s-a incarcat; cand e gata ruleaza cererile AI puse in asteptare
+    def _poll_model(self):
+        if not self.ml_loader.done.is_set():
+            self.after(100, self._poll_model)
+            return
+        startup.mark(f"model ML gata ({self.ml_loader.seconds:.2f}s pe thread)")
+        self._print_startup_report()
+        if self.ml_loader.error is not None:
+            if hasattr(self, "ai_result"):
+                self.ai_result.configure(text=f"Modelul AI nu a putut fi incarcat: {self.ml_loader.error}")
+            return
+        self.ml_online = self.ml_loader.bundle
+        if hasattr(self, "ai_result") and not self._ai_pending:
+            self.ai_result.configure(text="")
+        pending, self._ai_pending = self._ai_pending, []
+        for text in pending:
+            self._ai_submit(text)
 # param: none
 # porneste UI-ul principal (header + tabs + update stats)
    # def _start_main(self):
@@ -266,14 +272,37 @@ class GreenVision(ctk.CTk):
         self._build_header()
         self._build_tabs()
         self._update_stats()
+        if perf_trace.enabled():
+            self._toggle_diagnostics(select=False)
+        startup.mark("UI principal afisat")
+        startup.stop_profiling()
+        self._print_startup_report()
+        # dupa ce UI-ul e interactiv, matplotlib se importa in fundal ca primul grafic sa nu mai astepte
+        if MPL:
+            self.after(1500, lambda: self.tasks.submit(importlib.import_module, "matplotlib.figure", key="prewarm"))
      except Exception as e:
         mb.showerror("Eroare la start", repr(e))
         raise
 
+# param: none
+# printeaza raportul de pornire (daca e cerut) o singura data, dupa ce si UI-ul si modelul sunt gata
+    def _print_startup_report(self):
+        if not startup.enabled() or getattr(self, "_startup_reported", False):
+            return
+        if hasattr(self, "tabs") and self.ml_loader.done.is_set():
+            self._startup_reported = True
+            print(startup.report())
+
 # param: none
 # confirmare la iesire (popup yes/no). daca da -> inchide app
     def _confirm_exit(self):
         if mb.askyesno("Ieșire", "Sigur vrei să părăsești aplicația GreenVision?"):
+            self.tasks.shutdown()
+            self.db.close()
+            if os.environ.get("GREENVISION_DB_LATENCY"):
+                # raport latenta per operatie DB (ms), pt kiosk-urile care par lente
+                for op, st in self.db.latency_report().items():
+                    print(f"{op:<14} n={st['count']:<6} avg={st['avg_ms']:.2f}ms max={st['max_ms']:.2f}ms")
             self.destroy()
 # param: none
 # adauga 1 steluta (scurtatura pt buton)
@@ -295,22 +324,137 @@ class GreenVision(ctk.CTk):
 # param: none
 #  creeaza tab-urile (ghid, quiz, statistici, recenzii, harta) si le populeaza
     def _build_tabs(self):
-        self.tabs = ctk.CTkTabview(self)
+        self.tabs = ctk.CTkTabview(self, command=self._on_tab_change)
         self.tabs.pack(fill="both", expand=True, padx=10, pady=10)
 
-        self.guide_tab   = self.tabs.add(" Ghid")
+        self.guide_tab   = self.tabs.add(GUIDE_TAB)
         self.quiz_tab    = self.tabs.add(" Quiz")
-        self.stats_tab   = self.tabs.add(" Statistici")
+        self.stats_tab   = self.tabs.add(STATS_TAB)
         self.reviews_tab = self.tabs.add(" Recenzii")
         self.map_tab     = self.tabs.add(" Harta")
         self.ai_tab      = self.tabs.add(" AI")
 
-        self._build_guide()
-        self._build_quiz()
-        self._build_stats()
-        self._build_reviews()
-        self._build_map()
-        self._build_ai()
+        # fiecare tab se construieste la prima selectare; la pornire doar cel vizibil (Ghid)
+        self._tab_builders = {
+            GUIDE_TAB: self._build_guide,
+            " Quiz": self._build_quiz,
+            STATS_TAB: self._build_stats,
+            " Recenzii": self._build_reviews,
+            " Harta": self._build_map,
+            " AI": self._build_ai,
+        }
+        self._build_tab(self.tabs.get())
+# param: name (str) -> numele tab-ului
+# construieste tab-ul daca inca nu a fost construit (o singura data)
+
+    def _build_tab(self, name):
+        builder = self._tab_builders.pop(name, None)
+        if builder is not None:
+            builder()
+            startup.mark(f"tab{name} construit")
+# param: name (str) -> numele tab-ului
+# selecteaza un tab din cod (set() nu apeleaza command-ul tabview-ului, deci il construim noi)
+
+    def _select_tab(self, name):
+        self._build_tab(name)
+        self.tabs.set(name)
+        self._on_tab_change()
+# param: select=True (bool) -> deschide tab-ul dupa ce il adauga
+# arata / ascunde tab-ul de diagnoza (Ctrl+Shift+D); continutul se construieste la prima selectare, ca celelalte
+
+    def _toggle_diagnostics(self, select=True):
+        if not hasattr(self, "tabs"):
+            return
+        if self.diag_tab is not None:
+            if self.tabs.get() == DIAG_TAB:
+                self._select_tab(GUIDE_TAB)
+            self.tabs.delete(DIAG_TAB)
+            self._tab_builders.pop(DIAG_TAB, None)
+            if self._diag_after is not None:
+                self.after_cancel(self._diag_after)
+                self._diag_after = None
+            self.diag_tab = self.diag_text = None
+            return
+        self.diag_tab = self.tabs.add(DIAG_TAB)
+        self._tab_builders[DIAG_TAB] = self._build_diagnostics
+        if select:
+            self._select_tab(DIAG_TAB)
+# param: none
+# UI pt diagnoza: comutator pt masuratori, tabelul cu latente (histograme pe operatie) + export JSON / Chrome trace
+
+    def _build_diagnostics(self):
+        frame = ctk.CTkFrame(self.diag_tab, fg_color="#FFFFFF")
+        frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        ctk.CTkLabel(frame, text=" Diagnoză performanță", font=FONT_SUB, text_color=TEXT_DARK).pack(pady=(10, 6))
+
+        bar = ctk.CTkFrame(frame, fg_color="#F6FFF2")
+        bar.pack(fill="x", padx=6, pady=(0, 6))
+        self.diag_switch = ctk.CTkSwitch(bar, text="Măsurare activă", command=self._toggle_tracing)
+        self.diag_switch.pack(side="left", padx=10, pady=8)
+        if perf_trace.enabled():
+            self.diag_switch.select()
+        for text, command in (("Golește", self._reset_diagnostics),
+                              ("Export JSON", lambda: self._export_diagnostics("json")),
+                              ("Export Chrome trace", lambda: self._export_diagnostics("trace"))):
+            ctk.CTkButton(bar, text=text, fg_color="#95D5B2", hover_color="#74C69D", corner_radius=16,
+                          command=command).pack(side="left", padx=6, pady=8)
+
+        self.diag_text = ctk.CTkTextbox(frame, font=("Consolas", 13), wrap="none")
+        self.diag_text.pack(fill="both", expand=True, padx=6, pady=6)
+        self.diag_status = ctk.CTkLabel(frame, text="", font=FONT_BODY, text_color=TEXT_DARK)
+        self.diag_status.pack(pady=(0, 6))
+        self._refresh_diagnostics()
+# param: none
+# rescrie tabelul cat timp tab-ul e vizibil (o data pe secunda); ascuns sau sters -> se opreste singur
+
+    def _refresh_diagnostics(self):
+        self._diag_after = None
+        if self.diag_text is None:
+            return
+        if self.tabs.get() == DIAG_TAB:
+            self._refresh_diagnostics_now()
+        self._diag_after = self.after(DIAG_REFRESH_MS, self._refresh_diagnostics)
+# param: none
+# textul tab-ului: tabelul perf_trace + cache-uri + latenta DB (acelasi la refresh-ul periodic si la cel imediat)
+
+    def _diagnostics_text(self):
+        lines = [perf_trace.report(), "",
+                 f" Cache predictii: {self.ml_cache.stats()}",
+                 f" Cache imagini:   {self.assets.stats()}",
+                 " Latenta DB (pool, incl. asteptarea dupa writer):"]
+        for op, st in self.db.latency_report().items():
+            lines.append(f"  {op:<24} n={st['count']:<7} medie={st['avg_ms']:.2f}ms max={st['max_ms']:.2f}ms")
+        return "\n".join(lines)
+# param: none
+# porneste/opreste masuratorile (oprite costa doar un if per apel masurat)
+
+    def _toggle_tracing(self):
+        perf_trace.enable(bool(self.diag_switch.get()))
+        self._refresh_diagnostics_now()
+
+    def _reset_diagnostics(self):
+        perf_trace.reset()
+        self._refresh_diagnostics_now()
+
+    def _refresh_diagnostics_now(self):
+        if self.diag_text is not None:
+            self.diag_text.delete("1.0", "end")
+            self.diag_text.insert("1.0", self._diagnostics_text())
+# param: kind (str) -> "json" (histograme) sau "trace" (evenimente pt chrome://tracing / ui.perfetto.dev)
+# scrie exportul in diagnostics/ si arata calea
+
+    def _export_diagnostics(self, kind):
+        try:
+            os.makedirs(DIAG_DIR, exist_ok=True)
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            if kind == "json":
+                path = perf_trace.export_json(os.path.join(DIAG_DIR, f"perf-{stamp}.json"))
+            else:
+                path = perf_trace.export_chrome_trace(os.path.join(DIAG_DIR, f"perf-{stamp}.trace.json"))
+            self.diag_status.configure(text=f" Salvat: {path}")
+        except OSError as e:
+            self.diag_status.configure(text=f" Exportul a eșuat: {e}")
     def _build_ai(self):
       # params: none
       # ce face: construieste tab-ul AI (input text + predict + afisare rezultat)
@@ -325,6 +469,22 @@ class GreenVision(ctk.CTk):
 
       self.ai_entry = ctk.CTkEntry(frame, width=680, height=40, placeholder_text="Scrie aici obiectul...")
       self.ai_entry.pack(pady=8)
+      # la fiecare tasta doar se reprogrameaza cautarea (debounce); sugestiile + predictia live vin din fundal
+      self.ai_entry.bind("<KeyRelease>", self._ai_on_key)
+      self.ai_entry.bind("<Return>", lambda e: self._ai_predict())
+      self.ai_entry.bind("<Down>", lambda e: self._ai_pick_completion(0))
+      self.ai_entry.bind("<Escape>", lambda e: self._ai_hide_completions())
+
+      # butoanele de sugestii se creeaza o singura data si doar li se schimba textul
+      self.ai_chips = ctk.CTkFrame(frame, fg_color="#FFFFFF")
+      self.ai_chip_buttons = [
+        ctk.CTkButton(self.ai_chips, text="", height=28, fg_color="#E9F5E9", hover_color="#B7E4C7",
+                      text_color=TEXT_DARK, corner_radius=14, command=partial(self._ai_pick_completion, i))
+        for i in range(COMPLETE_K)
+      ]
+      self._ai_completions = []
+      self.ai_live = ctk.CTkLabel(frame, text="", font=FONT_BODY, text_color=TEXT_DARK)
+      self.ai_live.pack(pady=(0, 4))
 
       ctk.CTkButton(frame, text="🔎 Analizeaza",
                   fg_color="#74C69D", hover_color="#52B788",
@@ -334,29 +494,190 @@ class GreenVision(ctk.CTk):
       self.ai_result = ctk.CTkLabel(frame, text="", font=FONT_BODY_B, text_color=TEXT_DARK, wraplength=900)
       self.ai_result.pack(pady=(12, 6))
 
+      # "ai vrut sa scrii ...?" (apare doar cand cererea seamana cu un text cunoscut) + exemplele din spatele predictiei
+      self.ai_suggest = ctk.CTkButton(frame, text="", fg_color="#FFF3B0", hover_color="#FFE066", text_color=TEXT_DARK,
+                                      corner_radius=14, command=self._ai_use_suggestion)
+      self._ai_suggestion = None
+      self.ai_similar = ctk.CTkLabel(frame, text="", font=FONT_BODY, text_color=TEXT_DARK, wraplength=900, justify="left")
+      self.ai_similar.pack(pady=(0, 6))
+
       self.ai_tip = ctk.CTkLabel(frame, text="", font=FONT_BODY, text_color=TEXT_DARK, wraplength=900)
       self.ai_tip.pack(pady=(0, 10))
 
+      self.ai_where = ctk.CTkLabel(frame, text="", font=FONT_BODY, text_color=TEXT_DARK, wraplength=900, justify="left")
+      self.ai_where.pack(pady=(0, 10))
+
+      # feedback: userul confirma sau corecteaza predictia, iar modelul invata din asta (apare dupa o predictie)
+      self.ai_feedback = ctk.CTkFrame(frame, fg_color="#F6FFF2")
+      ctk.CTkLabel(self.ai_feedback, text="E corect?", font=FONT_BODY, text_color=TEXT_DARK).pack(side="left", padx=10, pady=8)
+      ctk.CTkButton(self.ai_feedback, text="✔ Da", width=80, fg_color="#95D5B2", hover_color="#74C69D",
+                    corner_radius=14, command=lambda: self._ai_feedback(None)).pack(side="left", padx=6)
+      self.ai_fix_var = ctk.StringVar(value=next(iter(UI_TO_ML_CAT)))
+      ctk.CTkOptionMenu(self.ai_feedback, values=list(UI_TO_ML_CAT), variable=self.ai_fix_var,
+                        fg_color="#B7E4C7", button_color="#95D5B2", text_color=TEXT_DARK).pack(side="left", padx=6)
+      ctk.CTkButton(self.ai_feedback, text="Corecteaza", width=110, fg_color="#B7E4C7", hover_color="#95D5B2",
+                    corner_radius=14,
+                    command=lambda: self._ai_feedback(UI_TO_ML_CAT[self.ai_fix_var.get()])).pack(side="left", padx=6)
+
+      if self.ml_online is None and not self.ml_loader.done.is_set():
+        self.ai_result.configure(text="⏳ Modelul AI se incarca... poti scrie deja, raspunsul vine imediat ce e gata.")
+
 
     def _ai_predict(self):
     # params: none
-    # ce face: ia textul userului, ruleaza ML, afiseaza categoria + confidence
+    # ce face: ia textul userului; daca modelul inca se incarca, pune cererea in asteptare
       text = self.ai_entry.get().strip()
       if not text:
         mb.showwarning("AI Recycle", "Scrie ceva (ex: 'pet de apa') ca sa pot prezice.")
         return
+      self._ai_hide_completions()
+      self.ai_live.configure(text="")
+      query = normalize_prefix(text).strip()
+      self.autocomplete.add_query(query)
+      self.db.log_ai_query(query)
+
+      if self.ml_online is None:
+        if self.ml_loader.error is not None:
+          self.ai_result.configure(text=f"Modelul AI nu a putut fi incarcat: {self.ml_loader.error}")
+          return
+        self._ai_pending.append(text)
+        self.ai_result.configure(text=f"⏳ Modelul AI se incarca... ({len(self._ai_pending)} cereri in asteptare)")
+        return
+      self._ai_submit(text)
+
+    def _ai_submit(self, text):
+    # params: text (str)
+    # ce face: trimite predictia in fundal; o cerere noua o inlocuieste pe cea veche (se afiseaza doar ultima)
+      self.tasks.submit(self._ai_compute, text, self.ml_online.bundle, key="ai-predict", replace=True,
+                        lane="interactive", on_done=lambda res: self._ai_show_prediction(text, *res),
+                        on_error=lambda e: self.ai_result.configure(text=f"Eroare la predictie: {e}"))
+
+    @perf_trace.traced("app._ai_compute")
+    def _ai_compute(self, text, bundle):
+    # params: text (str), bundle (model, vectorizer)
+    # ce face: (thread de fundal) predictia + textul "unde il duci"; nu atinge widget-uri Tk
+      label, conf = self.ml_cache.predict_proba(text, bundle)
+      ui_cat = ML_TO_UI_CAT.get(label, label)
+      suggestion, examples = self._similar_texts(text, label)
+      return label, conf, self._where_to_take(ui_cat), suggestion, examples
 
-      label, conf = predict_proba(text, self.ml_bundle)
+    def _load_text_index(self):
+    # params: none
+    # ce face: (thread de fundal) indexul de trigrame + istoricul cererilor pt autocomplete; intoarce indexul
+      index = TextIndex.from_file()
+      self.autocomplete.load(index, self.db.top_ai_queries())
+      return index
+
+    def _ai_on_key(self, event):
+    # params: event (tk event)
+    # ce face: reprogrameaza cautarea de sugestii dupa COMPLETE_DEBOUNCE_MS (tastele rapide se comaseaza)
+      if event.keysym in ("Return", "KP_Enter", "Down", "Escape"):
+        return
+      if self._complete_after is not None:
+        self.after_cancel(self._complete_after)
+      self._complete_after = self.after(COMPLETE_DEBOUNCE_MS, self._ai_complete_now)
+
+    def _ai_complete_now(self):
+    # params: none
+    # ce face: trimite in fundal sugestiile + predictia live pt textul curent (o cerere noua o inlocuieste pe cea veche)
+      self._complete_after = None
+      text = self.ai_entry.get()
+      if not text.strip():
+        self._ai_hide_completions()
+        self.ai_live.configure(text="")
+        return
+      bundle = self.ml_online.bundle if self.ml_online is not None else None
+      self.tasks.submit(self._ai_complete_compute, text, bundle, key="ai-complete", replace=True,
+                        lane="interactive", on_done=lambda res: self._ai_show_completions(text, *res))
+
+    @perf_trace.traced("app._ai_complete_compute")
+    def _ai_complete_compute(self, text, bundle):
+    # params: text (str), bundle (model, vectorizer sau None daca modelul inca se incarca)
+    # ce face: (thread de fundal) completarile + (label, confidence) live; fara cache, ca prefixele sa nu il umple,
+    #          dar pe textul normalizat ca in cache (fara diacritice), ca hint-ul sa dea ce da si Enter
+      completions = self.autocomplete.complete(text, COMPLETE_K)
+      return completions, predict_proba(normalize_text(text), bundle) if bundle is not None else None
+
+    def _ai_show_completions(self, text, completions, live):
+    # params: text (str) -> pt ce text s-a calculat, completions (list[Completion]), live ((label, conf) sau None)
+    # ce face: arata sugestiile ca butoane sub casuta + predictia live; ignora rezultatele pt un text deja schimbat
+      if self.ai_entry.get() != text:
+        return
+      if live is not None:
+        ui_cat = ML_TO_UI_CAT.get(live[0], live[0])
+        self.ai_live.configure(text=f"Pare: {ui_cat} (~{int(live[1] * 100)}%) - apasa Enter pt detalii")
+      current = normalize_prefix(text).strip()
+      self._ai_completions = [c.text for c in completions if c.text != current]
+      if not self._ai_completions:
+        self._ai_hide_completions()
+        return
+      for i, button in enumerate(self.ai_chip_buttons):
+        if i < len(self._ai_completions):
+          button.configure(text=self._ai_completions[i])
+          button.pack(side="left", padx=4, pady=4)
+        else:
+          button.pack_forget()
+      self.ai_chips.pack(after=self.ai_entry, pady=(0, 4))
+
+    def _ai_pick_completion(self, i):
+    # params: i (int) -> a cata sugestie
+    # ce face: pune sugestia in casuta si porneste predictia completa
+      if i >= len(self._ai_completions):
+        return
+      self.ai_entry.delete(0, "end")
+      self.ai_entry.insert(0, self._ai_completions[i])
+      self._ai_predict()
+
+    def _ai_hide_completions(self):
+    # params: none
+    # ce face: ascunde sugestiile (si anuleaza cautarea programata sau deja pornita)
+      if self._complete_after is not None:
+        self.after_cancel(self._complete_after)
+        self._complete_after = None
+      self.tasks.cancel("ai-complete")
+      self._ai_completions = []
+      self.ai_chips.pack_forget()
+
+    def _similar_texts(self, text, label, k=3):
+    # params: text (str), label (str) -> categoria ML prezisa, k (int)
+    # ce face: (sugestia "ai vrut sa scrii" sau None, cele mai apropiate k exemple de antrenare cu label-ul prezis);
+    #          (None, []) cat timp indexul inca se construieste
+      if not self.text_loader.done.is_set() or self.text_loader.error is not None:
+        return None, []
+      index = self.text_loader.bundle
+      return index.suggest(text, index.similar(text, k=1)), index.similar(text, k=k, label=label)
+
+    def _ai_show_prediction(self, text, label, conf, where, suggestion=None, examples=()):
+    # params: text (str), label (str), conf (float), where (str), suggestion (Similar sau None),
+    #         examples (list[Similar]) -> rezultatul din _ai_compute
+    # ce face: afiseaza categoria + confidence, sugestia de corectare si exemplele apropiate
       ui_cat = ML_TO_UI_CAT.get(label, label)
+      self._ai_last = (text, label)
+      self.ai_fix_var.set(ui_cat if ui_cat in UI_TO_ML_CAT else next(iter(UI_TO_ML_CAT)))
+      self.ai_feedback.pack(after=self.ai_where, pady=(0, 10))
+      self.ai_where.configure(text=where)
 
       pct = int(conf * 100)
       self.ai_result.configure(text=f"Predictie: {ui_cat} (confidence ~ {pct}%)")
 
-    # daca exista in GUIDE, folosim ghidul tau ca raspuns "oficial"
+      self._ai_suggestion = suggestion.text if suggestion else None
+      if suggestion:
+        sug_cat = ML_TO_UI_CAT.get(suggestion.label, suggestion.label)
+        self.ai_suggest.configure(text=f"Ai vrut sa scrii „{suggestion.text}” ({sug_cat})?")
+        self.ai_suggest.pack(after=self.ai_result, pady=(0, 6))
+      else:
+        self.ai_suggest.pack_forget()
+      lines = [f"• {e.text} ({int(e.score * 100)}% asemanare)" for e in examples]
+      self.ai_similar.configure(text=f"Exemple apropiate din {ui_cat}:\n" + "\n".join(lines) if lines else "")
+
+    # daca exista in GUIDE, folosim ghidul tau ca raspuns "oficial" (dar nu sarim in Ghid cand pare o greseala de scriere)
+      if ui_cat in GUIDE and suggestion:
+        self.ai_tip.configure(text="Categoria e in Ghid; verifica intai sugestia de mai sus.")
+        return
       if ui_cat in GUIDE:
         # reuse: arata info + log + stelute (ai deja logica in _show_info)
         self.ai_tip.configure(text="Am gasit categoria in ghid. Ti-am deschis recomandarea din Ghid.")
-        self.tabs.set(" Ghid")
+        self._select_tab(GUIDE_TAB)
         self._show_info(ui_cat)
         return
 
@@ -374,6 +695,47 @@ class GreenVision(ctk.CTk):
       self.db.add_star(1)
       self._update_stats()
 
+    def _ai_use_suggestion(self):
+    # params: none
+    # ce face: pune textul sugerat in casuta si reface predictia
+      if self._ai_suggestion is None:
+        return
+      self.ai_entry.delete(0, "end")
+      self.ai_entry.insert(0, self._ai_suggestion)
+      self._ai_predict()
+
+    def _where_to_take(self, ui_cat, k=3):
+    # params: ui_cat (str) -> categoria din UI (ex: "Hârtie"), k (int)
+    # ce face: textul "unde il duc?" cu cele mai apropiate k puncte care accepta categoria (gol daca nu are sens)
+      if not self.point_loader.done.is_set() or self.point_loader.error is not None:
+        return ""
+      lat, lon = _kiosk_location()
+      found = self.point_loader.bundle.nearest(lat, lon, k=k, category=ui_cat)
+      if not found:
+        return ""
+      lines = [f"• {p.name} ({p.distance_km:.1f} km)" for p in found]
+      return "Unde il duci (cele mai apropiate puncte):\n" + "\n".join(lines)
+
+    def _ai_feedback(self, label):
+    # params: label (str sau None) -> categoria ML corecta; None = userul confirma predictia
+    # ce face: salveaza feedback-ul in db (fara sa astepte commit-ul: _learn_feedback face flush inainte sa-l
+    #          citeasca) si porneste invatarea incrementala in fundal
+      if self._ai_last is None:
+        return
+      text, predicted = self._ai_last
+      self._ai_last = None
+      self.db.add_ai_feedback(text, predicted, label or predicted, wait=False)
+      self.ai_feedback.pack_forget()
+      self.ai_tip.configure(text="Multumesc! Modelul invata din raspunsul tau.")
+      self.tasks.submit(self._learn_feedback, key="ml-learn")
+
+    def _learn_feedback(self):
+    # params: none
+    # ce face: (thread de fundal) partial_fit pe feedback-ul nou + salvare; nu atinge widget-uri Tk
+      self.db.flush()  # feedback-ul e scris fara wait (vezi _ai_feedback)
+      self.ml_online.learn(self.db.get_ai_feedback(after_id=self.ml_online.applied_id))
+      self.ml_online.save()
+
 # param: none
 # UI pt ghid (lista categorii stanga + info si imagine dreapta)
     def _build_guide(self):
@@ -422,10 +784,9 @@ class GreenVision(ctk.CTk):
         self._update_stats()
 # param: path (str) -> calea catre imagine
 #  face un mic "efect" pe imagine: apare mare, apoi se micsoreaza si se aseaza sub text
+    @perf_trace.traced("app._animate_container")
     def _animate_container(self, path):
-        img = Image.open(path)
-        big  = ImageTk.PhotoImage(img.resize((420, 420), Image.LANCZOS))
-        small= ImageTk.PhotoImage(img.resize((240, 240), Image.LANCZOS))
+        big, small = (self.assets.photo(path, size) for size in GUIDE_IMG_SIZES)
 
         self.img_label.configure(image=big)
         self.img_label.image = big
@@ -553,7 +914,7 @@ class GreenVision(ctk.CTk):
                       corner_radius=16, command=self._restart_quiz).pack(side="left", padx=8)
         ctk.CTkButton(btns, text=" Înapoi la Ghid",
                       fg_color="#B7E4C7", hover_color="#95D5B2",
-                      corner_radius=16, command=lambda: self.tabs.set(" Ghid")).pack(side="left", padx=8)
+                      corner_radius=16, command=lambda: self._select_tab(GUIDE_TAB)).pack(side="left", padx=8)
 # param: none
 # reseteaza quiz-ul (scor/index) + reconstruieste UI-ul (practic refresh complet)
     
@@ -597,16 +958,39 @@ class GreenVision(ctk.CTk):
 
         self.chart_holder = ctk.CTkFrame(self.stats_frame)
         self.chart_holder.pack(fill="both", expand=True, padx=10, pady=10)
+        # figura se creeaza o singura data (la primul grafic), apoi doar se schimba inaltimea barelor
+        self.stats_chart = None
+        self.stats_empty = ctk.CTkLabel(self.chart_holder, text="Nicio statistică încă sau Matplotlib indisponibil.")
+        self._update_stats()
 
         ctk.CTkButton(self.stats_frame, text=" Reîmprospătează statistici",
                       fg_color="#95D5B2", hover_color="#74C69D",
                       corner_radius=16, command=self._update_stats).pack(pady=6)
 # param: none
-# actualizeaza stelutele + KPI si (daca exista matplotlib) afiseaza un grafic simplu
+# cere statisticile noi; apelurile venite in rafala (steluta + log + quiz...) se comaseaza intr-o singura citire
    
     def _update_stats(self):
-        stars = self.db.get_stars()
-        best, avg, count = self.db.quiz_stats()
+        if self._stats_after is None:
+            self._stats_after = self.after(STATS_DEBOUNCE_MS, self._refresh_stats)
+# param: none
+# citeste statisticile in fundal (cereri repetate cat asteapta se comaseaza intr-una singura)
+
+    def _refresh_stats(self):
+        self._stats_after = None
+        self.tasks.submit(self._read_stats, key="stats", on_done=self._show_stats)
+# param: none
+# (thread de fundal) citirile din db pt statistici; citirea asteapta scrierile in curs, deci nu pe thread-ul Tk
+
+    @perf_trace.traced("app._read_stats")
+    def _read_stats(self):
+        self.db.flush()  # stelutele / quiz-ul care au cerut refresh-ul sunt inca in coada writer-ului
+        return self.db.get_stars(), self.db.quiz_stats()
+# param: values (tuple) -> rezultatul din _read_stats
+# actualizeaza stelutele + KPI; graficul doar daca tab-ul Statistici e vizibil, altfel ramane de desenat la deschidere
+
+    @perf_trace.traced("app._show_stats")
+    def _show_stats(self, values):
+        stars, (best, avg, count) = values
 
         if hasattr(self, 'star_label'):
             self.star_label.configure(text=f"* {stars}")
@@ -614,18 +998,49 @@ class GreenVision(ctk.CTk):
             self.kpi_lbl.configure(text=f"Quizuri: {count} • Cel mai bun: {best}/{QUIZ_LENGTH} • Medie: {avg:.1f}% • Steluțe: {stars}")
 
         if hasattr(self, 'chart_holder'):
-            for w in self.chart_holder.winfo_children():
-                w.destroy()
-            if MPL and count > 0:
-                fig = Figure(figsize=(5.6, 2.6), dpi=100)
-                ax = fig.add_subplot(111)
-                ax.bar(["Quizuri", "Steluțe"], [count, stars], color="#40916C")
-                ax.set_title("Evoluția ta verde", fontsize=10)
-                canvas = FigureCanvasTkAgg(fig, master=self.chart_holder)
-                canvas.draw()
-                canvas.get_tk_widget().pack(fill="both", expand=True)
+            if self.tabs.get() == STATS_TAB:
+                self._draw_stats_chart(count, stars)
             else:
-                ctk.CTkLabel(self.chart_holder, text="Nicio statistică încă sau Matplotlib indisponibil.").pack(pady=10)
+                self._stats_pending = (count, stars)
+# param: none
+# la schimbarea tab-ului: construieste tab-ul la prima vizita + deseneaza graficul ramas in urma cat timp Statistici era ascuns
+
+    def _on_tab_change(self):
+        self._build_tab(self.tabs.get())
+        if self.tabs.get() == STATS_TAB and self._stats_pending is not None:
+            self._draw_stats_chart(*self._stats_pending)
+# params: count (int), stars (int)
+# actualizeaza barele pe loc (set_height + draw_idle); figura si canvas-ul se creeaza doar prima data
+
+    @perf_trace.traced("app._draw_stats_chart")
+    def _draw_stats_chart(self, count, stars):
+        self._stats_pending = None
+        if not (MPL and count > 0):
+            if self.stats_chart is not None:
+                self.stats_chart[0].get_tk_widget().pack_forget()
+            self.stats_empty.pack(pady=10)
+            return
+        if self.stats_chart is None:
+            mpl = _load_matplotlib()
+            if mpl is None:
+                self.stats_empty.pack(pady=10)
+                return
+            Figure, FigureCanvasTkAgg = mpl
+            fig = Figure(figsize=(5.6, 2.6), dpi=100)
+            ax = fig.add_subplot(111)
+            bars = ax.bar(["Quizuri", "Steluțe"], [count, stars], color="#40916C")
+            ax.set_title("Evoluția ta verde", fontsize=10)
+            canvas = FigureCanvasTkAgg(fig, master=self.chart_holder)
+            self.stats_chart = (canvas, ax, bars)
+        self.stats_empty.pack_forget()
+        canvas, ax, bars = self.stats_chart
+        for bar, h in zip(bars, (count, stars)):
+            bar.set_height(h)
+        ax.set_ylim(0, max(count, stars) * 1.1)
+        widget = canvas.get_tk_widget()
+        if not widget.winfo_ismapped():
+            widget.pack(fill="both", expand=True)
+        canvas.draw_idle()
 
 # param: none
 # construieste UI pentru recenzii (rating + textbox + lista scroll)
@@ -654,8 +1069,11 @@ class GreenVision(ctk.CTk):
         ctk.CTkButton(form, text="Trimite recenzia", fg_color="#74C69D", hover_color="#52B788",
                       corner_radius=16, command=self._submit_review).grid(row=2, column=1, padx=6, pady=8, sticky="e")
 
-        self.list_holder = ctk.CTkScrollableFrame(wrap, fg_color="#F8FFF8")
-        self.list_holder.pack(fill="both", expand=True, padx=8, pady=8)
+        self.review_feed = ReviewFeed(wrap, fetch_page=self.db.get_reviews_page,
+                                      fetch_newer=self.db.get_reviews_since,
+                                      fonts=(FONT_BODY_B, FONT_BODY), text_color=TEXT_DARK,
+                                      fg_color="#F8FFF8")
+        self.review_feed.pack(fill="both", expand=True, padx=8, pady=8)
 
         self._refresh_reviews()
  # param: none
@@ -666,7 +1084,7 @@ class GreenVision(ctk.CTk):
         emojis  = ["*","*)",":)",":0"]
         return f"{random.choice(emojis)} {random.choice(animals)}"
 # param: none
-# ia rating + text, valideaza, salveaza recenzia in db, reset form, refresh lista, +1 steluta
+# ia rating + text, valideaza, salveaza recenzia in db, reset form, pune recenzia noua sus in lista, +1 steluta
     
     def _submit_review(self):
         rating = self.rating_var.get()
@@ -678,29 +1096,20 @@ class GreenVision(ctk.CTk):
         self.db.add_review(nick, rating, comment)
         self.comment_box.delete("1.0", "end")
         self.rating_var.set(5)
-        self._refresh_reviews()
+        self.review_feed.load_newer()
         self.db.add_star(1)
         self._update_stats()
 # param: none
-# reincarca lista de recenzii in UI; daca nu exista niciuna, baga una default
+# reincarca lista de recenzii in UI (doar prima pagina, restul la scroll); daca nu exista niciuna, baga una default
     
+    @perf_trace.traced("app._refresh_reviews")
     def _refresh_reviews(self):
-        for w in self.list_holder.winfo_children():
-            w.destroy()
-        rows = self.db.get_reviews()
-        if not rows:
+        if not self.db.has_reviews():
             self.db.add_review(" MissRecycle", 5, "Super utilă și elegantă! Îmi place ghidul pe categorii.")
-            rows = self.db.get_reviews()
-        for nick, rating, comment, created_at in rows:
-            card = ctk.CTkFrame(self.list_holder, fg_color="#FFFFFF", corner_radius=14)
-            card.pack(fill="x", expand=True, padx=8, pady=6)
-            ctk.CTkLabel(card, text=f"{nick} – {'*'*rating}{'☆'*(5-rating)}",
-                         font=FONT_BODY_B, text_color=TEXT_DARK).pack(anchor="w", padx=10, pady=(8,2))
-            ctk.CTkLabel(card, text=comment, justify="left", wraplength=900,
-                         font=FONT_BODY).pack(anchor="w", padx=10, pady=(0,10))
+        self.review_feed.reload()
 
 # param: none
-# UI pt harta (filtre + buton reload + buton deschidere browser) si genereaza map.html
+# UI pt harta (filtre + buton reload + buton deschidere browser) si genereaza harta din .map_cache
        
     def _build_map(self):
         frame = ctk.CTkFrame(self.map_tab, fg_color="#FFFFFF")
@@ -721,14 +1130,14 @@ class GreenVision(ctk.CTk):
                                  corner_radius=14,
                                  command=lambda t=txt: self._set_map_filter(t))
 
-        for txt in ["Toate", "Plastic", "Hârtie", "Sticlă", "Electronice", "Ulei uzat"]:
+        for txt in ("Toate",) + MAP_CATEGORIES:
             b = make_btn(txt)
             b.pack(side="left", padx=6, pady=8)
 
         ctk.CTkButton(filters, text=" Reîncarcă harta",
                       fg_color="#B7E4C7", hover_color="#95D5B2",
                       corner_radius=14,
-                      command=lambda: self._set_map_filter(self.current_filter.get())
+                      command=lambda: self._ensure_map(force=True)
                       ).pack(side="right", padx=8, pady=8)
 
         self.map_status = ctk.CTkLabel(frame, text="Se pregătește harta...",
@@ -741,17 +1150,32 @@ class GreenVision(ctk.CTk):
                       corner_radius=16,
                       command=self._load_map_html_safe).pack(pady=10)
 
+        self.map_path = None
         if not FOLIUM_OK:
             self.map_status.configure(
                 text=" Modulul folium nu este instalat.\nInstalează-l cu: pip install folium"
             )
             return
 
-        
-        self._generate_map(filter_type="Toate")
-        self.map_status.configure(text=" Harta este generată. Apasă butonul pentru a o deschide.")
+        # o singura harta cu toate punctele; filtrele se aplica in pagina, deci schimbarea lor nu randeaza nimic
+        self.map_cache = MapCache()
+        self._ensure_map()
+# param: force=False (bool)->True = randeaza din nou chiar daca exista in cache
+# verifica harta din cache pt sursa curenta; daca lipseste (sau force) o genereaza in fundal
+# (click-urile repetate cat timp generarea asteapta se comaseaza intr-o singura randare)
+
+    def _ensure_map(self, force=False):
+        if not force and self.tasks.busy("map-render"):
+            return
+        path = None if force else self.map_cache.get()
+        if path:
+            self.map_path = path
+            return
+        self.map_status.configure(text=" Se generează harta...")
+        self.tasks.submit(self._generate_map, key="map-render", on_done=self._map_ready,
+                          on_error=lambda e: self.map_status.configure(text=f" Eroare la generarea hărții: {e}"))
 # param: category (str)->filtrul selectat (ex: "Plastic", "Toate")
-#seteaza filtrul curent,regenereaza harta si update la status
+#seteaza filtrul curent; e aplicat de pagina (#filtru=... din open-map.html) cand se deschide harta, fara regenerare
    
     def _set_map_filter(self, category):
         
@@ -759,73 +1183,41 @@ class GreenVision(ctk.CTk):
             self.map_status.configure(text=" folium nu este instalat.")
             return
         self.current_filter.set(category)
-        self.map_status.configure(text=f" Se regenerează harta pentru filtrul: {category}...")
-        self._generate_map(filter_type=category)
+        self._ensure_map()
+        if not self.tasks.busy("map-render"):
+            self.map_status.configure(
+                text=f" Filtrul '{category}' este ales. Apasă butonul pentru a deschide harta în browser."
+            )
+# param: path (str) -> html-ul generat
+# activeaza harta generata in fundal
+
+    def _map_ready(self, path):
+        self.map_path = path
         self.map_status.configure(
-            text=f" Harta a fost regenerată pentru filtrul '{category}'. Apasă butonul pentru a o deschide în browser."
+            text=f" Harta este gata (filtru: {self.current_filter.get()}). Apasă butonul pentru a o deschide în browser."
         )
 # param: none
-# deschide map.html in browser-ul implicit (cu protectie try/except)
+# deschide harta in browser-ul implicit prin pagina de redirectionare cu filtrul curent (cu protectie try/except)
     
     def _load_map_html_safe(self):
         
         try:
-            if os.path.exists(MAP_HTML):
-                webbrowser.open(f"file:///{MAP_HTML.replace('\\', '/')}")
+            if self.map_path and os.path.exists(self.map_path):
+                page = filter_page(self.map_path, self.current_filter.get())
+                webbrowser.open(Path(page).resolve().as_uri())
                 self.map_status.configure(
                     text=f" Harta a fost deschisă în browser (filtru: {self.current_filter.get()})"
                 )
             else:
-                self.map_status.configure(text=" Fișierul map.html nu există.")
+                self.map_status.configure(text=" Harta nu este încă generată.")
         except Exception as e:
             self.map_status.configure(text=f" Eroare la deschiderea hărții: {e}")
-# param: filter_type="Toate" (str)
-# citeste punctele din collect_points.json,filtreaza dupa categorie si salveaza map.html cu markere
+# param: none
+# genereaza (pe thread-ul de harta) html-ul cu toate punctele in cache si intoarce calea lui
    
-    def _generate_map(self, filter_type="Toate"):
-      
-        if not FOLIUM_OK:
-            return
-
-        try:
-            with open(COLLECT_JSON, "r", encoding="utf-8") as f:
-                points = json.load(f)
-        except Exception:
-            points = []
-
-        
-        m = folium.Map(location=[45.75, 21.23], zoom_start=13, tiles="OpenStreetMap")
-
-        show_all = (filter_type == "Toate")
-        count = 0
-        for p in points:
-            types = [t.strip() for t in p.get("types", [])]
-            if show_all or filter_type in types:
-                lat, lon = p["lat"], p["lon"]
-                gmaps_url = f"https://www.google.com/maps?q={lat},{lon}"
-
-                html = (
-                    f"<b>{p.get('name','')}</b><br/>{', '.join(types)}"
-                    f"<br/><a href='{gmaps_url}' "
-                    f"style='color:#2D6A4F; text-decoration:none; font-weight:bold;'>"
-                    f" Deschide în Google Maps</a>"
-                )
-
-                folium.Marker(
-                    [lat, lon],
-                    popup=folium.Popup(html, max_width=280),
-                    tooltip=p.get("name", "")
-                ).add_to(m)
-                count += 1
-
-        if count == 0:
-            folium.Marker(
-                [45.753, 21.225],
-                popup=folium.Popup("<b>Nu s-au găsit puncte pentru filtrul ales.</b><br/>Încearcă 'Toate'.", max_width=260),
-                tooltip="Nicio locație pentru acest filtru"
-            ).add_to(m)
-
-        m.save(MAP_HTML)
+    @perf_trace.traced("app._generate_map")
+    def _generate_map(self):
+        return self.map_cache.render()
 
 
 if __name__ == "__main__":
@@ -833,6 +1225,3 @@ if __name__ == "__main__":
     # porneste aplicatia (creeaza fereastra si intra in loop-ul tkinter)
     app = GreenVision()
     app.mainloop()
-
-
-
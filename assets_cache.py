@@ -0,0 +1,112 @@
+import threading #imaginile se decodeaza/redimensioneaza pe un thread separat
+from collections import OrderedDict #LRU: la depasire iese cel mai vechi folosit
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageTk #decodare/redimensionare (Pillow) + PhotoImage pt Tkinter
+
+
+# params: start=0.30, step=0.015, base=260 (int) -> parametrii animatiei din splash
+# ce face: marimile (px) cadrelor de zoom din splash, in ordine (aceeasi formula ca animatia initiala)
+def zoom_sizes(start=0.30, step=0.015, base=260):
+    sizes, scale = [], start
+    while scale < 1.0:
+        scale += step
+        sizes.append(max(40, int(base * scale)))
+    return sizes
+
+
+class ImageCache:
+    # params: max_images=128 (int) -> imagini PIL redimensionate tinute in memorie,
+    #         max_photos=64 (int) -> PhotoImage-uri gata de afisat,
+    #         max_decoded=8 (int) -> imagini decodate la marimea originala (cele mai mari, deci putine)
+    # ce face: decodeaza fiecare fisier o data si tine variantele redimensionate (toate nivelurile LRU, marginite);
+    #          redimensionarea poate rula in fundal (prefetch / zoom_frames), iar PhotoImage-ul se face
+    #          doar pe thread-ul Tk (photo), o singura data per (fisier, marime)
+    def __init__(self, max_images=128, max_photos=64, max_decoded=8):
+        self.max_images = max_images
+        self.max_photos = max_photos
+        self.max_decoded = max_decoded
+        self._lock = threading.Lock()
+        self._decoded = OrderedDict()
+        self._resized = OrderedDict()
+        self._photos = OrderedDict()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="assets")
+
+    # params: path (str)
+    # ce face: imaginea decodata complet (Image.open e lazy; load() o citeste acum, nu la primul resize);
+    #          un fisier iesit din LRU se decodeaza din nou doar daca ii trebuie o marime care nu e in cache
+    def image(self, path):
+        with self._lock:
+            img = self._decoded.get(path)
+            if img is not None:
+                self._decoded.move_to_end(path)
+                return img
+        img = Image.open(path)
+        img.load()
+        with self._lock:
+            img = self._decoded.setdefault(path, img)
+        self._put(self._decoded, path, img, self.max_decoded)
+        return img
+
+    # params: path (str), size (tuple w,h), resample (filtru PIL)
+    # ce face: varianta redimensionata din cache; daca lipseste o calculeaza (pe thread-ul apelant) si o pastreaza
+    def resized(self, path, size, resample=Image.LANCZOS):
+        key = (path, size, resample)
+        with self._lock:
+            img = self._resized.get(key)
+            if img is not None:
+                self._resized.move_to_end(key)
+                return img
+        img = self.image(path).resize(size, resample)
+        self._put(self._resized, key, img, self.max_images)
+        return img
+
+    # params: path (str), size (tuple), resample (filtru PIL)
+    # ce face: varianta redimensionata doar daca e deja calculata (altfel None), fara sa blocheze
+    def ready(self, path, size, resample=Image.LANCZOS):
+        with self._lock:
+            return self._resized.get((path, size, resample))
+
+    # params: path (str), size (tuple), resample (filtru PIL)
+    # ce face: PhotoImage pt (fisier, marime); se creeaza o singura data, apoi vine din cache. doar pe thread-ul Tk
+    def photo(self, path, size, resample=Image.LANCZOS):
+        key = (path, size, resample)
+        photo = self._photos.get(key)
+        if photo is None:
+            photo = ImageTk.PhotoImage(self.resized(path, size, resample))
+            self._put(self._photos, key, photo, self.max_photos)
+        else:
+            self._photos.move_to_end(key)
+        return photo
+
+    # params: path (str), sizes (list[tuple])
+    # ce face: pregateste in fundal variantele (LANCZOS) ca primul click sa nu mai decodeze/redimensioneze nimic
+    def prefetch(self, path, sizes):
+        return self._executor.submit(lambda: [self.resized(path, s) for s in sizes])
+
+    # params: path (str), sizes (list[int]) -> marimile cadrelor (patrate)
+    # ce face: calculeaza in fundal cadrele de zoom: un singur LANCZOS la marimea maxima, apoi BILINEAR din el
+    #          (ieftin si arata la fel la marimile astea); cadrele se iau cu ready(path, (s, s), Image.BILINEAR)
+    def zoom_frames(self, path, sizes):
+        def work():
+            top = max(sizes)
+            base = self.resized(path, (top, top))
+            for s in sizes:
+                key = (path, (s, s), Image.BILINEAR)
+                if self.ready(*key) is None:
+                    self._put(self._resized, key, base if s == top else base.resize((s, s), Image.BILINEAR),
+                              self.max_images)
+        return self._executor.submit(work)
+
+    def _put(self, cache, key, value, limit):
+        with self._lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > limit:
+                cache.popitem(last=False)
+
+    # params: none
+    # ce face: cate intrari are fiecare nivel de cache (pt diagnoza)
+    def stats(self):
+        with self._lock:
+            return {"decoded": len(self._decoded), "resized": len(self._resized), "photos": len(self._photos)}
@@ -0,0 +1,66 @@
+import threading
+from bisect import bisect_left, insort
+
+from text_index import PREFIX_WORDS, Completion, normalize_prefix
+
+# o cerere facuta de useri la kiosk cantareste cat cateva aparitii in corpus (e ce cauta oamenii de fapt)
+QUERY_WEIGHT = 3
+# de la cate caractere incep sugestiile (la o litera sunt prea multe si prea putin utile)
+MIN_PREFIX = 2
+
+
+class Autocomplete:
+    # params: none
+    # ce face: sugestii pt casuta din tab-ul AI: textele de antrenare (TextIndex.complete) + cererile anterioare
+    #          (lista sortata in memorie, cautare binara pe prefix), ordonate dupa frecventa. ca la TextIndex, o cerere
+    #          se completeaza si de la unul din primele PREFIX_WORDS cuvinte ("alu" -> "doza aluminiu").
+    #          load() / add_query() pot veni de pe alt thread decat complete(), deci starea e sub lock
+    def __init__(self):
+        self.index = None
+        self._queries = {}  # cerere normalizata -> de cate ori
+        self._sorted = []  # (textul de la inceputul unui cuvant, cererea), sortate (pt prefix)
+        self._lock = threading.Lock()
+
+    # params: index (TextIndex), queries (iterable[(text, n)]) -> ex: db.top_ai_queries()
+    # ce face: ataseaza indexul textelor de antrenare si istoricul cererilor (se aduna cu ce s-a cautat deja)
+    def load(self, index, queries=()):
+        with self._lock:
+            self.index = index
+            for text, n in queries:
+                self._add(normalize_prefix(text).strip(), n)
+
+    # params: text (str), n=1 (int)
+    # ce face: numara o cerere noua (apare imediat in sugestii)
+    def add_query(self, text, n=1):
+        with self._lock:
+            self._add(normalize_prefix(text).strip(), n)
+
+    def _add(self, key, n):
+        if not key:
+            return
+        if key not in self._queries:
+            starts = [0] + [i + 1 for i, c in enumerate(key) if c == " "]
+            for o in starts[:PREFIX_WORDS]:
+                insort(self._sorted, (key[o:], key))
+        self._queries[key] = self._queries.get(key, 0) + n
+
+    # params: prefix (str) -> ce a scris userul pana acum, k=5 (int)
+    # ce face: cele mai frecvente k completari (list[Completion], count = ponderea combinata); [] sub MIN_PREFIX
+    def complete(self, prefix, k=5):
+        key = normalize_prefix(prefix)
+        if len(key) < MIN_PREFIX or k <= 0:
+            return []
+        with self._lock:
+            index = self.index
+            lo = bisect_left(self._sorted, (key,))
+            hi = bisect_left(self._sorted, (key + "\U0010ffff",))
+            history = {t: self._queries[t] for _, t in self._sorted[lo:hi]}
+        corpus = index.complete(key, 2 * k) if index is not None else []
+        with self._lock:
+            # si completarile gasite la mijlocul textului ("alu" -> "doza aluminiu") primesc ponderea din istoric
+            weights = {c.text: c.count + QUERY_WEIGHT * self._queries.get(c.text, 0) for c in corpus}
+        for text, n in history.items():
+            if text not in weights:
+                weights[text] = QUERY_WEIGHT * n
+        ranked = sorted(weights.items(), key=lambda item: (-item[1], len(item[0]), item[0]))
+        return [Completion(text, w) for text, w in ranked[:k]]
@@ -0,0 +1,363 @@
+import os #foldere pt datele sintetice + rezultate
+import sys
+import json #rezultatele si baseline-ul
+import time #perf_counter
+import random #date sintetice reproductibile (seed fix)
+import sqlite3 #umplere rapida a tabelelor (executemany, o singura tranzactie)
+import argparse
+import platform
+import statistics
+import subprocess #commit-ul curent in rezultate (daca e repo git)
+import datetime as dt
+from types import SimpleNamespace
+
+from db import DB, QUIZ_DAILY_FROM_RAW, QUIZ_SUMMARY_FROM_RAW, RECYCLE_DAILY_FROM_RAW
+from ml_model import DATA_FILE, load_model, predict_proba, predict_proba_batch, train_model
+from ml_online import OnlineModel
+from map_render import FOLIUM_OK, MAP_CATEGORIES, MAP_CENTER, generate_map
+from point_store import open_store
+from geo_index import PointIndex
+from text_index import TextIndex, open_index
+
+BASE_DIR = os.path.dirname(__file__)
+BENCH_DIR = os.path.join(BASE_DIR, ".bench")
+
+# marimile datelor sintetice: randuri in quiz/reviews/recycle, puncte de colectare, exemple de antrenare,
+# texte clasificate in batch
+SCALES = {
+    "small":  {"quiz": 10_000, "reviews": 10_000, "recycle": 50_000, "points": 10_000,
+               "corpus": 5_000, "batch": 2_000},
+    "medium": {"quiz": 100_000, "reviews": 100_000, "recycle": 500_000, "points": 100_000,
+               "corpus": 50_000, "batch": 20_000},
+    "large":  {"quiz": 1_000_000, "reviews": 1_000_000, "recycle": 2_000_000, "points": 1_000_000,
+               "corpus": 200_000, "batch": 100_000},
+}
+GROUPS = ("db", "ml", "map", "ui")
+# regresie = mediana mai mare cu peste 25% fata de baseline si cu cel putin 0.05 ms (sub asta e zgomot)
+THRESHOLD = 0.25
+MIN_DELTA_MS = 0.05
+
+NICKNAMES = ["EcoMara", "GreenBot", "Reciclatorul", "MissRecycle", "PlasticFree", "Verde"]
+COMMENTS = ["Super utilă!", "Harta m-a ajutat mult.", "Quiz-ul e greu dar bun.", "Aș vrea mai multe categorii.",
+            "Ghidul e clar și frumos.", "Merge repede pe kiosk."]
+NOISE = ["vechi", "mic", "mare", "rupt", "gol", "murdar", "curat", "de la magazin", "din bucatarie", "folosit"]
+
+
+# params: values (list[float]) -> timpi in secunde
+# ce face: rezumatul unei masuratori in ms (min/mediana/p95/medie)
+def summarize(values):
+    ms = sorted(v * 1000 for v in values)
+    p95 = ms[min(len(ms) - 1, int(round(0.95 * (len(ms) - 1))))]
+    return {"n": len(ms), "min_ms": round(ms[0], 4), "median_ms": round(statistics.median(ms), 4),
+            "p95_ms": round(p95, 4), "mean_ms": round(statistics.fmean(ms), 4)}
+
+
+# params: fn (callable fara argumente), repeat (int), warmup (int)
+# ce face: ruleaza fn de warmup + repeat ori si intoarce timpii (s) doar pt rularile masurate
+def measure(fn, repeat=20, warmup=1):
+    for _ in range(warmup):
+        fn()
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+# params: path (str), sizes (dict), rng (random.Random)
+# ce face: baza de date cu schema aplicatiei (DB face migratiile) umpluta direct cu sqlite3 + agregatele refacute
+def make_db(path, sizes, rng):
+    DB(path).close()
+    now = int(time.time())
+    year = 365 * 86400
+    con = sqlite3.connect(path)
+    with con:
+        con.executemany("INSERT INTO quiz(score, total, created_at) VALUES (?, 10, ?)",
+                        ((rng.randint(0, 10), now - rng.randrange(year)) for _ in range(sizes["quiz"])))
+        con.executemany("INSERT INTO reviews(nickname, rating, comment, created_at) VALUES (?, ?, ?, ?)",
+                        ((rng.choice(NICKNAMES), rng.randint(1, 5), rng.choice(COMMENTS),
+                          dt.datetime.fromtimestamp(now - rng.randrange(year)).isoformat())
+                         for _ in range(sizes["reviews"])))
+        con.executemany("INSERT INTO recycle(category, created_at) VALUES (?, ?)",
+                        ((rng.choice(MAP_CATEGORIES), now - rng.randrange(year)) for _ in range(sizes["recycle"])))
+        con.execute("UPDATE stats SET stars = ? WHERE id=1", (sizes["quiz"] // 3,))
+        con.execute("DELETE FROM quiz_summary")
+        con.execute(f"INSERT INTO quiz_summary(id, count, best, sum_ratio) SELECT 1, * FROM ({QUIZ_SUMMARY_FROM_RAW})")
+        con.execute("DELETE FROM quiz_daily")
+        con.execute(f"INSERT INTO quiz_daily(day, count, best, sum_ratio) {QUIZ_DAILY_FROM_RAW}")
+        con.execute("DELETE FROM recycle_daily")
+        con.execute(f"INSERT INTO recycle_daily(day, category, n) {RECYCLE_DAILY_FROM_RAW}")
+    con.close()
+
+
+# params: n (int), rng (random.Random)
+# ce face: n puncte de colectare in jurul centrului hartii, in formatul din collect_points.json
+def make_points(n, rng):
+    lat0, lon0 = MAP_CENTER
+    return [{"name": f"Punct colectare sintetic {i}",
+             "lat": round(lat0 + rng.uniform(-0.5, 0.5), 6), "lon": round(lon0 + rng.uniform(-0.7, 0.7), 6),
+             "types": rng.sample(MAP_CATEGORIES, rng.randint(1, 3))} for i in range(n)]
+
+
+# params: n (int), rng (random.Random), data_file (str) -> setul real, din care se iau cuvintele pe categorii
+# ce face: n exemple de antrenare: cuvinte din exemplele reale ale aceleiasi categorii + cuvinte de umplutura
+def make_corpus(n, rng, data_file=DATA_FILE):
+    with open(data_file, "r", encoding="utf-8") as f:
+        base = json.load(f)
+    vocab = {}
+    for d in base:
+        vocab.setdefault(d["label"].strip(), set()).update(d["text"].lower().split())
+    vocab = {label: sorted(words) for label, words in vocab.items()}
+    labels = sorted(vocab)
+    corpus = []
+    for _ in range(n):
+        label = rng.choice(labels)
+        words = rng.sample(vocab[label], min(len(vocab[label]), rng.randint(1, 4)))
+        if rng.random() < 0.4:
+            words.append(rng.choice(NOISE))
+        corpus.append({"text": " ".join(words), "label": label})
+    return corpus
+
+
+# params: scale (str), seed (int), data_dir (str)
+# ce face: genereaza (o singura data per scala+seed) db-ul, punctele si corpusul; la rulari repetate le refoloseste
+def prepare_data(scale, seed=1, data_dir=BENCH_DIR):
+    sizes = SCALES[scale]
+    folder = os.path.join(data_dir, f"{scale}-{seed}")
+    marker = os.path.join(folder, "data.json")
+    paths = {"db": os.path.join(folder, "bench.db"), "points": os.path.join(folder, "points.json"),
+             "corpus": os.path.join(folder, "corpus.json"), "model": os.path.join(folder, "model.pkl"),
+             "online": os.path.join(folder, "online.pkl"), "store_dir": os.path.join(folder, "store"), "map": os.path.join(folder, "map.html"), "dir": folder}
+    try:
+        with open(marker, "r", encoding="utf-8") as f:
+            if json.load(f) == sizes:
+                return paths
+    except (OSError, ValueError):
+        pass
+
+    os.makedirs(folder, exist_ok=True)
+    rng = random.Random(seed)
+    t0 = time.perf_counter()
+    print(f" Generez datele sintetice ({scale}) in {folder} ...")
+    for p in (paths["db"], paths["db"] + "-wal", paths["db"] + "-shm"):
+        if os.path.exists(p):
+            os.remove(p)
+    make_db(paths["db"], sizes, rng)
+    with open(paths["points"], "w", encoding="utf-8") as f:
+        json.dump(make_points(sizes["points"], rng), f, ensure_ascii=False)
+    with open(paths["corpus"], "w", encoding="utf-8") as f:
+        json.dump(make_corpus(sizes["corpus"], rng), f, ensure_ascii=False)
+    with open(marker, "w", encoding="utf-8") as f:
+        json.dump(sizes, f)
+    print(f" Date gata in {time.perf_counter() - t0:.1f}s")
+    return paths
+
+
+# params: paths (dict) din prepare_data, sizes (dict), groups (tuple), quick (bool) -> mai putine repetari
+# ce face: ruleaza benchmark-urile si intoarce {nume: rezumat}; fiecare nume e stabil ca sa se poata compara intre rulari
+def run(paths, sizes, groups=GROUPS, quick=False):
+    rng = random.Random(7)
+    many, few = (5, 1) if quick else (50, 3)
+    results = {}
+
+    def record(name, times, items=None):
+        results[name] = summarize(times)
+        if items:
+            results[name]["items_per_s"] = round(items / statistics.median(times), 1)
+        r = results[name]
+        print(f"  {name:<34} median {r['median_ms']:>10.3f} ms   p95 {r['p95_ms']:>10.3f} ms"
+              + (f"   {r['items_per_s']:>12,.0f}/s" if items else ""))
+
+    db = DB(paths["db"]) if {"db", "ui"} & set(groups) else None
+    try:
+        if "db" in groups:
+            print(" [db]")
+            record("db.quiz_stats", measure(db.quiz_stats, many))
+            record("db.get_stars", measure(db.get_stars, many))
+            record("db.get_reviews", measure(db.get_reviews, few), sizes["reviews"])
+            record("db.get_reviews_page", measure(lambda: db.get_reviews_page(None, 50), many))
+            record("db.recycle_by_category", measure(db.recycle_by_category, many))
+            record("db.recycle_count", measure(lambda: db.recycle_count("Plastic"), few))
+            record("db.log_quiz", measure(lambda: (db.log_quiz(7, 10), db.pool.flush()), many))
+
+        if "ui" in groups:
+            # partea fara Tk din refresh-ul de statistici si de recenzii (ce ruleaza pe thread-ul de fundal);
+            # app se importa doar aici, ca benchmark-urile db/ml/map sa nu depinda de customtkinter
+            print(" [ui]")
+            from app import GreenVision
+            app = SimpleNamespace(db=db)
+            record("ui.read_stats", measure(lambda: GreenVision._read_stats(app), many))
+            app.review_feed = SimpleNamespace(reload=lambda: db.get_reviews_page(None, 50))
+            record("ui.refresh_reviews", measure(lambda: GreenVision._refresh_reviews(app), many))
+
+        if "ml" in groups:
+            import joblib # type: ignore
+            import importlib
+            for mod in ("sklearn.naive_bayes", "sklearn.feature_extraction.text"):
+                importlib.import_module(mod)  # importul sklearn nu intra in timpul de antrenare
+            print(" [ml]")
+            record("ml.train_model", measure(lambda: train_model(paths["corpus"], paths["model"]), few, warmup=0),
+                   sizes["corpus"])
+            with open(paths["corpus"], "r", encoding="utf-8") as f:
+                texts = [d["text"] for d in json.load(f)]
+            texts = [rng.choice(texts) for _ in range(sizes["batch"])]
+            # acelasi model: pickle-ul sklearn si varianta compilata (doar NumPy) pe care o foloseste load_model
+            record("ml.load_model", measure(lambda: load_model(paths["model"]), few))
+            for suffix, bundle in (("", joblib.load(paths["model"])), ("_compiled", load_model(paths["model"]))):
+                record(f"ml.predict_proba{suffix}", measure(lambda: predict_proba(rng.choice(texts), bundle), many * 4))
+                record(f"ml.predict_proba_batch{suffix}",
+                       measure(lambda: list(predict_proba_batch(texts, bundle, top_k=3)), few), len(texts))
+            # modelul online (tab-ul AI / server.py): incarcarea la pornire (.npz) si predictia sklearn vs compilata
+            online = OnlineModel.bootstrap(data_file=paths["corpus"], model_file=paths["online"])
+            online.save()
+            record("ml.online_load", measure(lambda: OnlineModel.load_or_bootstrap(paths["corpus"], paths["online"]), few))
+            for suffix, bundle in (("", (online.model, online.vectorizer)), ("_compiled", online.bundle)):
+                record(f"ml.online_predict_proba{suffix}", measure(lambda: predict_proba(rng.choice(texts), bundle),
+                                                                   many * 4))
+            # indexul de trigrame (tab-ul AI): construirea din corpus si o cautare cu greseli de scriere
+            index_dir = os.path.join(paths["dir"], "text_index")
+
+            def build_text_index():
+                for name in os.listdir(index_dir) if os.path.isdir(index_dir) else ():
+                    os.remove(os.path.join(index_dir, name))
+                open_index(paths["corpus"], index_dir)
+
+            record("ml.text_index_build", measure(build_text_index, few, warmup=0), sizes["corpus"])
+            record("ml.text_index_open", measure(lambda: TextIndex.from_file(paths["corpus"], index_dir), few))
+            text_index = TextIndex.from_file(paths["corpus"], index_dir)
+            typos = [t[:i] + t[i + 1:] for t in texts[:256] for i in [rng.randrange(len(t))]]
+            record("ml.similar", measure(lambda: text_index.similar(rng.choice(typos), k=3), many * 4))
+            # autocomplete: prefixele pe care le scrie userul tasta cu tasta (de la 2 caractere, ca in tab-ul AI)
+            prefixes = [t[:n] for t in texts[:64] for n in range(2, min(len(t), 12) + 1)]
+            record("ml.complete", measure(lambda: text_index.complete(rng.choice(prefixes), k=5), many * 4))
+
+        if "map" in groups:
+            print(" [map]")
+            store_dir = paths["store_dir"]
+
+            def compile_store():
+                for name in os.listdir(store_dir) if os.path.isdir(store_dir) else ():
+                    os.remove(os.path.join(store_dir, name))
+                open_store(paths["points"], store_dir).close()
+
+            record("map.compile_points", measure(compile_store, few, warmup=0), sizes["points"])
+            record("map.open_store", measure(lambda: open_store(paths["points"], store_dir).close(), many))
+            store = open_store(paths["points"], store_dir)
+            try:
+                index = []
+                record("map.build_index", measure(lambda: index.append(PointIndex(store)), few, warmup=0),
+                       sizes["points"])
+                lat0, lon0 = MAP_CENTER
+                queries = [(lat0 + rng.uniform(-0.4, 0.4), lon0 + rng.uniform(-0.5, 0.5)) for _ in range(256)]
+                record("map.nearest", measure(
+                    lambda: index[-1].nearest(*rng.choice(queries), k=3, category=rng.choice(MAP_CATEGORIES)),
+                    many * 4))
+                del index[:]
+                if FOLIUM_OK:
+                    record("map.generate_map", measure(lambda: generate_map(store, paths["map"]), few, warmup=0),
+                           sizes["points"])
+                else:
+                    print("  map.generate_map: folium nu e instalat, sar peste")
+            finally:
+                store.close()
+    finally:
+        if db is not None:
+            db.close()
+    return results
+
+
+# params: none
+# ce face: commit-ul curent (scurt) sau None daca nu e repo git
+def _git_rev():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR or ".",
+                             capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+# params: results (dict), baseline (dict), threshold (float), min_delta_ms (float)
+# ce face: compara medianele cu baseline-ul; intoarce (randuri pt tabel, nume regresii)
+def compare(results, baseline, threshold=THRESHOLD, min_delta_ms=MIN_DELTA_MS):
+    rows, regressions = [], []
+    base = baseline.get("results", {})
+    for name, r in results.items():
+        old = base.get(name)
+        if old is None:
+            rows.append((name, None, r["median_ms"], None, "nou"))
+            continue
+        ratio = r["median_ms"] / old["median_ms"] if old["median_ms"] > 0 else 1.0
+        delta = r["median_ms"] - old["median_ms"]
+        if ratio > 1 + threshold and delta > min_delta_ms:
+            status = "REGRESIE"
+            regressions.append(name)
+        elif ratio < 1 / (1 + threshold) and -delta > min_delta_ms:
+            status = "mai rapid"
+        else:
+            status = "ok"
+        rows.append((name, old["median_ms"], r["median_ms"], ratio, status))
+    return rows, regressions
+
+
+def main(argv=None):
+    # params: argv (list[str] sau None)
+    # ce face: python bench.py [--scale small|medium|large] [--only db,ml,map,ui] [--out rezultate.json]
+    #          [--baseline baseline.json] [--save-baseline baseline.json] [--quick]
+    #          exit code 1 daca vreun benchmark e mai lent decat baseline-ul peste prag
+    parser = argparse.ArgumentParser(description="Benchmark-uri GreenVision pe date sintetice")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--only", default=",".join(GROUPS), help="grupuri separate prin virgula (db,ml,map,ui)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--data-dir", default=BENCH_DIR, help="unde se pastreaza datele generate (refolosite)")
+    parser.add_argument("--out", help="fisierul JSON cu rezultatele (implicit .bench/results-<scala>.json)")
+    parser.add_argument("--baseline", help="rezultate anterioare cu care se compara")
+    parser.add_argument("--save-baseline", help="scrie si rezultatele ca baseline nou")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="incetinire toleranta (0.25 = 25%%)")
+    parser.add_argument("--quick", action="store_true", help="mai putine repetari (pt o verificare rapida)")
+    args = parser.parse_args(argv)
+
+    groups = tuple(g.strip() for g in args.only.split(",") if g.strip())
+    unknown = set(groups) - set(GROUPS)
+    if unknown:
+        parser.error(f"grupuri necunoscute: {', '.join(sorted(unknown))}")
+
+    sizes = SCALES[args.scale]
+    paths = prepare_data(args.scale, args.seed, args.data_dir)
+    results = run(paths, sizes, groups, quick=args.quick)
+    report = {
+        "meta": {"scale": args.scale, "sizes": sizes, "seed": args.seed, "groups": list(groups),
+                 "quick": args.quick, "git": _git_rev(), "python": platform.python_version(),
+                 "platform": platform.platform(), "cpus": os.cpu_count(),
+                 "created_at": dt.datetime.now().isoformat(timespec="seconds")},
+        "results": results,
+    }
+    out = args.out or os.path.join(args.data_dir, f"results-{args.scale}.json")
+    for path in filter(None, (out, args.save_baseline)):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    print(f" Rezultate: {out}")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("meta", {}).get("sizes") != sizes:
+        print(f" Atentie: baseline-ul e pe alta scala ({baseline.get('meta', {}).get('scale')}), comparatia e orientativa")
+    rows, regressions = compare(results, baseline, args.threshold)
+    print(f"\n {'benchmark':<34} {'baseline':>12} {'acum':>12} {'raport':>8}")
+    for name, old, new, ratio, status in rows:
+        old_s = f"{old:.3f}" if old is not None else "-"
+        ratio_s = f"{ratio:.2f}x" if ratio is not None else "-"
+        print(f" {name:<34} {old_s:>12} {new:>12.3f} {ratio_s:>8}  {status}")
+    if regressions:
+        print(f"\n {len(regressions)} regresii peste {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    print("\n Nicio regresie fata de baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,594 @@
+import sys #stderr pt erorile de scriere din fundal
+import time #masurare latenta (perf_counter)
+import queue #coada de scrieri pentru thread-ul writer
+import atexit #flush la iesire ca sa nu pierdem scrieri din coada
+import sqlite3 #baza de date locala (fisier .db) fara server, SQL direct din Python
+import threading #conexiune per thread + thread-ul writer
+import argparse #comenzi din linia de comanda (rebuild/verify statistici)
+import datetime as dt #data/ora curenta
+
+import perf_trace #latenta per metoda DB (doar cand masuratorile sunt pornite)
+
+DB_PATH = "greenvision.db"
+
+# recalculeaza agregatele din tabelele brute (folosit la migrare, la rebuild si la verify)
+# created_at e epoch (secunde, UTC); ziua se calculeaza in ora locala, la fel ca in log_quiz/log_recycle
+QUIZ_SUMMARY_FROM_RAW = """
+    SELECT COUNT(*), COALESCE(MAX(score), 0), COALESCE(SUM(CAST(score AS REAL) / total), 0.0)
+    FROM quiz WHERE total > 0
+"""
+QUIZ_DAILY_FROM_RAW = """
+    SELECT date(created_at, 'unixepoch', 'localtime') AS day, COUNT(*), MAX(score), SUM(CAST(score AS REAL) / total)
+    FROM quiz WHERE total > 0 GROUP BY day
+"""
+RECYCLE_DAILY_FROM_RAW = """
+    SELECT date(created_at, 'unixepoch', 'localtime') AS day, category, COUNT(*)
+    FROM recycle GROUP BY day, category
+"""
+
+# migratii schema: (versiune, lista de statements); versiunea curenta e in PRAGMA user_version.
+# fiecare migrare ruleaza intr-o singura tranzactie impreuna cu setarea versiunii
+MIGRATIONS = [
+    # 1: schema initiala (bazele vechi fara versiune au deja tabelele astea)
+    (1, [
+        "CREATE TABLE IF NOT EXISTS stats(id INTEGER PRIMARY KEY CHECK (id=1), stars INTEGER DEFAULT 0)",
+        "INSERT OR IGNORE INTO stats(id, stars) VALUES (1, 0)",
+        "CREATE TABLE IF NOT EXISTS recycle(category TEXT, created_at TEXT)",
+        "CREATE TABLE IF NOT EXISTS quiz(score INT, total INT, created_at TEXT)",
+        """
+        CREATE TABLE IF NOT EXISTS reviews(
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nickname TEXT NOT NULL,
+            rating INTEGER NOT NULL CHECK(rating BETWEEN 1 AND 5),
+            comment TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        )
+        """,
+    ]),
+    # 2: recycle/quiz primesc id (rowid explicit) si created_at ca epoch INTEGER + indecsi pt analytics.
+    #    textul ISO se taie la secunde (primele 19 caractere): SQLite rotunjeste microsecundele, iar
+    #    "23:59:59.999999" ar ajunge in ziua urmatoare
+    (2, [
+        "CREATE TABLE recycle_v2(id INTEGER PRIMARY KEY, category TEXT NOT NULL, created_at INTEGER NOT NULL)",
+        "INSERT INTO recycle_v2(category, created_at) "
+        "SELECT category, COALESCE(CAST(strftime('%s', substr(created_at, 1, 19), 'utc') AS INTEGER), 0) "
+        "FROM recycle ORDER BY rowid",
+        "DROP TABLE recycle",
+        "ALTER TABLE recycle_v2 RENAME TO recycle",
+        "CREATE INDEX idx_recycle_category_created ON recycle(category, created_at)",
+        "CREATE INDEX idx_recycle_created ON recycle(created_at)",
+        "CREATE TABLE quiz_v2(id INTEGER PRIMARY KEY, score INTEGER NOT NULL, total INTEGER NOT NULL, "
+        "created_at INTEGER NOT NULL)",
+        "INSERT INTO quiz_v2(score, total, created_at) "
+        "SELECT score, total, COALESCE(CAST(strftime('%s', substr(created_at, 1, 19), 'utc') AS INTEGER), 0) "
+        "FROM quiz ORDER BY rowid",
+        "DROP TABLE quiz",
+        "ALTER TABLE quiz_v2 RENAME TO quiz",
+        "CREATE INDEX idx_quiz_created ON quiz(created_at)",
+    ]),
+    # 3: agregate mentinute la fiecare insert (quiz total + pe zi, recycle pe zi si categorie)
+    (3, [
+        "CREATE TABLE IF NOT EXISTS quiz_summary(id INTEGER PRIMARY KEY CHECK (id=1), "
+        "count INTEGER NOT NULL, best INTEGER NOT NULL, sum_ratio REAL NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS quiz_daily(day TEXT PRIMARY KEY, "
+        "count INTEGER NOT NULL, best INTEGER NOT NULL, sum_ratio REAL NOT NULL)",
+        "DELETE FROM quiz_summary",
+        f"INSERT INTO quiz_summary(id, count, best, sum_ratio) SELECT 1, * FROM ({QUIZ_SUMMARY_FROM_RAW})",
+        "DELETE FROM quiz_daily",
+        f"INSERT INTO quiz_daily(day, count, best, sum_ratio) {QUIZ_DAILY_FROM_RAW}",
+        "CREATE TABLE IF NOT EXISTS recycle_daily(day TEXT NOT NULL, category TEXT NOT NULL, n INTEGER NOT NULL, "
+        "PRIMARY KEY(day, category)) WITHOUT ROWID",
+        "DELETE FROM recycle_daily",
+        f"INSERT INTO recycle_daily(day, category, n) {RECYCLE_DAILY_FROM_RAW}",
+    ]),
+    # 4: confirmari/corecturi din tab-ul AI (invatare incrementala)
+    (4, [
+        "CREATE TABLE ai_feedback(id INTEGER PRIMARY KEY, text TEXT NOT NULL, predicted TEXT, "
+        "label TEXT NOT NULL, created_at INTEGER NOT NULL)",
+    ]),
+    # 5: istoricul cererilor din tab-ul AI (text normalizat -> de cate ori), pt autocomplete;
+    #    pornit din textele de feedback existente
+    (5, [
+        "CREATE TABLE ai_queries(text TEXT PRIMARY KEY, n INTEGER NOT NULL, last_at INTEGER NOT NULL) WITHOUT ROWID",
+        "INSERT INTO ai_queries(text, n, last_at) "
+        "SELECT lower(trim(text)), COUNT(*), MAX(created_at) FROM ai_feedback WHERE trim(text) != '' "
+        "GROUP BY lower(trim(text))",
+    ]),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+class _WriteJob:
+    # params: op (str), statements (list[(sql, params)]), waited (bool) -> cineva asteapta rezultatul
+    # ce face: o scriere pusa in coada; event-ul se seteaza cand tranzactia a fost comisa
+    def __init__(self, op, statements, waited=False):
+        self.op = op
+        self.statements = statements
+        self.enqueued = time.perf_counter()
+        self.done = threading.Event()
+        self.error = None
+        self.waited = waited
+
+    def run(self, con):
+        for sql, params in self.statements:
+            con.execute(sql, params)
+
+
+class _FlushJob:
+    # params: none
+    # ce face: marcaj in coada; inchide batch-ul curent imediat si anunta cand s-a comis tot ce era inainte
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class SQLitePool:
+    # params: path (str), batch_window (float, secunde), max_batch (int)
+    # ce face: tine conexiunile deschise cat traieste procesul (una per thread pt citiri + un writer dedicat),
+    #          porneste WAL si grupeaza scrierile facute apropiat in timp intr-o singura tranzactie
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",      # cititorii nu mai blocheaza writer-ul
+        "PRAGMA synchronous=NORMAL",    # in WAL e sigur si face fsync doar la checkpoint
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-8000",      # ~8 MB cache de pagini
+        "PRAGMA mmap_size=67108864",    # 64 MB citiri prin mmap
+        "PRAGMA busy_timeout=5000",
+    )
+
+    def __init__(self, path, batch_window=0.05, max_batch=256):
+        self.path = path
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self._local = threading.local()
+        self._conns = []
+        self._conns_lock = threading.Lock()
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._closed = False
+        self._writer = threading.Thread(target=self._write_loop, name="sqlite-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    # params: none
+    # ce face: deschide o conexiune noua cu pragmas setate (o tine minte ca sa o inchidem la close)
+    def _connect(self):
+        con = sqlite3.connect(self.path, check_same_thread=False)
+        for pragma in self.PRAGMAS:
+            con.execute(pragma)
+        with self._conns_lock:
+            self._conns.append(con)
+        return con
+
+    # params: none
+    # ce face: conexiunea de citire a thread-ului curent (creata o singura data)
+    def _reader(self):
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = self._local.con = self._connect()
+        return con
+
+    # params: op (str), seconds (float)
+    # ce face: adauga o masuratoare la statisticile operatiei (count, total, max)
+    def _record(self, op, seconds):
+        with self._stats_lock:
+            st = self._stats.setdefault(op, [0, 0.0, 0.0])
+            st[0] += 1
+            st[1] += seconds
+            st[2] = max(st[2], seconds)
+
+    # params: op (str), statements (list[(sql, params)]), wait (bool)
+    # ce face: pune scrierea in coada writer-ului; cu wait=True asteapta commit-ul si ridica eroarea daca a picat
+    def write(self, op, statements, wait=False):
+        if self._closed or not self._writer.is_alive():
+            raise sqlite3.ProgrammingError("SQLitePool este inchis")
+        job = _WriteJob(op, statements, waited=wait)
+        self._queue.put(job)
+        if wait:
+            # marcajul de flush inchide batch-ul imediat, nu mai asteptam toata fereastra
+            self.flush()
+            job.done.wait()
+            if job.error is not None:
+                raise job.error
+        return job
+
+    # params: op (str), sql (str), params (tuple), one (bool)
+    # ce face: citeste ce e comis acum, fara sa astepte scrierile din coada (un flush la fiecare citire ar inchide
+    #          batch-ul writer-ului devreme si ar face un commit per citire). cine trebuie sa vada o scriere proprie
+    #          nesteptata apeleaza flush() inainte (sau scrie cu wait=True)
+    def read(self, op, sql, params=(), one=False):
+        start = time.perf_counter()
+        cur = self._reader().execute(sql, params)
+        rows = cur.fetchone() if one else cur.fetchall()
+        self._record(op, time.perf_counter() - start)
+        return rows
+
+    # params: none
+    # ce face: asteapta pana cand tot ce era in coada a ajuns pe disc
+    def flush(self):
+        if self._closed or not self._writer.is_alive():
+            return
+        marker = _FlushJob()
+        self._queue.put(marker)
+        marker.done.wait()
+
+    # params: none
+    # ce face: thread-ul writer; aduna joburile venite in batch_window si le comite intr-o singura tranzactie
+    def _write_loop(self):
+        con = self._connect()
+        stop = False
+        while not stop:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch, markers = [], []
+            (markers if isinstance(first, _FlushJob) else batch).append(first)
+            deadline = time.perf_counter() + self.batch_window
+            while not markers and len(batch) < self.max_batch:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    nxt = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stop = True
+                    break
+                (markers if isinstance(nxt, _FlushJob) else batch).append(nxt)
+            self._commit(con, batch)
+            for m in markers:
+                m.done.set()
+        # ce a mai ramas in coada dupa oprire (close) se comite tot aici
+        rest = []
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(job, _FlushJob):
+                job.done.set()
+            elif job is not None:
+                rest.append(job)
+        self._commit(con, rest)
+
+    # params: con (sqlite3.Connection), batch (list[_WriteJob])
+    # ce face: un singur BEGIN/COMMIT pt tot batch-ul; daca pica, reia joburile unul cate unul
+    #          ca o scriere invalida sa nu le strice pe celelalte.
+    #          BEGIN e explicit ca si DDL-ul (migratiile) sa fie in aceeasi tranzactie.
+    #          prinde orice exceptie (nu doar sqlite3.Error: ex. OverflowError la un int prea mare in params),
+    #          altfel thread-ul writer ar muri si write(wait=True) ar astepta la nesfarsit
+    def _commit(self, con, batch):
+        if not batch:
+            return
+        try:
+            with con:
+                con.execute("BEGIN")
+                for job in batch:
+                    job.run(con)
+        except Exception:
+            for job in batch:
+                try:
+                    with con:
+                        con.execute("BEGIN")
+                        job.run(con)
+                except Exception as e:
+                    job.error = e
+                    if not job.waited:
+                        # nimeni nu asteapta jobul, deci macar sa se vada in consola
+                        print(f" Scriere esuata ({job.op}): {e}", file=sys.stderr)
+        now = time.perf_counter()
+        for job in batch:
+            self._record(job.op, now - job.enqueued)
+            job.done.set()
+
+    # params: none
+    # ce face: latenta per operatie (ms) -> {op: {"count", "avg_ms", "max_ms"}}
+    def latency_report(self):
+        with self._stats_lock:
+            return {
+                op: {"count": c, "avg_ms": total / c * 1000, "max_ms": mx * 1000}
+                for op, (c, total, mx) in sorted(self._stats.items())
+            }
+
+    # params: none
+    # ce face: goleste coada, opreste writer-ul si inchide toate conexiunile (apelat si la atexit)
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+        with self._conns_lock:
+            for con in self._conns:
+                con.close()
+            self._conns.clear()
+
+
+@perf_trace.trace_methods("db", exclude=("close", "latency_report", "schema_version"))
+class DB:
+# param: path (str) -> fisierul sqlite (implicit DB_PATH)
+# constructor, deschide pool-ul de conexiuni si initializeaza tabelele daca nu exista
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self.pool = SQLitePool(path)
+        self._init_db()
+# aduce schema la SCHEMA_VERSION ruland migratiile lipsa (fiecare intr-o tranzactie, cu user_version actualizat)
+    def _init_db(self):
+        for version, statements in MIGRATIONS:
+            if version <= self.schema_version():
+                continue
+            self.pool.write(f"migrate_v{version}",
+                            [(sql, ()) for sql in statements] + [(f"PRAGMA user_version = {version}", ())],
+                            wait=True)
+# param: none
+# versiunea schemei din baza de date (0 = baza veche, dinainte de migratii)
+    def schema_version(self):
+        return self.pool.read("schema_version", "PRAGMA user_version", one=True)[0]
+
+# param: n=1 (int)->cate stelute adauga
+#  creste numarul de stelute din stats (id=1)
+    def add_star(self, n=1):
+        self.pool.write("add_star", [("UPDATE stats SET stars = stars + ? WHERE id=1", (n,))])
+# param: none
+# citeste cate stelute ai strans pana acum (fallback 0 daca nu gaseste randul)
+    def get_stars(self):
+        row = self.pool.read("get_stars", "SELECT stars FROM stats WHERE id=1", one=True)
+        return row[0] if row else 0
+
+# param: cat (str)->categoria reciclata (ex: "Plastic")
+# salveaza un log in tabelul recycle cu timestamp (epoch) si actualizeaza rollup-ul pe zi in aceeasi tranzactie
+    def log_recycle(self, cat):
+        now = int(time.time())
+        self.pool.write("log_recycle", [
+            ("INSERT INTO recycle(category, created_at) VALUES (?, ?)", (cat, now)),
+            ("INSERT INTO recycle_daily(day, category, n) VALUES (?, ?, 1) "
+             "ON CONFLICT(day, category) DO UPDATE SET n = n + 1",
+             (_local_day(now), cat)),
+        ])
+
+# param: score (int), total (int)
+# salveaza un log in tabelul quiz cu scor + total + timestamp (epoch) si actualizeaza agregatele in aceeasi tranzactie
+    def log_quiz(self, score, total):
+        now = int(time.time())
+        statements = [("INSERT INTO quiz(score, total, created_at) VALUES (?, ?, ?)", (score, total, now))]
+        if total > 0:
+            ratio = score / total
+            statements += [
+                ("UPDATE quiz_summary SET count = count + 1, best = MAX(best, ?), sum_ratio = sum_ratio + ? WHERE id=1",
+                 (score, ratio)),
+                ("INSERT INTO quiz_daily(day, count, best, sum_ratio) VALUES (?, 1, ?, ?) "
+                 "ON CONFLICT(day) DO UPDATE SET count = count + 1, best = MAX(best, excluded.best), "
+                 "sum_ratio = sum_ratio + excluded.sum_ratio",
+                 (_local_day(now), score, ratio)),
+            ]
+        self.pool.write("log_quiz", statements)
+    # param: none
+    # calculeaza statistici quiz din quiz_summary (un singur rand, nu scaneaza istoricul):
+    # - best = cel mai mare scor
+    # - avg = media procentuala (scor/total)
+    # - count = cate quizuri s-au dat
+    def quiz_stats(self):
+        row = self.pool.read("quiz_stats", "SELECT count, best, sum_ratio FROM quiz_summary WHERE id=1", one=True)
+        if not row or not row[0]:
+            return 0, 0.0, 0
+        count, best, sum_ratio = row
+        return best, sum_ratio / count * 100, count
+# param: since (str "YYYY-MM-DD" sau None)
+# statistici quiz pe zile: lista de (zi, count, best, avg%) din quiz_daily
+    def quiz_daily_stats(self, since=None):
+        rows = self.pool.read(
+            "quiz_daily_stats",
+            "SELECT day, count, best, sum_ratio FROM quiz_daily WHERE day >= ? ORDER BY day",
+            (since or "",),
+        )
+        return [(day, count, best, sum_ratio / count * 100) for day, count, best, sum_ratio in rows]
+# param: none
+# reface quiz_summary si quiz_daily din tabela quiz (o singura tranzactie)
+    def rebuild_quiz_summary(self):
+        self.pool.write("rebuild_quiz_summary", [
+            ("DELETE FROM quiz_summary", ()),
+            (f"INSERT INTO quiz_summary(id, count, best, sum_ratio) SELECT 1, * FROM ({QUIZ_SUMMARY_FROM_RAW})", ()),
+            ("DELETE FROM quiz_daily", ()),
+            (f"INSERT INTO quiz_daily(day, count, best, sum_ratio) {QUIZ_DAILY_FROM_RAW}", ()),
+        ], wait=True)
+# param: none
+# compara agregatele cu ce rezulta din tabela bruta; returneaza lista de diferente (goala = ok)
+    def verify_quiz_summary(self):
+        problems = []
+        expected = self.pool.read("verify_quiz_summary", QUIZ_SUMMARY_FROM_RAW, one=True)
+        actual = self.pool.read("verify_quiz_summary",
+                                "SELECT count, best, sum_ratio FROM quiz_summary WHERE id=1", one=True)
+        if not _same_aggregate(expected, actual):
+            problems.append(f"quiz_summary: asteptat {expected}, gasit {actual}")
+        expected_days = {r[0]: r[1:] for r in self.pool.read("verify_quiz_summary", QUIZ_DAILY_FROM_RAW)}
+        actual_days = {r[0]: r[1:] for r in self.pool.read(
+            "verify_quiz_summary", "SELECT day, count, best, sum_ratio FROM quiz_daily")}
+        for day in sorted(set(expected_days) | set(actual_days)):
+            if not _same_aggregate(expected_days.get(day), actual_days.get(day)):
+                problems.append(f"quiz_daily[{day}]: asteptat {expected_days.get(day)}, gasit {actual_days.get(day)}")
+        return problems
+
+# param: category (str sau None), since/until (epoch int sau None)
+# numara reciclarile dintr-un interval exact (range scan pe indexul (category, created_at) sau (created_at))
+    def recycle_count(self, category=None, since=None, until=None):
+        sql = "SELECT COUNT(*) FROM recycle WHERE created_at >= ? AND created_at < ?"
+        params = [since if since is not None else 0, until if until is not None else 2**62]
+        if category is not None:
+            sql += " AND category = ?"
+            params.append(category)
+        return self.pool.read("recycle_count", sql, tuple(params), one=True)[0]
+# param: since/until (zi "YYYY-MM-DD" / date sau None, inclusiv)
+# reciclari pe categorie -> [(category, n)] descrescator (din recycle_daily, nu din log-ul brut)
+    def recycle_by_category(self, since=None, until=None):
+        return self.pool.read(
+            "recycle_by_category",
+            "SELECT category, SUM(n) FROM recycle_daily WHERE day BETWEEN ? AND ? "
+            "GROUP BY category ORDER BY SUM(n) DESC, category",
+            _day_range(since, until),
+        )
+# param: category (str sau None), since/until (zi "YYYY-MM-DD" / date sau None, inclusiv)
+# reciclari pe zi -> [(zi, n)]
+    def recycle_by_day(self, category=None, since=None, until=None):
+        sql, params = "SELECT day, SUM(n) FROM recycle_daily WHERE day BETWEEN ? AND ?", _day_range(since, until)
+        if category is not None:
+            sql += " AND category = ?"
+            params += (category,)
+        return self.pool.read("recycle_by_day", sql + " GROUP BY day ORDER BY day", params)
+# param: category (str sau None), since/until (zi "YYYY-MM-DD" / date sau None, inclusiv)
+# reciclari pe saptamana (luni-duminica) -> [(zi de luni "YYYY-MM-DD", n)]
+    def recycle_by_week(self, category=None, since=None, until=None):
+        week = "date(day, '-' || ((CAST(strftime('%w', day) AS INTEGER) + 6) % 7) || ' days')"
+        sql, params = f"SELECT {week} AS week, SUM(n) FROM recycle_daily WHERE day BETWEEN ? AND ?", _day_range(since, until)
+        if category is not None:
+            sql += " AND category = ?"
+            params += (category,)
+        return self.pool.read("recycle_by_week", sql + " GROUP BY week ORDER BY week", params)
+
+# param: text (str), predicted (str) -> ce a zis modelul, label (str) -> raspunsul corect (confirmat sau corectat),
+#        wait (bool) -> asteapta commit-ul (si ridica eroarea); fara, cine il citeste face intai flush()
+# salveaza feedback-ul userului pt o predictie AI
+    def add_ai_feedback(self, text, predicted, label, wait=True):
+        self.pool.write("add_ai_feedback", [(
+            "INSERT INTO ai_feedback(text, predicted, label, created_at) VALUES (?, ?, ?, ?)",
+            (text, predicted, label, int(time.time())),
+        )], wait=wait)
+# param: after_id (int)
+# feedback-ul mai nou decat after_id -> [(id, text, label)] in ordinea in care a fost dat
+    def get_ai_feedback(self, after_id=0):
+        return self.pool.read(
+            "get_ai_feedback",
+            "SELECT id, text, label FROM ai_feedback WHERE id > ? ORDER BY id",
+            (after_id,),
+        )
+# param: none
+# id-ul celui mai nou feedback (0 daca nu exista)
+    def last_ai_feedback_id(self):
+        return self.pool.read("last_ai_feedback_id", "SELECT COALESCE(MAX(id), 0) FROM ai_feedback", one=True)[0]
+
+# param: text (str) -> cererea normalizata (ml_model.normalize_text)
+# numara o cerere din tab-ul AI (nu asteapta commit-ul; autocomplete-ul tine si el contorul in memorie)
+    def log_ai_query(self, text):
+        self.pool.write("log_ai_query", [(
+            "INSERT INTO ai_queries(text, n, last_at) VALUES (?, 1, ?) "
+            "ON CONFLICT(text) DO UPDATE SET n = n + 1, last_at = excluded.last_at",
+            (text, int(time.time())),
+        )])
+# param: limit (int)
+# cele mai frecvente cereri din tab-ul AI -> [(text, n)]
+    def top_ai_queries(self, limit=5000):
+        return self.pool.read(
+            "top_ai_queries",
+            "SELECT text, n FROM ai_queries ORDER BY n DESC, last_at DESC LIMIT ?",
+            (limit,),
+        )
+
+# param: nickname (str), rating (int 1..5), comment (str)
+#  adauga o recenzie in tabela reviews cu timestamp (asteapta commit-ul ca sa vada erorile de CHECK)
+    def add_review(self, nickname, rating, comment):
+        self.pool.write("add_review", [(
+            "INSERT INTO reviews(nickname, rating, comment, created_at) VALUES (?,?,?,?)",
+            (nickname, rating, comment, dt.datetime.now().isoformat()),
+        )], wait=True)
+# param: none
+# ia lista de recenzii (cele mai noi primele)
+    def get_reviews(self):
+        return self.pool.read(
+            "get_reviews",
+            "SELECT nickname, rating, comment, created_at FROM reviews ORDER BY id DESC"
+        )
+# param: before_id (int sau None), limit (int)
+# o pagina de recenzii mai vechi decat before_id (keyset pe id, fara OFFSET) -> (id, nickname, rating, comment, created_at)
+    def get_reviews_page(self, before_id=None, limit=50):
+        if before_id is None:
+            return self.pool.read(
+                "get_reviews_page",
+                "SELECT id, nickname, rating, comment, created_at FROM reviews ORDER BY id DESC LIMIT ?",
+                (limit,),
+            )
+        return self.pool.read(
+            "get_reviews_page",
+            "SELECT id, nickname, rating, comment, created_at FROM reviews WHERE id < ? ORDER BY id DESC LIMIT ?",
+            (before_id, limit),
+        )
+# param: after_id (int)
+# recenziile adaugate dupa after_id (cele mai noi primele), pt a le pune deasupra listei
+    def get_reviews_since(self, after_id):
+        return self.pool.read(
+            "get_reviews_since",
+            "SELECT id, nickname, rating, comment, created_at FROM reviews WHERE id > ? ORDER BY id DESC",
+            (after_id,),
+        )
+# param: none
+# true daca exista macar o recenzie (fara COUNT pe toata tabela)
+    def has_reviews(self):
+        return self.pool.read("has_reviews", "SELECT 1 FROM reviews LIMIT 1", one=True) is not None
+
+# param: none
+# asteapta scrierile din coada (citirile nu o fac singure); pt cine vrea sa vada ce tocmai a scris fara wait=True
+    def flush(self):
+        self.pool.flush()
+
+# param: none
+# latenta per operatie (ms), util cand un kiosk pare lent
+    def latency_report(self):
+        return self.pool.latency_report()
+
+# param: none
+# comite scrierile ramase si inchide conexiunile
+    def close(self):
+        self.pool.close()
+
+
+# params: ts (int epoch)
+# ce face: ziua locala "YYYY-MM-DD" (aceeasi conventie ca date(..., 'unixepoch', 'localtime') din SQL)
+def _local_day(ts):
+    return dt.datetime.fromtimestamp(ts).date().isoformat()
+
+
+# params: since, until (str "YYYY-MM-DD" / dt.date / None)
+# ce face: capetele intervalului pt "day BETWEEN ? AND ?" (None = fara limita)
+def _day_range(since, until):
+    return (str(since) if since is not None else "0000-00-00",
+            str(until) if until is not None else "9999-99-99")
+
+
+# params: a, b (tuple(count, best, sum_ratio) sau None)
+# ce face: compara doua agregate; sum_ratio e float, deci toleranta mica la rotunjiri
+def _same_aggregate(a, b):
+    if a is None or b is None:
+        return a == b
+    return a[0] == b[0] and a[1] == b[1] and abs(a[2] - b[2]) < 1e-6
+
+
+# params: none
+# ce face: comenzi de intretinere pt baza de date:
+#   python db.py rebuild-quiz-stats   -> reface agregatele quiz din istoric
+#   python db.py verify-quiz-stats    -> verifica agregatele (exit code 1 daca difera)
+#   python db.py migrate              -> aplica migratiile lipsa si afiseaza versiunea schemei
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Intretinere baza de date GreenVision")
+    parser.add_argument("command", choices=["rebuild-quiz-stats", "verify-quiz-stats", "migrate"])
+    parser.add_argument("--db", default=DB_PATH, help="fisierul sqlite (implicit: %(default)s)")
+    args = parser.parse_args(argv)
+
+    db = DB(args.db)
+    try:
+        if args.command == "migrate":
+            print(f" Schema la versiunea {db.schema_version()} (ultima: {SCHEMA_VERSION})")
+            return 0
+        if args.command == "rebuild-quiz-stats":
+            db.rebuild_quiz_summary()
+            best, avg, count = db.quiz_stats()
+            print(f" Agregate refacute: {count} quizuri, best {best}, medie {avg:.1f}%")
+            return 0
+        problems = db.verify_quiz_summary()
+        for p in problems:
+            print(" " + p)
+        print(" Agregatele quiz sunt corecte." if not problems else f" {len(problems)} diferente gasite.")
+        return 1 if problems else 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
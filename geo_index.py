@@ -0,0 +1,139 @@
+import math #haversine, floor pt celulele grilei
+import heapq #cele mai apropiate k puncte fara sortare completa
+from array import array
+from collections import namedtuple
+
+from point_store import COLLECT_JSON, open_store
+
+EARTH_KM = 6371.0088
+# cate puncte vrem in medie intr-o celula a grilei (mai putine = mai multe celule goale de parcurs)
+POINTS_PER_CELL = 16
+
+# un rezultat din nearest(): distanta in km + datele punctului
+Nearby = namedtuple("Nearby", "distance_km name lat lon types")
+
+
+# params: lat1, lon1, lat2, lon2 (float, grade)
+# ce face: distanta pe sfera (km) intre doua puncte
+def haversine_km(lat1, lon1, lat2, lon2):
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class PointIndex:
+    # params: store (PointStore) -> punctele de colectare compilate (point_store.open_store)
+    # ce face: grila lat/lon peste punctele de colectare + cate o grila per tip (index inversat tip -> celule -> puncte);
+    #          nearest() cauta in inele de celule in jurul locatiei si se opreste cand niciun punct mai departe
+    #          nu mai poate intra in top k, deci costul depinde de densitate, nu de numarul total de puncte.
+    #          coordonatele/numele raman in fisierul mapat; indexul tine doar id-urile punctelor pe celule
+    def __init__(self, store):
+        self.store = store
+        lat, lon = store.lat, store.lon
+        self._cos = array("d", (math.cos(math.radians(a)) for a in lat))
+
+        n = len(store)
+        if n:
+            self.lat0, self.lon0 = min(lat), min(lon)
+            span_lat, span_lon = max(lat) - self.lat0, max(lon) - self.lon0
+            max_abs_lat = max(max(lat), -self.lat0)
+        else:
+            self.lat0, self.lon0, span_lat, span_lon, max_abs_lat = 0.0, 0.0, 0.0, 0.0, 0.0
+        # celule ~patrate in km: latura in grade de lat, iar in lon corectata cu cos(latitudine)
+        cos_lat = max(0.01, math.cos(math.radians(max_abs_lat)))
+        area = max(span_lat, 1e-6) * max(span_lon * cos_lat, 1e-6)
+        self.dlat = max(1e-4, math.sqrt(area * POINTS_PER_CELL / max(n, 1)))
+        self.dlon = self.dlat / cos_lat
+        # cel mai mic pas de celula in km (lon se ingusteaza spre poli) -> limita de jos pt punctele nevazute
+        self._cell_km = EARTH_KM * min(math.radians(self.dlat), math.radians(self.dlon) * cos_lat)
+
+        # None = toate punctele; restul = index inversat pe tip (bitul din masca -> numele tipului)
+        self._grids = {None: {}}
+        bits = list(enumerate(store.types))
+        masks = store.masks
+        for i in range(n):
+            cell = self._cell(lat[i], lon[i])
+            self._grids[None].setdefault(cell, array("I")).append(i)
+            mask = masks[i]
+            for b, t in bits:
+                if mask >> b & 1:
+                    self._grids.setdefault(t, {}).setdefault(cell, array("I")).append(i)
+        self._bounds = {}
+        for key, grid in self._grids.items():
+            if grid:
+                rows = [c[0] for c in grid]
+                cols = [c[1] for c in grid]
+                self._bounds[key] = (min(rows), max(rows), min(cols), max(cols))
+
+    # params: path (str)
+    # ce face: index construit peste fisierul compilat al json-ului (recompilat doar daca json-ul s-a schimbat)
+    @classmethod
+    def from_file(cls, path=COLLECT_JSON):
+        return cls(open_store(path))
+
+    def __len__(self):
+        return len(self.store)
+
+    # params: none
+    # ce face: tipurile care au cel putin un punct (ex: "Plastic", "Hârtie")
+    def categories(self):
+        return sorted(k for k in self._grids if k is not None)
+
+    def _cell(self, lat, lon):
+        return (math.floor((lat - self.lat0) / self.dlat), math.floor((lon - self.lon0) / self.dlon))
+
+    # params: ci, cj (int) celula locatiei, r (int) raza inelului, bounds (tuple)
+    # ce face: celulele de pe inelul r (marginea patratului (2r+1)x(2r+1)), taiate la marginile grilei
+    @staticmethod
+    def _ring(ci, cj, r, bounds):
+        imin, imax, jmin, jmax = bounds
+        if r == 0:
+            yield ci, cj
+            return
+        j_lo, j_hi = max(cj - r, jmin), min(cj + r, jmax)
+        for i in (ci - r, ci + r):
+            if imin <= i <= imax:
+                for j in range(j_lo, j_hi + 1):
+                    yield i, j
+        for j in (cj - r, cj + r):
+            if jmin <= j <= jmax:
+                for i in range(max(ci - r + 1, imin), min(ci + r - 1, imax) + 1):
+                    yield i, j
+
+    # params: lat, lon (float) locatia, k=3 (int), category=None (str) -> ex "Plastic"; None = orice punct
+    # ce face: cele mai apropiate k puncte care accepta categoria, sortate dupa distanta (list[Nearby])
+    def nearest(self, lat, lon, k=3, category=None):
+        grid = self._grids.get(category)
+        if not grid or k <= 0:
+            return []
+        bounds = self._bounds[category]
+        imin, imax, jmin, jmax = bounds
+        ci, cj = self._cell(lat, lon)
+        # locatia poate fi in afara grilei: inelele dinainte de prima celula cu date sunt sigur goale
+        r = max(0, imin - ci, ci - imax, jmin - cj, cj - jmax)
+        r_max = max(ci - imin, imax - ci, cj - jmin, jmax - cj)
+
+        qlat, qlon = math.radians(lat), math.radians(lon)
+        qcos = math.cos(qlat)
+        best = []  # heap cu (-distanta, index): varful e cel mai departat din top k
+        plats, plons, pcoss = self.store.lat, self.store.lon, self._cos
+        while r <= r_max:
+            for cell in self._ring(ci, cj, r, bounds):
+                for i in grid.get(cell, ()):
+                    dp = math.radians(plats[i]) - qlat
+                    dl = math.radians(plons[i]) - qlon
+                    a = math.sin(dp / 2) ** 2 + qcos * pcoss[i] * math.sin(dl / 2) ** 2
+                    d = 2 * EARTH_KM * math.asin(min(1.0, math.sqrt(a)))
+                    if len(best) < k:
+                        heapq.heappush(best, (-d, i))
+                    elif d < -best[0][0]:
+                        heapq.heapreplace(best, (-d, i))
+            # dupa inelul r, orice punct nevazut e la cel putin r celule distanta
+            if len(best) == k and -best[0][0] <= r * self._cell_km:
+                break
+            r += 1
+
+        store = self.store
+        return [Nearby(-nd, store.name(i), store.lat[i], store.lon[i], store.types_of(i))
+                for nd, i in sorted(best, reverse=True)]
@@ -0,0 +1,268 @@
+import os #cai/fisiere, stat (mtime/marime), replace atomic
+import json #payload-ul de puncte din pagina
+import glob #curatare fisiere vechi din cache
+import hashlib #hash pe continutul collect_points.json
+import tempfile #scriere atomica a html-ului generat
+import threading #cache-ul e folosit si de pe thread-ul de generare
+import importlib.util #verificare folium instalat fara sa-l importam
+import html as html_lib #escapare in pagina de redirectionare a filtrului
+from urllib.parse import quote #filtrul hartii in URL (#filtru=H%C3%A2rtie)
+from functools import lru_cache
+
+import perf_trace #generate_map apare in tab-ul de diagnoza
+from point_store import COLLECT_JSON, open_store #punctele compilate pe coloane (mmap), nu json.load la fiecare randare
+
+# folium (harta interactiva html) e greu de importat: aici doar verificam ca e instalat, importul real se face
+# la prima randare, pe thread-ul hartii. daca lipseste ,harta iti spune sa dai pip install folium
+FOLIUM_OK = importlib.util.find_spec("folium") is not None
+
+BASE_DIR = os.path.dirname(__file__)
+MAP_CACHE_DIR = os.path.join(BASE_DIR, ".map_cache")
+# centrul hartii (Timisoara); si locatia implicita pt "unde il duc?" din tab-ul AI
+MAP_CENTER = (45.75, 21.23)
+
+
+# categoriile din butoanele de filtru (app.py) si din control-ul de pe harta, in aceeasi ordine
+MAP_CATEGORIES = ("Plastic", "Hârtie", "Sticlă", "Electronice", "Ulei uzat")
+
+
+# params: store (PointStore)
+# ce face: payload compact pt harta: tabela de tipuri o singura data + fiecare punct ca [lat, lon, nume, masca_biti],
+#          unde bitul i din masca = punctul accepta types[i] (aceleasi masti ca in fisierul compilat; in JS incap 31 de tipuri);
+#          coordonatele rotunjite la 5 zecimale (~1m)
+def compact_payload(store):
+    lat, lon, masks = store.lat, store.lon, store.masks
+    rows = [[round(lat[i], 5), round(lon[i], 5), store.name(i), masks[i]] for i in range(len(store))]
+    return {"types": list(store.types), "points": rows}
+
+
+# params: none
+# ce face: clasa ClusteredPoints, definita la primul apel (importa folium atunci, nu la importul modulului)
+@lru_cache(maxsize=None)
+def _clustered_points_class():
+    import folium
+    from folium.elements import JSCSSMixin
+    from folium.template import Template
+    from folium.plugins import MarkerCluster
+
+    class ClusteredPoints(JSCSSMixin, folium.MacroElement):
+        # params: payload (dict) din compact_payload
+        # ce face: markerele se construiesc in browser din payload (nu cate un folium.Marker in html),
+        #          grupate cu Leaflet.markercluster; control cu bife pe categorii, filtrarea ruleaza doar in pagina.
+        #          filtrul initial vine din #filtru=<categorie> in URL (butoanele din aplicatie) sau din ultima alegere
+        _template = Template("""
+            {% macro header(this, kwargs) %}
+            <style>
+                .gv-filter { background: #FFFFFF; padding: 8px 10px; border-radius: 10px; font: 13px sans-serif;
+                             box-shadow: 0 1px 5px rgba(0,0,0,0.3); color: #1B4332; }
+                .gv-filter label { display: block; margin: 2px 0; cursor: pointer; }
+                .gv-filter button { margin-top: 6px; border: 0; border-radius: 8px; padding: 3px 10px;
+                                    background: #95D5B2; color: #1B4332; cursor: pointer; }
+                .gv-filter .gv-empty { display: none; margin-top: 6px; font-weight: bold; }
+            </style>
+            {% endmacro %}
+
+            {% macro script(this, kwargs) %}
+            (function () {
+                var map = {{ this._parent.get_name() }};
+                var data = {{ this.payload_json }};
+                var categories = {{ this.categories_json }};
+                var cluster = L.markerClusterGroup({chunkedLoading: true});
+                map.addLayer(cluster);
+
+                function esc(s) {
+                    return String(s).replace(/[&<>"']/g, function (c) {
+                        return {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;"}[c];
+                    });
+                }
+                function popupFor(p) {
+                    var names = [];
+                    for (var i = 0; i < data.types.length; i++) {
+                        if (p[3] & (1 << i)) { names.push(data.types[i]); }
+                    }
+                    return "<b>" + esc(p[2]) + "</b><br/>" + esc(names.join(", ")) +
+                        "<br/><a href='https://www.google.com/maps?q=" + p[0] + "," + p[1] + "' " +
+                        "style='color:#2D6A4F; text-decoration:none; font-weight:bold;'> Deschide în Google Maps</a>";
+                }
+
+                // markerele se creeaza o singura data; filtrul doar schimba ce e in cluster
+                var markers = data.points.map(function (p) {
+                    var m = L.marker([p[0], p[1]], {title: p[2]});
+                    m.bindTooltip(esc(p[2]));
+                    m.bindPopup(function () { return popupFor(p); }, {maxWidth: 280});
+                    return m;
+                });
+
+                var control = L.control({position: "topright"});
+                var boxes = {};
+                var empty;
+                control.onAdd = function () {
+                    var div = L.DomUtil.create("div", "gv-filter");
+                    L.DomEvent.disableClickPropagation(div);
+                    categories.forEach(function (t) {
+                        var label = L.DomUtil.create("label", "", div);
+                        var box = L.DomUtil.create("input", "", label);
+                        box.type = "checkbox";
+                        box.checked = true;
+                        box.onchange = function () { apply(); };
+                        label.appendChild(document.createTextNode(" " + t));
+                        boxes[t] = box;
+                    });
+                    var all = L.DomUtil.create("button", "", div);
+                    all.textContent = "Toate";
+                    all.onclick = function () { select(null); };
+                    empty = L.DomUtil.create("div", "gv-empty", div);
+                    empty.textContent = "Nu s-au găsit puncte pentru filtrul ales.";
+                    return div;
+                };
+                control.addTo(map);
+
+                function apply() {
+                    var mask = 0, checked = 0;
+                    categories.forEach(function (t) {
+                        if (boxes[t].checked) { mask |= 1 << data.types.indexOf(t); checked++; }
+                    });
+                    var showAll = checked === categories.length;
+                    var visible = [];
+                    for (var i = 0; i < markers.length; i++) {
+                        if (showAll || (data.points[i][3] & mask)) { visible.push(markers[i]); }
+                    }
+                    cluster.clearLayers();
+                    cluster.addLayers(visible);
+                    empty.style.display = visible.length ? "none" : "block";
+                    try { localStorage.setItem("gv-filtru", showAll ? "Toate" : JSON.stringify(
+                        categories.filter(function (t) { return boxes[t].checked; }))); } catch (e) {}
+                }
+                function select(category) {
+                    categories.forEach(function (t) { boxes[t].checked = !category || t === category; });
+                    apply();
+                }
+                function fromHash() {
+                    var m = /filtru=([^&]*)/.exec(window.location.hash);
+                    if (!m) { return false; }
+                    var category = decodeURIComponent(m[1]);
+                    select(categories.indexOf(category) >= 0 ? category : null);
+                    return true;
+                }
+
+                window.addEventListener("hashchange", fromHash);
+                if (!fromHash()) {
+                    var saved = null;
+                    try { saved = localStorage.getItem("gv-filtru"); } catch (e) {}
+                    if (saved && saved !== "Toate") {
+                        var chosen = JSON.parse(saved);
+                        categories.forEach(function (t) { boxes[t].checked = chosen.indexOf(t) >= 0; });
+                    }
+                    apply();
+                }
+            })();
+            {% endmacro %}
+        """)
+
+        default_js = MarkerCluster.default_js
+        default_css = MarkerCluster.default_css
+
+        def __init__(self, payload):
+            super().__init__()
+            self._name = "ClusteredPoints"
+            # "</" escapat ca un nume de punct sa nu poata inchide tag-ul <script>
+            self.payload_json = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+            self.categories_json = json.dumps(list(MAP_CATEGORIES), ensure_ascii=False)
+
+    return ClusteredPoints
+
+
+# params: store (PointStore), out_path (str)
+# ce face: o singura harta cu toate punctele (payload JSON + clustere + filtre in pagina) salvata in out_path
+@perf_trace.traced("map.generate_map")
+def generate_map(store, out_path):
+    import folium
+
+    m = folium.Map(location=list(MAP_CENTER), zoom_start=13, tiles="OpenStreetMap")
+    _clustered_points_class()(compact_payload(store)).add_to(m)
+    m.save(out_path)
+
+
+# params: map_path (str) -> html-ul din MapCache, category (str) -> ex "Plastic", "Toate"
+# ce face: scrie langa harta o pagina mica (open-map.html) care trimite browserul la map-<cheie>.html#filtru=<categorie>
+#          si intoarce calea ei. filtrul sta in pagina, nu in URL-ul deschis: pe Windows webbrowser.open foloseste
+#          os.startfile, care pierde #fragmentul unui fisier local
+def filter_page(map_path, category):
+    target = f"{quote(os.path.basename(map_path))}#filtru={quote(category)}"
+    page = os.path.join(os.path.dirname(map_path), "open-map.html")
+    with open(page, "w", encoding="utf-8") as f:
+        f.write(f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8">
+<meta http-equiv="refresh" content="0; url={html_lib.escape(target)}">
+<script>window.location.replace({json.dumps(target)});</script>
+</head><body><a href="{html_lib.escape(target)}">Deschide harta</a></body></html>
+""")
+    return page
+
+
+class MapCache:
+    # params: points_file (str), cache_dir (str)
+    # ce face: cache pe disc cu harta randata, cu cheie = hash-ul continutului collect_points.json;
+    #          hash-ul se recalculeaza doar cand se schimba mtime/marimea fisierului, deci un hit costa un stat().
+    #          filtrele se aplica in pagina, asa ca exista un singur html per versiune a sursei
+    def __init__(self, points_file=COLLECT_JSON, cache_dir=MAP_CACHE_DIR):
+        self.points_file = points_file
+        self.cache_dir = cache_dir
+        self._stat = None
+        self._key = None
+        self._lock = threading.Lock()
+
+    # params: none
+    # ce face: cheia curenta a sursei (primele 16 caractere din sha256), recalculata doar daca fisierul s-a schimbat
+    def source_key(self):
+        try:
+            st = os.stat(self.points_file)
+            stat = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stat = None
+        with self._lock:
+            if stat != self._stat or self._key is None:
+                if stat is None:
+                    self._key = "missing"
+                else:
+                    with open(self.points_file, "rb") as f:
+                        self._key = hashlib.sha256(f.read()).hexdigest()[:16]
+                self._stat = stat
+            return self._key
+
+    # params: key (str)
+    # ce face: calea html-ului pentru versiunea sursei (ex: .map_cache/map-1a2b3c4d5e6f7a8b.html)
+    def path_for(self, key):
+        return os.path.join(self.cache_dir, f"map-{key}.html")
+
+    # params: none
+    # ce face: calea hartii deja randate pt sursa curenta, sau None daca trebuie generata (cache miss)
+    def get(self):
+        path = self.path_for(self.source_key())
+        return path if os.path.exists(path) else None
+
+    # params: none
+    # ce face: randeaza harta (scriere atomica), sterge variantele pt surse vechi si intoarce calea
+    def render(self):
+        path = self.path_for(self.source_key())
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".tmp-", suffix=".html", dir=self.cache_dir)
+        os.close(fd)
+        try:
+            store = open_store(self.points_file, self.cache_dir)
+            try:
+                generate_map(store, tmp)
+            finally:
+                store.close()
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        for old in glob.glob(os.path.join(self.cache_dir, "map-*.html")):
+            if os.path.abspath(old) != os.path.abspath(path):
+                try:
+                    os.remove(old)
+                except OSError:
+                    pass
+        return path
@@ -0,0 +1,323 @@
+import os
+import re
+import json
+
+import numpy as np # type: ignore
+
+# modelul TF-IDF + NB (recycle_model.pkl) sau Hashing + NB (modelul online) compilat in array-uri NumPy
+# (.npz, fara pickle): la rulare nu mai e nevoie de scikit-learn/SciPy/joblib ca sa scorezi un text. Bundle-ul
+# (model, vectorizer) are aceeasi interfata ca tuplul sklearn, deci predict / predict_proba / predict_proba_batch /
+# PredictionCache merg neschimbate.
+FORMAT_VERSION = 1
+# doar configuratiile de TfidfVectorizer / HashingVectorizer pe care scorerul de aici le reproduce exact
+_SUPPORTED = {"analyzer": "word", "tokenizer": None, "preprocessor": None, "stop_words": None,
+              "strip_accents": None, "binary": False, "use_idf": True, "sublinear_tf": False}
+_SUPPORTED_HASHING = {"analyzer": "word", "tokenizer": None, "preprocessor": None, "stop_words": None,
+                      "strip_accents": None, "binary": False}
+
+_C1, _C2 = np.uint32(0xcc9e2d51), np.uint32(0x1b873593)
+
+
+# params: model_file (str)
+# ce face: artefactul compilat sta langa model: recycle_model.pkl -> recycle_model.npz
+def compiled_path(model_file):
+    return os.path.splitext(model_file)[0] + ".npz"
+
+
+def _rotl(x, r):
+    return (x << np.uint32(r)) | (x >> np.uint32(32 - r))
+
+
+# params: keys (list[bytes]), seed (int)
+# ce face: murmurhash3_32 (x86, cu semn) pe toate cheile deodata, identic cu sklearn.utils.murmurhash3_32;
+#          cheile se pun intr-o matrice de blocuri de 4 bytes (completata cu 0), iar bucla e doar pe coloane
+def murmurhash3_32(keys, seed=0):
+    n = len(keys)
+    lengths = np.fromiter((len(k) for k in keys), dtype=np.int64, count=n)
+    width = int(-(-lengths.max() // 4) * 4) if n else 0
+    buf = np.zeros((n, max(width, 4)), dtype=np.uint8)
+    flat = np.frombuffer(b"".join(keys), dtype=np.uint8)
+    starts = np.cumsum(lengths) - lengths
+    buf[np.repeat(np.arange(n), lengths), np.arange(len(flat)) - np.repeat(starts, lengths)] = flat
+    blocks = buf.view("<u4")
+    nblocks = lengths // 4
+    tail = (lengths % 4) > 0
+    h = np.full(n, seed, dtype=np.uint32)
+    with np.errstate(over="ignore"):
+        for b in range(blocks.shape[1]):
+            k = _rotl(blocks[:, b] * _C1, 15) * _C2
+            mixed = _rotl(h ^ k, 13) * np.uint32(5) + np.uint32(0xe6546b64)
+            # ultimul bloc incomplet (1-3 bytes, completat cu 0) se amesteca doar prin xor
+            h = np.where(nblocks > b, mixed, np.where(tail & (nblocks == b), h ^ k, h))
+        h ^= lengths.astype(np.uint32)
+        h ^= h >> np.uint32(16)
+        h *= np.uint32(0x85ebca6b)
+        h ^= h >> np.uint32(13)
+        h *= np.uint32(0xc2b2ae35)
+        h ^= h >> np.uint32(16)
+    return h.view(np.int32)
+
+
+# params: indptr (np.ndarray), data (np.ndarray, modificat pe loc), n_rows (int), norm ("l2", "l1" sau None)
+# ce face: normalizarea pe rand din sklearn (normalize); randurile goale raman goale
+def _normalize_rows(indptr, data, n_rows, norm):
+    if norm is None or not len(data):
+        return
+    rows = np.repeat(np.arange(n_rows), np.diff(indptr))
+    if norm == "l2":
+        norms = np.sqrt(np.bincount(rows, weights=data * data, minlength=n_rows))
+    else:
+        norms = np.bincount(rows, weights=np.abs(data), minlength=n_rows)
+    norms[norms == 0.0] = 1.0
+    data /= norms[rows]
+
+
+class SparseRows:
+    # params: indptr, indices, data (np.ndarray), shape (tuple)
+    # ce face: matricea TF-IDF a unui lot de texte in format CSR (ce intoarce CompiledVectorizer.transform)
+    __slots__ = ("indptr", "indices", "data", "shape")
+
+    def __init__(self, indptr, indices, data, shape):
+        self.indptr, self.indices, self.data, self.shape = indptr, indices, data, shape
+
+
+class CompiledVectorizer:
+    # params: vocabulary (dict token -> coloana), idf (np.ndarray), ngram_range (tuple), token_pattern (str),
+    #         lowercase (bool), norm ("l2", "l1" sau None)
+    # ce face: acelasi text -> aceleasi coloane si aceleasi valori ca TfidfVectorizer.transform
+    #          (tokenizare, n-grame de cuvinte, tf * idf, normalizare pe rand)
+    def __init__(self, vocabulary, idf, ngram_range, token_pattern, lowercase=True, norm="l2"):
+        self.vocabulary_ = vocabulary
+        self.idf_ = idf
+        self.ngram_range = tuple(ngram_range)
+        self.token_pattern = token_pattern
+        self.lowercase = lowercase
+        self.norm = norm
+        self._tokenize = re.compile(token_pattern).findall
+
+    # params: text (str)
+    # ce face: n-gramele textului, in aceeasi ordine ca sklearn (_word_ngrams)
+    def _ngrams(self, text):
+        tokens = self._tokenize(text.lower() if self.lowercase else text)
+        lo, hi = self.ngram_range
+        grams = list(tokens) if lo == 1 else []
+        for n in range(max(lo, 2), min(hi, len(tokens)) + 1):
+            grams += [" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1)]
+        return grams
+
+    # params: texts (list[str])
+    # ce face: matricea TF-IDF (SparseRows); cuvintele necunoscute se ignora, ca in sklearn
+    def transform(self, texts):
+        vocab = self.vocabulary_
+        indptr, indices, counts = [0], [], []
+        for text in texts:
+            row = {}
+            for g in self._ngrams(text):
+                j = vocab.get(g)
+                if j is not None:
+                    row[j] = row.get(j, 0) + 1
+            for j in sorted(row):
+                indices.append(j)
+                counts.append(row[j])
+            indptr.append(len(indices))
+        indptr = np.asarray(indptr, dtype=np.int64)
+        indices = np.asarray(indices, dtype=np.int64)
+        data = np.asarray(counts, dtype=np.float64) * self.idf_[indices]
+        _normalize_rows(indptr, data, len(texts), self.norm)
+        return SparseRows(indptr, indices, data, (len(texts), len(self.idf_)))
+
+
+class CompiledHashingVectorizer(CompiledVectorizer):
+    # params: columns (np.ndarray[int32], n_features) -> coloana compacta a fiecarui index hash-uit,
+    #         n_features (int), ngram_range (tuple), token_pattern (str), lowercase (bool), norm, alternate_sign (bool)
+    # ce face: aceleasi valori ca HashingVectorizer.transform (murmurhash3 pe n-grame, semn alternat optional,
+    #          normalizare pe rand), dar cu coloanele renumerotate: NB-ul compilat tine doar coloanele vazute la
+    #          antrenare + una comuna pt restul (au toate aceleasi log-probabilitati), deci nu 2^16 coloane
+    def __init__(self, columns, n_features, ngram_range, token_pattern, lowercase=True, norm="l2",
+                 alternate_sign=False):
+        super().__init__(None, None, ngram_range, token_pattern, lowercase, norm)
+        self.columns = columns
+        self.n_columns = int(columns.max(initial=0)) + 1
+        self.n_features = n_features
+        self.alternate_sign = alternate_sign
+
+    # params: texts (list[str])
+    # ce face: matricea (SparseRows) cu coloanele compacte
+    def transform(self, texts):
+        n = len(texts)
+        grams = [self._ngrams(text) for text in texts]
+        rows = np.repeat(np.arange(n), [len(g) for g in grams])
+        h = murmurhash3_32([g.encode("utf-8") for gs in grams for g in gs]).astype(np.int64)
+        values = np.where(h < 0, -1.0, 1.0) if self.alternate_sign else np.ones(len(h))
+        # aparitiile aceluiasi index pe acelasi rand se aduna (ca sum_duplicates din sklearn)
+        keys, inverse = np.unique(rows * self.n_features + np.abs(h) % self.n_features, return_inverse=True)
+        data = np.bincount(inverse.ravel(), weights=values, minlength=len(keys)).astype(np.float64)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(keys // self.n_features, minlength=n), out=indptr[1:])
+        _normalize_rows(indptr, data, n, self.norm)
+        indices = self.columns[keys % self.n_features].astype(np.int64)
+        return SparseRows(indptr, indices, data, (n, self.n_columns))
+
+
+class CompiledNB:
+    # params: classes (np.ndarray[str]), feature_log_prob (np.ndarray [clase x features]),
+    #         class_log_prior (np.ndarray [clase])
+    # ce face: MultinomialNB doar pt predictie: jll = X @ feature_log_prob.T + class_log_prior, apoi softmax
+    def __init__(self, classes, feature_log_prob, class_log_prior):
+        self.classes_ = classes
+        # transpus si contiguu: pt fiecare coloana din X luam direct randul ei de log-probabilitati
+        self._flp_t = np.ascontiguousarray(feature_log_prob.T)
+        self.class_log_prior_ = class_log_prior
+
+    # params: X (SparseRows)
+    # ce face: log-verosimilitatea comuna pe clase (joint log likelihood), ca _joint_log_likelihood din sklearn
+    def _jll(self, X):
+        n = X.shape[0]
+        jll = np.tile(self.class_log_prior_, (n, 1))
+        if len(X.data):
+            rows = np.repeat(np.arange(n), np.diff(X.indptr))
+            weighted = self._flp_t[X.indices] * X.data[:, None]
+            for c in range(jll.shape[1]):
+                jll[:, c] += np.bincount(rows, weights=weighted[:, c], minlength=n)
+        return jll
+
+    def predict_proba(self, X):
+        jll = self._jll(X)
+        top = jll.max(axis=1, keepdims=True)
+        log_norm = top + np.log(np.exp(jll - top).sum(axis=1, keepdims=True))
+        return np.exp(jll - log_norm)
+
+    def predict(self, X):
+        return self.classes_[self._jll(X).argmax(axis=1)]
+
+
+# params: vectorizer (TfidfVectorizer sau HashingVectorizer antrenat)
+# ce face: ValueError daca vectorizer-ul foloseste optiuni pe care scorerul NumPy nu le reproduce
+def _check_supported(vectorizer):
+    params = vectorizer.get_params()
+    kind = type(vectorizer).__name__
+    for key, expected in (_SUPPORTED_HASHING if kind == "HashingVectorizer" else _SUPPORTED).items():
+        if params.get(key) != expected:
+            raise ValueError(f"{kind} cu {key}={params.get(key)!r} nu poate fi compilat (suportat: {expected!r})")
+    if params.get("norm") not in ("l2", "l1", None):
+        raise ValueError(f"norm={params.get('norm')!r} nu e suportat")
+
+
+# params: model_bundle (tuple(clasificator, vectorizer))
+# ce face: true daca bundle-ul e TF-IDF sau Hashing pe cuvinte + MultinomialNB, cu optiuni pe care scorerul de aici
+#          le reproduce (se uita doar la numele claselor, deci nu importa sklearn)
+def can_compile(model_bundle):
+    model, vectorizer = model_bundle
+    if type(model).__name__ != "MultinomialNB" or type(vectorizer).__name__ not in ("TfidfVectorizer",
+                                                                                  "HashingVectorizer"):
+        return False
+    try:
+        _check_supported(vectorizer)
+    except ValueError:
+        return False
+    return True
+
+
+# params: model_bundle (tuple(MultinomialNB, TfidfVectorizer/HashingVectorizer)), fingerprint (str), extra (dict)
+# ce face: (meta, array-uri) ale artefactului. TF-IDF: tokenii vocabularului sortati (blob utf-8), idf-ul si
+#          log-probabilitatile claselor cu coloanele in ordinea tokenilor. Hashing: indecsii vazuti la antrenare (seen)
+#          si log-probabilitatile doar pt ei + o coloana comuna pt restul
+def _to_arrays(model_bundle, fingerprint=None, extra=None):
+    model, vectorizer = model_bundle
+    _check_supported(vectorizer)
+    meta = {**(extra or {}), "format": FORMAT_VERSION, "fingerprint": fingerprint,
+            "ngram_range": list(vectorizer.ngram_range), "token_pattern": vectorizer.token_pattern,
+            "lowercase": bool(vectorizer.lowercase), "norm": vectorizer.norm,
+            "classes": [str(c) for c in model.classes_]}
+    flp = np.asarray(model.feature_log_prob_, dtype=np.float64)
+    arrays = {"class_log_prior": np.asarray(model.class_log_prior_, dtype=np.float64)}
+    if type(vectorizer).__name__ == "HashingVectorizer":
+        # o coloana fara nicio aparitie la antrenare are in NB log(alpha) - log(total clasa), aceeasi pt toate;
+        # toate astfel de coloane trimit la ultima coloana compacta
+        used = np.asarray(model.feature_count_).any(axis=0)
+        seen, unseen = np.flatnonzero(used), np.flatnonzero(~used)
+        default = flp[:, unseen[:1]] if len(unseen) else np.zeros((flp.shape[0], 1))
+        meta.update(kind="hashing", n_features=int(vectorizer.n_features),
+                    alternate_sign=bool(vectorizer.alternate_sign))
+        arrays.update(seen=seen.astype(np.int32), feature_log_prob=np.hstack([flp[:, seen], default]))
+    else:
+        tokens = sorted(vectorizer.vocabulary_)
+        columns = np.fromiter((vectorizer.vocabulary_[t] for t in tokens), dtype=np.int64, count=len(tokens))
+        meta["kind"] = "tfidf"
+        arrays.update(tokens=np.frombuffer("\n".join(tokens).encode("utf-8"), dtype=np.uint8),
+                      idf=np.asarray(vectorizer.idf_, dtype=np.float64)[columns],
+                      feature_log_prob=flp[:, columns])
+    return meta, arrays
+
+
+# params: meta (dict), arrays (dict sau NpzFile)
+# ce face: bundle-ul compilat (CompiledNB, CompiledVectorizer / CompiledHashingVectorizer)
+def _from_arrays(meta, arrays):
+    if meta.get("kind", "tfidf") == "hashing":
+        seen = arrays["seen"]
+        columns = np.full(meta["n_features"], len(seen), dtype=np.int32)
+        columns[seen] = np.arange(len(seen), dtype=np.int32)
+        vectorizer = CompiledHashingVectorizer(columns, meta["n_features"], meta["ngram_range"],
+                                               meta["token_pattern"], meta["lowercase"], meta["norm"],
+                                               meta["alternate_sign"])
+    else:
+        blob = arrays["tokens"].tobytes().decode("utf-8")
+        tokens = blob.split("\n") if blob else []
+        vectorizer = CompiledVectorizer(dict(zip(tokens, range(len(tokens)))), arrays["idf"], meta["ngram_range"],
+                                        meta["token_pattern"], meta["lowercase"], meta["norm"])
+    model = CompiledNB(np.array(meta["classes"]), arrays["feature_log_prob"], arrays["class_log_prior"])
+    model.fingerprint = meta.get("fingerprint")
+    return model, vectorizer
+
+
+# params: model_bundle (tuple sklearn compilabil, vezi can_compile)
+# ce face: bundle-ul compilat direct in memorie, fara fisier (ex: modelul online dupa fiecare invatare)
+def compile_bundle(model_bundle):
+    return _from_arrays(*_to_arrays(model_bundle))
+
+
+# params: model_bundle (tuple sklearn compilabil), out_path (str), fingerprint (str), extra (dict) -> chei in plus
+#         in meta (ex: starea modelului online)
+# ce face: scrie artefactul .npz (meta JSON + array-urile din _to_arrays)
+def compile_model(model_bundle, out_path, fingerprint=None, extra=None):
+    meta, arrays = _to_arrays(model_bundle, fingerprint, extra)
+    with open(out_path, "wb") as f:
+        np.savez(f, meta=np.frombuffer(json.dumps(meta, ensure_ascii=False).encode("utf-8"), dtype=np.uint8),
+                 **arrays)
+
+
+# params: path (str)
+# ce face: meta-datele artefactului (dict) fara sa incarce matricele; None daca lipseste/e stricat
+def read_meta(path):
+    try:
+        with np.load(path, allow_pickle=False) as z:
+            return json.loads(z["meta"].tobytes().decode("utf-8"))
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+# params: path (str)
+# ce face: bundle-ul compilat (CompiledNB, vectorizer compilat), folosibil oriunde se folosea tuplul sklearn
+def load_compiled(path):
+    with np.load(path, allow_pickle=False) as z:
+        meta = json.loads(z["meta"].tobytes().decode("utf-8"))
+        if meta.get("format") != FORMAT_VERSION:
+            raise ValueError(f"{path}: format compilat necunoscut ({meta.get('format')})")
+        return _from_arrays(meta, {name: z[name] for name in z.files if name != "meta"})
+
+
+# params: reference (tuple sklearn), compiled (tuple compilat), texts (list[str]), atol=1e-9 (float)
+# ce face: compara probabilitatile si clasa castigatoare pe texte; intoarce lista de diferente (goala = identic)
+def parity_check(reference, compiled, texts, atol=1e-9):
+    ref_model, ref_vec = reference
+    cmp_model, cmp_vec = compiled
+    clean = [(t or "").strip().lower() for t in texts]
+    problems = []
+    if [str(c) for c in ref_model.classes_] != [str(c) for c in cmp_model.classes_]:
+        return [f"clase diferite: {list(ref_model.classes_)} vs {list(cmp_model.classes_)}"]
+    expected = ref_model.predict_proba(ref_vec.transform(clean))
+    actual = cmp_model.predict_proba(cmp_vec.transform(clean))
+    diff = np.abs(expected - actual).max(axis=1) if len(clean) else np.zeros(0)
+    for i in np.flatnonzero((diff > atol) | (expected.argmax(axis=1) != actual.argmax(axis=1))):
+        problems.append(f"{texts[i]!r}: diferenta maxima {diff[i]:.3g}")
+    return problems
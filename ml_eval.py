@@ -0,0 +1,266 @@
+import os
+import sys
+import json
+import time
+import pickle
+import random
+import argparse
+import statistics
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from ml_model import (DATA_FILE, MODEL_FILE, build_pipeline, normalize_text, predict_proba, predict_proba_batch,
+                      read_manifest, train_model)
+from ml_online import HASHING_PARAMS, ONLINE_MODEL_FILE, OnlineModel
+
+# featurizer-ele si clasificatorii comparati; fiecare combinatie e un candidat (ex: "char_wb25+logreg").
+# pipeline-urile sunt dict-uri simple (JSON), deci ajung in procesele din pool si in manifestul modelului salvat
+FEATURIZERS = {
+    "word1": {"ngram_range": (1, 1)},
+    "word12": {"ngram_range": (1, 2)},
+    "char_wb25": {"analyzer": "char_wb", "ngram_range": (2, 5)},
+    "char_wb35": {"analyzer": "char_wb", "ngram_range": (3, 5), "sublinear_tf": True},
+}
+CLASSIFIER_PARAMS = {
+    "nb": {},
+    "svm": {"C": 1.0},
+    "logreg": {"C": 10.0, "max_iter": 2000},
+}
+# tinta "online" = modelul pe care il incarca tab-ul AI si server.py (ml_online): aceleasi n-grame, dar prin
+# HashingVectorizer (fara vocabular/idf, ca sa poata invata cuvinte noi din feedback) si clasificatori cu partial_fit
+ONLINE_CLASSIFIERS = {
+    "nb": ("nb", {}),
+    "svm": ("sgd", {"loss": "hinge", "alpha": 1e-5, "random_state": 0}),
+    "logreg": ("sgd", {"loss": "log_loss", "alpha": 1e-5, "random_state": 0}),
+}
+HASHING_KEYS = ("analyzer", "ngram_range")
+TARGETS = ("online", "batch")
+LATENCY_RUNS = 300
+BATCH_SIZE = 1000
+
+_DATA = None
+
+
+# params: featurizers (iterable[str] sau None), classifiers (iterable[str] sau None), target ("online" sau "batch")
+# ce face: {nume: pipeline} pt toate combinatiile cerute, in forma modelului tinta
+def candidates(featurizers=None, classifiers=None, target="online"):
+    pipelines = {}
+    for f in featurizers or FEATURIZERS:
+        for c in classifiers or CLASSIFIER_PARAMS:
+            if target == "online":
+                vectorizer = {**HASHING_PARAMS, **{k: v for k, v in FEATURIZERS[f].items() if k in HASHING_KEYS}}
+                classifier, params = ONLINE_CLASSIFIERS[c]
+                pipelines[f"{f}+{c}"] = {"vectorizer": vectorizer, "hashing": True, "classifier": classifier,
+                                         "classifier_params": params}
+            else:
+                pipelines[f"{f}+{c}"] = {"vectorizer": FEATURIZERS[f], "classifier": c,
+                                         "classifier_params": CLASSIFIER_PARAMS[c]}
+    return pipelines
+
+
+# params: data_file (str), target ("online" sau "batch")
+# ce face: (texte, label-uri) preprocesate la fel ca modelul tinta (ml_online: normalize_text, train_model: lower)
+def load_data(data_file=DATA_FILE, target="online"):
+    with open(data_file, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    clean = normalize_text if target == "online" else (lambda t: t.strip().lower())
+    return [clean(d["text"]) for d in data], [d["label"].strip() for d in data]
+
+
+def _init_worker(texts, labels):
+    # params: texts, labels (list[str])
+    # ce face: datele ajung o singura data in fiecare proces din pool, nu la fiecare fold
+    global _DATA
+    _DATA = (texts, labels)
+
+
+def _run_fold(name, pipeline, train_idx, test_idx):
+    # params: name (str), pipeline (dict), train_idx / test_idx (list[int])
+    # ce face: (proces din pool) antreneaza pe fold si intoarce (nume, acuratete, F1 macro)
+    from sklearn.metrics import accuracy_score, f1_score # type: ignore
+
+    texts, labels = _DATA
+    model, vectorizer = build_pipeline(pipeline)
+    model.fit(vectorizer.fit_transform([texts[i] for i in train_idx]), [labels[i] for i in train_idx])
+    truth = [labels[i] for i in test_idx]
+    pred = model.predict(vectorizer.transform([texts[i] for i in test_idx]))
+    return name, accuracy_score(truth, pred), f1_score(truth, pred, average="macro", zero_division=0)
+
+
+# params: texts, labels (list[str]), pipelines (dict nume -> pipeline), folds (int), repeats (int),
+#         workers (int), seed (int)
+# ce face: cross-validare stratificata (repetata) pe toti candidatii; perechile (candidat, fold) ruleaza in paralel
+#          pe procese. intoarce {nume: {"accuracy", "accuracy_std", "f1_macro", "folds"}}
+def cross_validate(texts, labels, pipelines, folds=5, repeats=3, workers=None, seed=0):
+    from sklearn.model_selection import RepeatedStratifiedKFold # type: ignore
+
+    smallest = min(Counter(labels).values())
+    if smallest < 2:
+        raise ValueError("fiecare categorie are nevoie de cel putin 2 exemple pt cross-validare stratificata")
+    splitter = RepeatedStratifiedKFold(n_splits=min(folds, smallest), n_repeats=repeats, random_state=seed)
+    splits = [(list(tr), list(te)) for tr, te in splitter.split(texts, labels)]
+
+    scores = {name: [] for name in pipelines}
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(texts, labels)) as pool:
+        futures = [pool.submit(_run_fold, name, pipeline, tr, te)
+                   for name, pipeline in pipelines.items() for tr, te in splits]
+        for fut in futures:
+            name, acc, f1 = fut.result()
+            scores[name].append((acc, f1))
+    return {name: {"accuracy": round(statistics.fmean(a for a, _ in s), 4),
+                   "accuracy_std": round(statistics.pstdev(a for a, _ in s), 4),
+                   "f1_macro": round(statistics.fmean(f for _, f in s), 4),
+                   "folds": len(s)}
+            for name, s in scores.items()}
+
+
+# params: texts, labels (list[str]), pipeline (dict), seed (int)
+# ce face: antreneaza pe tot setul si masoara (secvential, ca procesele sa nu se incurce) latenta pe un text
+#          prin predict_proba (ca in tab-ul AI), latenta pe text intr-un batch de BATCH_SIZE si marimea modelului;
+#          pipeline-urile compilabile (NB) se masoara pe varianta compilata, pe care o incarca aplicatia
+def measure_latency(texts, labels, pipeline, seed=0):
+    from ml_compiled import can_compile, compile_bundle
+
+    rng = random.Random(seed)
+    model, vectorizer = build_pipeline(pipeline)
+    model.fit(vectorizer.fit_transform(texts), labels)
+    bundle = (model, vectorizer)
+    compiled = can_compile(bundle)
+    if compiled:
+        bundle = compile_bundle(bundle)
+    queries = [rng.choice(texts) for _ in range(LATENCY_RUNS)]
+    predict_proba(queries[0], bundle)
+
+    single = []
+    for q in queries:
+        t0 = time.perf_counter()
+        predict_proba(q, bundle)
+        single.append(time.perf_counter() - t0)
+    batch = [rng.choice(texts) for _ in range(BATCH_SIZE)]
+    t0 = time.perf_counter()
+    list(predict_proba_batch(batch, bundle, top_k=1))
+    batch_s = time.perf_counter() - t0
+    single.sort()
+    return {"single_ms": round(statistics.median(single) * 1000, 4),
+            "single_p95_ms": round(single[int(0.95 * (len(single) - 1))] * 1000, 4),
+            "batch_us_per_item": round(batch_s / BATCH_SIZE * 1e6, 2),
+            "size_kb": round(len(pickle.dumps(bundle)) / 1024, 1),
+            "proba": hasattr(model, "predict_proba"), "compiled": compiled}
+
+
+# params: results (dict nume -> metrici), max_single_ms, max_batch_us, max_size_kb (float sau None),
+#         require_proba (bool) -> doar modele cu probabilitati (tab-ul AI afiseaza increderea)
+# ce face: cel mai precis candidat care incape in buget (la egalitate: cel mai rapid); None daca niciunul nu incape
+def select(results, max_single_ms=None, max_batch_us=None, max_size_kb=None, require_proba=False):
+    def fits(r):
+        return ((max_single_ms is None or r["single_ms"] <= max_single_ms)
+                and (max_batch_us is None or r["batch_us_per_item"] <= max_batch_us)
+                and (max_size_kb is None or r["size_kb"] <= max_size_kb)
+                and (r["proba"] or not require_proba))
+
+    eligible = [(name, r) for name, r in results.items() if fits(r)]
+    if not eligible:
+        return None
+    return max(eligible, key=lambda item: (item[1]["accuracy"], item[1]["f1_macro"], -item[1]["single_ms"]))[0]
+
+
+# params: data_file (str), pipelines (dict), folds, repeats, workers, seed, target ("online" sau "batch")
+# ce face: cross-validare + latenta pt fiecare candidat -> {nume: metrici + pipeline}
+def evaluate(data_file=DATA_FILE, pipelines=None, folds=5, repeats=3, workers=None, seed=0, target="online"):
+    texts, labels = load_data(data_file, target)
+    pipelines = pipelines or candidates(target=target)
+    results = cross_validate(texts, labels, pipelines, folds, repeats, workers, seed)
+    for name, pipeline in pipelines.items():
+        results[name].update(measure_latency(texts, labels, pipeline, seed))
+        results[name]["pipeline"] = pipeline
+    return results
+
+
+def _print_table(results, best=None):
+    print(f" {'candidat':<20} {'acuratete':>10} {'±':>6} {'F1':>6} {'1 text ms':>10} {'batch µs':>9} "
+          f"{'KB':>8} proba")
+    for name, r in sorted(results.items(), key=lambda item: -item[1]["accuracy"]):
+        mark = "  <- ales" if name == best else ""
+        print(f" {name:<20} {r['accuracy']:>10.3f} {r['accuracy_std']:>6.3f} {r['f1_macro']:>6.3f} "
+              f"{r['single_ms']:>10.3f} {r['batch_us_per_item']:>9.1f} {r['size_kb']:>8.1f} "
+              f"{'da' if r['proba'] else 'nu':>5}{mark}")
+
+
+def main(argv=None):
+    # params: argv (list[str] sau None)
+    # ce face: python ml_eval.py [--target online|batch] [--featurizers word12,char_wb25] [--classifiers nb,logreg]
+    #          [--folds 5] [--repeats 3] [--workers N] [--max-single-ms 2] [--max-batch-us 50] [--max-size-kb 500]
+    #          [--require-proba | --no-require-proba] [--out eval.json] [--save] -> antreneaza candidatul ales pe tot
+    #          setul si il salveaza ca model: tinta "online" (implicit) = modelul din tab-ul AI si server.py,
+    #          "batch" = recycle_model.pkl (python ml_model.py classify)
+    parser = argparse.ArgumentParser(description="GreenVision - evaluare si selectie model ML (cross-validare + latenta)")
+    parser.add_argument("--data", default=DATA_FILE)
+    parser.add_argument("--target", choices=TARGETS, default="online",
+                        help="online: modelul din tab-ul AI / server.py (implicit); batch: recycle_model.pkl")
+    parser.add_argument("--model", help=f"implicit {os.path.basename(ONLINE_MODEL_FILE)} (online) sau "
+                                        f"{os.path.basename(MODEL_FILE)} (batch)")
+    parser.add_argument("--featurizers", help=f"din: {', '.join(FEATURIZERS)} (implicit toate)")
+    parser.add_argument("--classifiers", help=f"din: {', '.join(CLASSIFIER_PARAMS)} (implicit toate)")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=None, help="procese paralele (implicit: toate nucleele)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-single-ms", type=float, help="buget: latenta mediana pe un text (ms)")
+    parser.add_argument("--max-batch-us", type=float, help="buget: latenta pe text in batch (µs)")
+    parser.add_argument("--max-size-kb", type=float, help="buget: marimea modelului (KB)")
+    parser.add_argument("--require-proba", action=argparse.BooleanOptionalAction, default=None,
+                        help="doar modele cu probabilitati (tab-ul AI afiseaza increderea); implicit da cu --save")
+    parser.add_argument("--out", help="rezultatele ca JSON")
+    parser.add_argument("--save", action="store_true", help="salveaza candidatul ales ca model (--model)")
+    args = parser.parse_args(argv)
+    model_file = args.model or (ONLINE_MODEL_FILE if args.target == "online" else MODEL_FILE)
+    # un model fara predict_proba ar aparea in tab-ul AI mereu cu incredere 1.0, deci la salvare se cere implicit
+    require_proba = args.save if args.require_proba is None else args.require_proba
+
+    def names(value, allowed):
+        chosen = [v.strip() for v in value.split(",") if v.strip()] if value else list(allowed)
+        unknown = [v for v in chosen if v not in allowed]
+        if unknown:
+            parser.error(f"necunoscut: {', '.join(unknown)} (disponibile: {', '.join(allowed)})")
+        return chosen
+
+    pipelines = candidates(names(args.featurizers, FEATURIZERS), names(args.classifiers, CLASSIFIER_PARAMS), args.target)
+    start = time.perf_counter()
+    try:
+        results = evaluate(args.data, pipelines, args.folds, args.repeats, args.workers, args.seed, args.target)
+    except ValueError as e:
+        print(f" {e}", file=sys.stderr)
+        return 1
+    budget = {"max_single_ms": args.max_single_ms, "max_batch_us": args.max_batch_us,
+              "max_size_kb": args.max_size_kb, "require_proba": require_proba}
+    best = select(results, **budget)
+    _print_table(results, best)
+    print(f" {len(pipelines)} candidati evaluati in {time.perf_counter() - start:.1f}s")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"target": args.target, "budget": budget, "best": best, "results": results}, f, ensure_ascii=False, indent=2)
+    if best is None:
+        print(" Niciun candidat nu incape in bugetul de latenta/marime.", file=sys.stderr)
+        return 1
+    print(f" Ales: {best}")
+    if args.save:
+        metrics = {k: v for k, v in results[best].items() if k != "pipeline"}
+        selection = {"candidate": best, "target": args.target, "budget": budget, "metrics": metrics}
+        if args.target == "online":
+            # feedback-ul din ai_feedback se reinvata peste modelul nou la urmatoarea pornire (applied_id = 0)
+            online = OnlineModel.bootstrap(data_file=args.data, model_file=model_file,
+                                           pipeline=results[best]["pipeline"], selection=selection)
+            online.save()
+            compiled = online.bundle[0] is not online.model
+        else:
+            train_model(data_file=args.data, model_file=model_file, pipeline=results[best]["pipeline"],
+                        selection=selection)
+            compiled = bool((read_manifest(model_file) or {}).get("compiled"))
+        print(f" Salvat in {model_file}" + (" (+ varianta compilata)" if compiled else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
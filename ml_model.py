@@ -1,39 +1,302 @@
 import os
+import sys
+import csv
 import json
-import joblib # type: ignore
+import time
+import hashlib
+import argparse
+import datetime
+import tempfile
+import threading
+import unicodedata
+from collections import OrderedDict
+from itertools import islice, tee
 
-from sklearn.feature_extraction.text import TfidfVectorizer # type: ignore
-from sklearn.naive_bayes import MultinomialNB # type: ignore
+import perf_trace
+
+# sklearn/joblib se importa doar in functiile care au nevoie de ele (antrenare/incarcare),
+# ca "import ml_model" sa fie ieftin si sa poata rula pe thread-ul UI
 
 BASE_DIR = os.path.dirname(__file__)
 DATA_FILE = os.path.join(BASE_DIR, "ml_recycle_data.json")
 MODEL_FILE = os.path.join(BASE_DIR, "recycle_model.pkl")
 
+# parametrii vectorizer-ului fac parte din amprenta modelului: daca se schimba, se reantreneaza
+VECTORIZER_PARAMS = {"ngram_range": (1, 2)}
+# pipeline-ul antrenat de train_model: vectorizer TF-IDF (parametri TfidfVectorizer) + clasificator din CLASSIFIERS.
+# ml_eval.py poate alege si salva altul (ramane in manifest, "selection") pana la urmatoarea selectie
+DEFAULT_PIPELINE = {"vectorizer": VECTORIZER_PARAMS, "classifier": "nb", "classifier_params": {}}
+CLASSIFIERS = {
+    "nb": ("sklearn.naive_bayes", "MultinomialNB"),
+    "svm": ("sklearn.svm", "LinearSVC"),
+    "logreg": ("sklearn.linear_model", "LogisticRegression"),
+    # are partial_fit (ca MultinomialNB), deci poate fi si modelul online; loss="log_loss" -> regresie logistica
+    "sgd": ("sklearn.linear_model", "SGDClassifier"),
+}
+# cate texte de antrenare (maxim) verifica testul de paritate sklearn <-> model compilat la fiecare antrenare
+PARITY_SAMPLE = 20000
+
+# ML labels (fara diacritice) -> categories din UI (cu diacritice unde ai in GUIDE) si tipurile punctelor de pe harta;
+# folosit si de app.py si de server.py
+ML_TO_UI_CAT = {
+    "Plastic": "Plastic",
+    "Hartie": "Hârtie",
+    "Sticla": "Sticlă",
+    "Metal": "Metal",
+    "Electronice": "Electronice",   # atentie: GUIDE nu are Electronice (doar harta are)
+    "Ulei uzat": "Ulei uzat",       # GUIDE nu are Ulei uzat
+    "Baterii": "Baterii",
+    "Nereciclabil": "Nereciclabil"  # nu exista in GUIDE
+}
+
+
+def manifest_path(model_file=MODEL_FILE):
+    # params: model_file (str)
+    # ce face: manifestul sta langa model: recycle_model.pkl -> recycle_model.manifest.json
+    return os.path.splitext(model_file)[0] + ".manifest.json"
+
+
+def sklearn_version():
+    # params: none
+    # ce face: versiunea scikit-learn din metadata pachetului (fara "import sklearn")
+    from importlib import metadata
+    try:
+        return metadata.version("scikit-learn")
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def sha256_file(path):
+    # params: path (str)
+    # ce face: sha256 (hex) al continutului fisierului, citit pe blocuri de 1 MB
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _fingerprint(data_sha256, params):
+    # params: data_sha256 (str), params (dict)
+    # ce face: amprenta modelului = hash(date + parametri vectorizer + versiune sklearn)
+    payload = json.dumps({"data": data_sha256, "params": params, "sklearn": sklearn_version()},
+                         sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def atomic_write(path, write):
+    # params: path (str), write (functie(fisier_temporar))
+    # ce face: scrie intr-un fisier temporar din acelasi folder si il redenumeste peste path (os.replace e atomic),
+    #          deci cine citeste vede ori fisierul vechi complet, ori pe cel nou complet
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix=".tmp-", suffix=os.path.basename(path), dir=folder)
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def read_manifest(model_file=MODEL_FILE):
+    # params: model_file (str)
+    # ce face: manifestul modelului (dict) sau None daca lipseste/e stricat
+    try:
+        with open(manifest_path(model_file), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_manifest(model_file, manifest):
+    # params: model_file (str), manifest (dict)
+    # ce face: scrie manifestul atomic langa model
+    def write(tmp):
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    atomic_write(manifest_path(model_file), write)
+
+
+def model_is_stale(model_file=MODEL_FILE, data_file=DATA_FILE):
+    # params: model_file (str), data_file (str)
+    # ce face: true daca modelul trebuie reantrenat (lipseste, nu are manifest, datele/parametrii s-au schimbat);
+    #          citeste doar manifestul (fara unpickle); datele se re-hash-uiesc doar daca le-au schimbat marimea/mtime
+    manifest = read_manifest(model_file)
+    if manifest is None or not os.path.exists(model_file):
+        return True
+    if manifest.get("kind") == "stream":
+        # antrenat din alt corpus cu ml_stream.py: nu se reface din ml_recycle_data.json, doar la cerere
+        return os.path.getsize(model_file) != manifest.get("model_size")
+    if os.path.getsize(model_file) != manifest.get("model_size"):
+        return True
+    try:
+        st = os.stat(data_file)
+    except OSError:
+        # fara setul de date nu avem din ce reantrena: modelul existent ramane cel bun
+        return False
+    data = manifest.get("data", {})
+    if data.get("size") == st.st_size and data.get("mtime_ns") == st.st_mtime_ns:
+        data_sha256 = data.get("sha256")
+    else:
+        data_sha256 = sha256_file(data_file)
+    return _fingerprint(data_sha256, _current_pipeline(manifest)[0]) != manifest.get("fingerprint")
+
 
-def train_model(data_file=DATA_FILE, model_file=MODEL_FILE):
-    # params: data_file (str), model_file (str)
-    # ce face: antreneaza modelul (TF-IDF + Naive Bayes) si il salveaza ca .pkl
+def build_pipeline(pipeline=DEFAULT_PIPELINE):
+    # params: pipeline (dict ca DEFAULT_PIPELINE; ngram_range poate veni ca lista din JSON;
+    #         "hashing": True -> HashingVectorizer, ca modelul online)
+    # ce face: (clasificator, vectorizer) neantrenate
+    import importlib
+    from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer # type: ignore
+
+    vec_params = dict(pipeline["vectorizer"])
+    if "ngram_range" in vec_params:
+        vec_params["ngram_range"] = tuple(vec_params["ngram_range"])
+    module, name = CLASSIFIERS[pipeline["classifier"]]
+    model = getattr(importlib.import_module(module), name)(**pipeline.get("classifier_params", {}))
+    return model, (HashingVectorizer if pipeline.get("hashing") else TfidfVectorizer)(**vec_params)
+
+
+def _current_pipeline(manifest, default=DEFAULT_PIPELINE):
+    # params: manifest (dict sau None) -> sau starea salvata a modelului online, default (dict)
+    # ce face: (pipeline, selection): cel ales cu ml_eval.py daca exista, altfel default
+    if manifest and manifest.get("selection") and manifest.get("pipeline"):
+        return manifest["pipeline"], manifest["selection"]
+    return default, None
+
+
+def train_model(data_file=DATA_FILE, model_file=MODEL_FILE, pipeline=None, selection=None):
+    # params: data_file (str), model_file (str), pipeline (dict sau None -> cel din manifest/implicit),
+    #         selection (dict sau None) -> de ce a fost ales pipeline-ul (scris de ml_eval.py)
+    # ce face: antreneaza modelul (implicit TF-IDF + Naive Bayes), il salveaza atomic ca .pkl si scrie manifestul
+    import joblib # type: ignore
+
+    if pipeline is None:
+        pipeline, selection = _current_pipeline(read_manifest(model_file))
+    st = os.stat(data_file)
+    data_sha256 = sha256_file(data_file)
     with open(data_file, "r", encoding="utf-8") as f:
         data = json.load(f)
 
     texts = [d["text"].strip().lower() for d in data]
     labels = [d["label"].strip() for d in data]
 
-    vectorizer = TfidfVectorizer(ngram_range=(1, 2))
-    X = vectorizer.fit_transform(texts)
+    model, vectorizer = build_pipeline(pipeline)
+    model.fit(vectorizer.fit_transform(texts), labels)
 
-    model = MultinomialNB()
-    model.fit(X, labels)
+    atomic_write(model_file, lambda tmp: joblib.dump((model, vectorizer), tmp))
+    fingerprint = _fingerprint(data_sha256, pipeline)
+    compiled = _export_compiled((model, vectorizer), model_file, fingerprint, texts)
+    manifest = {
+        "fingerprint": fingerprint,
+        "data": {"path": os.path.basename(data_file), "sha256": data_sha256,
+                 "size": st.st_size, "mtime_ns": st.st_mtime_ns},
+        "params": pipeline["vectorizer"],
+        "pipeline": pipeline,
+        "selection": selection,
+        "sklearn": sklearn_version(),
+        "model_size": os.path.getsize(model_file),
+        "n_samples": len(texts),
+        "classes": [str(c) for c in model.classes_],
+        "compiled": compiled,
+        "trained_at": datetime.datetime.now().isoformat(timespec="seconds"),
+    }
+    write_manifest(model_file, manifest)
 
-    joblib.dump((model, vectorizer), model_file)
+
+def _export_compiled(model_bundle, model_file, fingerprint, texts):
+    # params: model_bundle (tuple sklearn), model_file (str), fingerprint (str), texts (list[str]) -> textele de antrenare
+    # ce face: scrie recycle_model.npz (scorer doar NumPy, vezi ml_compiled.py) numai daca da exact aceleasi
+    #          probabilitati ca sklearn pe textele de antrenare; intoarce numele fisierului sau None
+    from ml_compiled import can_compile, compile_model, compiled_path, load_compiled, parity_check
+
+    out = compiled_path(model_file)
+    if not can_compile(model_bundle):
+        # alt pipeline decat TF-IDF pe cuvinte + NB (ales cu ml_eval.py): ramane doar varianta sklearn
+        if os.path.exists(out):
+            os.remove(out)
+        return None
+    try:
+        atomic_write(out, lambda tmp: compile_model(model_bundle, tmp, fingerprint))
+        # la seturi mari verificam un esantion uniform (max ~20k texte), nu tot corpusul
+        problems = parity_check(model_bundle, load_compiled(out), texts[::max(1, len(texts) // PARITY_SAMPLE)])
+    except ValueError as e:
+        problems = [str(e)]
+    if problems:
+        print(f" Modelul compilat nu corespunde cu sklearn ({len(problems)} diferente), nu il folosim: {problems[0]}",
+              file=sys.stderr)
+        if os.path.exists(out):
+            os.remove(out)
+        return None
+    return os.path.basename(out)
+
+
+def load_model(model_file=MODEL_FILE):
+    # params: model_file (str)
+    # ce face: bundle-ul modelului deja antrenat: varianta compilata (doar NumPy, fara import sklearn/SciPy) daca
+    #          exista si e facuta din acelasi model (aceeasi amprenta ca manifestul), altfel .pkl-ul cu joblib
+    manifest = read_manifest(model_file) or {}
+    if manifest.get("compiled"):
+        from ml_compiled import compiled_path, load_compiled
+        try:
+            bundle = load_compiled(compiled_path(model_file))
+            if bundle[0].fingerprint == manifest.get("fingerprint"):
+                return bundle
+        except (OSError, ValueError, KeyError):
+            pass
+    import joblib # type: ignore
+    return joblib.load(model_file)
 
 
 def load_or_train(model_file=MODEL_FILE, data_file=DATA_FILE):
     # params: model_file (str), data_file (str)
-    # ce face: incarca modelul daca exista; daca nu, il antreneaza rapid si apoi il incarca
-    if not os.path.exists(model_file):
+    # ce face: incarca modelul; il reantreneaza doar daca lipseste sau daca datele/parametrii nu mai corespund manifestului
+    if model_is_stale(model_file=model_file, data_file=data_file):
         train_model(data_file=data_file, model_file=model_file)
-    return joblib.load(model_file)
+    return load_model(model_file)
+
+
+class BackgroundLoader:
+    # params: load (functie fara argumente care intoarce bundle-ul, implicit load_or_train),
+    #         name (str) -> numele thread-ului (apare in perf_trace / Chrome trace si in eroarea de timeout)
+    # ce face: incarca/antreneaza modelul (sau orice alt index greu) pe un thread separat ca fereastra sa apara imediat;
+    #          UI-ul verifica periodic .done (nu atingem Tk din thread-ul asta)
+    def __init__(self, load=load_or_train, name="ml-loader"):
+        self._load = load
+        self.name = name
+        self.done = threading.Event()
+        self.bundle = None
+        self.error = None
+        self.seconds = None
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    # params: none
+    # ce face: porneste thread-ul (o singura data) si intoarce loader-ul
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        start = time.perf_counter()
+        try:
+            self.bundle = self._load()
+        except Exception as e:
+            self.error = e
+        finally:
+            self.seconds = time.perf_counter() - start
+            self.done.set()
+
+    # params: timeout (float sau None)
+    # ce face: asteapta bundle-ul (pt scripturi/teste); ridica eroarea de incarcare daca a fost una
+    def result(self, timeout=None):
+        if not self.done.wait(timeout):
+            raise TimeoutError(f"{self.name}: nu s-a incarcat la timp")
+        if self.error is not None:
+            raise self.error
+        return self.bundle
 
 
 def predict(text, model_bundle):
@@ -45,6 +308,7 @@ def predict(text, model_bundle):
     return model.predict(X)[0]
 
 
+@perf_trace.traced("ml.predict_proba")
 def predict_proba(text, model_bundle):
     # params: text (str), model_bundle (tuple(model, vectorizer))
     # ce face: returneaza (label, confidence) daca modelul suporta predict_proba
@@ -59,3 +323,312 @@ def predict_proba(text, model_bundle):
     else:
         # fallback: daca nu are proba, dam 1.0 by default
         return model.predict(X)[0], 1.0
+
+
+def normalize_text(text):
+    # params: text (str)
+    # ce face: forma canonica a unei cereri: litere mici, spatii comprimate, fara diacritice
+    #          ("Doză  Aluminiu" -> "doza aluminiu"; merge si pt ş/ţ cu sedila)
+    text = unicodedata.normalize("NFKD", (text or "").lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(text.split())
+
+
+class PredictionCache:
+    # params: max_size (int), ttl (float, secunde), model_file (str), check_interval (float, secunde)
+    # ce face: cache LRU in fata lui predict_proba, cu cheie = textul normalizat;
+    #          intrarile expira dupa ttl, iar tot cache-ul se goleste cand se schimba fisierul modelului
+    #          (verificat cel mult o data pe check_interval) sau cand primeste alt bundle
+    def __init__(self, max_size=512, ttl=3600.0, model_file=MODEL_FILE, check_interval=1.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.model_file = model_file
+        self.check_interval = check_interval
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._bundle = None
+        self._stamp = self._model_stamp()
+        self._next_check = time.monotonic() + check_interval
+
+    def _model_stamp(self):
+        try:
+            st = os.stat(self.model_file)
+            return st.st_mtime_ns, st.st_size
+        except OSError:
+            return None
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    # params: now (float, monotonic), model_bundle (tuple)
+    # ce face: goleste cache-ul daca modelul s-a schimbat (alt obiect sau alt fisier pe disc)
+    def _check_model(self, now, model_bundle):
+        if model_bundle is not self._bundle:
+            self._bundle = model_bundle
+            self._data.clear()
+        if now >= self._next_check:
+            self._next_check = now + self.check_interval
+            stamp = self._model_stamp()
+            if stamp != self._stamp:
+                self._stamp = stamp
+                self._data.clear()
+
+    # params: text (str), model_bundle (tuple(model, vectorizer))
+    # ce face: (label, confidence) din cache sau, la miss, din predict_proba pe textul normalizat
+    def predict_proba(self, text, model_bundle):
+        key = normalize_text(text)
+        now = time.monotonic()
+        with self._lock:
+            self._check_model(now, model_bundle)
+            hit = self._data.get(key)
+            if hit is not None and hit[0] > now:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return hit[1]
+            self.misses += 1
+
+        value = predict_proba(key, model_bundle)
+        value = (str(value[0]), value[1])
+        with self._lock:
+            self._data[key] = (now + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    # params: none
+    # ce face: contoarele cache-ului (hits, misses, evictions, size, hit_rate)
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "size": len(self._data), "hit_rate": self.hits / total if total else 0.0}
+
+
+def _chunks(items, size):
+    # params: items (iterable), size (int)
+    # ce face: imparte un iterabil (chiar si generator/fisier) in liste de maxim size elemente, fara sa-l citeasca tot
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _score_chunk(texts, model_bundle, top_k):
+    # params: texts (list[str]), model_bundle (tuple(model, vectorizer)), top_k (int)
+    # ce face: vectorizeaza tot chunk-ul ca o singura matrice sparse si intoarce top_k (label, prob) pe rand
+    import numpy as np # type: ignore
+
+    model, vectorizer = model_bundle
+    X = vectorizer.transform([(t or "").strip().lower() for t in texts])
+    if not hasattr(model, "predict_proba"):
+        return [[(str(label), 1.0)] for label in model.predict(X)]
+
+    proba = model.predict_proba(X)
+    k = min(top_k, proba.shape[1])
+    # argpartition pe coloane, apoi sortam doar cele k ramase
+    top = np.argpartition(-proba, k - 1, axis=1)[:, :k]
+    rows = np.arange(proba.shape[0])[:, None]
+    order = np.argsort(-proba[rows, top], axis=1)
+    top = top[rows, order]
+    classes = model.classes_
+    return [[(str(classes[i]), float(p[i])) for i in idx] for p, idx in zip(proba, top)]
+
+
+_WORKER_BUNDLE = None
+
+
+def _init_worker(model_file):
+    # params: model_file (str)
+    # ce face: fiecare proces din pool isi incarca modelul o singura data (nu il trimitem la fiecare chunk)
+    global _WORKER_BUNDLE
+    _WORKER_BUNDLE = load_model(model_file)
+
+
+def _score_chunk_worker(texts, top_k):
+    return _score_chunk(texts, _WORKER_BUNDLE, top_k)
+
+
+def predict_proba_batch(texts, model_bundle=None, top_k=1, chunk_size=2048, workers=1, model_file=MODEL_FILE):
+    # params: texts (iterable[str]), model_bundle (tuple sau None), top_k (int), chunk_size (int),
+    #         workers (int) -> >1 = pool de procese, model_file (str) -> modelul incarcat de procese
+    # ce face: generator; pentru fiecare text da lista top_k [(label, prob)], in ordinea intrarii.
+    #          citeste intrarea pe bucati, deci merge si pe fisiere cu sute de mii de randuri.
+    #          parametrii invalizi dau ValueError imediat, nu abia la primul rezultat
+    if top_k < 1:
+        raise ValueError(f"top_k trebuie sa fie cel putin 1 (primit {top_k})")
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size trebuie sa fie cel putin 1 (primit {chunk_size})")
+    return _predict_proba_batch(texts, model_bundle, top_k, chunk_size, workers, model_file)
+
+
+def _predict_proba_batch(texts, model_bundle, top_k, chunk_size, workers, model_file):
+    if workers <= 1:
+        if model_bundle is None:
+            model_bundle = load_or_train(model_file=model_file)
+        for chunk in _chunks(texts, chunk_size):
+            yield from _score_chunk(chunk, model_bundle, top_k)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    # aceeasi regula ca load_or_train: procesele incarca modelul de pe disc, deci il reantrenam daca e vechi
+    if model_is_stale(model_file=model_file):
+        train_model(model_file=model_file)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(model_file,)) as pool:
+        # tinem maxim 2 chunk-uri per proces "in zbor", ca memoria sa nu creasca cu marimea intrarii
+        pending = []
+        for chunk in _chunks(texts, chunk_size):
+            pending.append(pool.submit(_score_chunk_worker, chunk, top_k))
+            if len(pending) >= workers * 2:
+                yield from pending.pop(0).result()
+        for fut in pending:
+            yield from fut.result()
+
+
+def predict_batch(texts, model_bundle=None, chunk_size=2048, workers=1, model_file=MODEL_FILE):
+    # params: la fel ca predict_proba_batch
+    # ce face: generator cu doar label-ul cel mai probabil pentru fiecare text
+    for top in predict_proba_batch(texts, model_bundle, top_k=1, chunk_size=chunk_size,
+                                   workers=workers, model_file=model_file):
+        yield top[0][0]
+
+
+def _read_texts(path, text_column="text"):
+    # params: path (str) -> .csv (cu header) sau .jsonl; "-" = stdin (jsonl), text_column (str)
+    # ce face: generator cu textele din fisier, rand cu rand (nu incarca tot fisierul)
+    is_csv = path.lower().endswith(".csv")
+    f = sys.stdin if path == "-" else open(path, "r", encoding="utf-8", newline="" if is_csv else None)
+    try:
+        if is_csv:
+            for row in csv.DictReader(f):
+                yield row.get(text_column) or ""
+        else:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line).get(text_column) or ""
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def _classify_cli(args):
+    # params: args (argparse.Namespace)
+    # ce face: clasifica un fisier CSV/JSONL si scrie rezultatele (JSONL sau CSV) + statistici de viteza pe stderr
+    # tee: textul trebuie si la scriere; buffer-ul ramane mic pt ca predictiile vin pe chunk-uri
+    to_score, to_write = tee(_read_texts(args.input, args.text_column))
+    preds = predict_proba_batch(to_score, top_k=args.top_k, chunk_size=args.chunk_size,
+                                workers=args.workers, model_file=args.model)
+
+    out_csv = args.output.lower().endswith(".csv")
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    start = time.perf_counter()
+    n = 0
+    try:
+        writer = csv.writer(out) if out_csv else None
+        if writer:
+            writer.writerow(["text", "label", "confidence", "top"])
+        for top, text in zip(preds, to_write):
+            label, conf = top[0]
+            if writer:
+                writer.writerow([text, label, f"{conf:.4f}", json.dumps(top, ensure_ascii=False)])
+            else:
+                out.write(json.dumps({"text": text, "label": label, "confidence": conf, "top": top},
+                                     ensure_ascii=False) + "\n")
+            n += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+    print(f" {n} randuri clasificate in {elapsed:.2f}s ({n / elapsed if elapsed else 0:.0f} randuri/s, "
+          f"workers={args.workers}, chunk={args.chunk_size})", file=sys.stderr)
+    return 0
+
+
+def _compile_cli(args):
+    # params: args (argparse.Namespace)
+    # ce face: (re)compileaza modelul .pkl existent in .npz si verifica paritatea cu sklearn pe setul de date
+    #          + variante (majuscule, diacritice, cuvinte necunoscute, text gol); exit code 1 la diferente
+    import joblib # type: ignore
+
+    if model_is_stale(model_file=args.model, data_file=args.data):
+        train_model(data_file=args.data, model_file=args.model)
+    manifest = read_manifest(args.model)
+    with open(args.data, "r", encoding="utf-8") as f:
+        texts = [d["text"] for d in json.load(f)]
+    texts += [t.upper() for t in texts] + [t + " ceva necunoscut" for t in texts]
+    texts += ["", "   ", "Doză de aluminiu", "sticlă", "xyz qwerty", "pet pet pet de apa"]
+    bundle = joblib.load(args.model)
+    compiled = _export_compiled(bundle, args.model, manifest["fingerprint"], texts)
+    if compiled is None:
+        print(f" Modelul nu a fost compilat ({type(bundle[0]).__name__} + {type(bundle[1]).__name__}; "
+              "se compileaza doar TF-IDF pe cuvinte + MultinomialNB)", file=sys.stderr)
+        return 1
+    manifest["compiled"] = compiled
+    write_manifest(args.model, manifest)
+    path = os.path.join(os.path.dirname(os.path.abspath(args.model)), compiled)
+    print(f" Model compilat: {path} ({os.path.getsize(path) / 1024:.1f} KB, .pkl: "
+          f"{os.path.getsize(args.model) / 1024:.1f} KB); paritate cu sklearn pe {len(texts)} texte: ok")
+    return 0
+
+
+def main(argv=None):
+    # params: argv (list[str] sau None)
+    # ce face: linia de comanda:
+    #   python ml_model.py status                              -> manifest + daca modelul e expirat
+    #   python ml_model.py train                               -> reantreneaza modelul
+    #   python ml_model.py compile                             -> recycle_model.npz + test de paritate cu sklearn
+    #   python ml_model.py classify items.csv -o out.jsonl     -> clasificare in masa (CSV/JSONL)
+    parser = argparse.ArgumentParser(description="GreenVision - model ML reciclare")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_status = sub.add_parser("status", help="arata manifestul modelului si daca trebuie reantrenat")
+    p_status.add_argument("--data", default=DATA_FILE)
+    p_status.add_argument("--model", default=MODEL_FILE)
+
+    p_train = sub.add_parser("train", help="antreneaza modelul din ml_recycle_data.json")
+    p_train.add_argument("--data", default=DATA_FILE)
+    p_train.add_argument("--model", default=MODEL_FILE)
+
+    p_compile = sub.add_parser("compile", help="compileaza modelul pt scorare doar cu NumPy + test de paritate")
+    p_compile.add_argument("--data", default=DATA_FILE)
+    p_compile.add_argument("--model", default=MODEL_FILE)
+
+    p_cls = sub.add_parser("classify", help="clasifica un fisier CSV/JSONL cu descrieri de obiecte")
+    p_cls.add_argument("input", help="fisier .csv (cu header) sau .jsonl; '-' = jsonl din stdin")
+    p_cls.add_argument("-o", "--output", default="-", help="fisier .jsonl sau .csv (implicit: stdout, jsonl)")
+    p_cls.add_argument("--text-column", default="text")
+    p_cls.add_argument("--top-k", type=int, default=3)
+    p_cls.add_argument("--chunk-size", type=int, default=2048)
+    p_cls.add_argument("--workers", type=int, default=1, help="procese paralele (implicit 1)")
+    p_cls.add_argument("--model", default=MODEL_FILE)
+
+    args = parser.parse_args(argv)
+    if args.command == "status":
+        manifest = read_manifest(args.model)
+        print(json.dumps(manifest, ensure_ascii=False, indent=2) if manifest else " Modelul nu are manifest.")
+        stale = model_is_stale(model_file=args.model, data_file=args.data)
+        print(" Modelul trebuie reantrenat." if stale else " Modelul este la zi.")
+        return 1 if stale else 0
+    if args.command == "train":
+        start = time.perf_counter()
+        train_model(data_file=args.data, model_file=args.model)
+        print(f" Model salvat in {args.model} ({time.perf_counter() - start:.2f}s)")
+        return 0
+    if args.command == "compile":
+        return _compile_cli(args)
+    if args.top_k < 1 or args.chunk_size < 1:
+        parser.error("--top-k si --chunk-size trebuie sa fie cel putin 1")
+    return _classify_cli(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
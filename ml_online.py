@@ -0,0 +1,209 @@
+import os
+import sys
+import copy
+import json
+import threading
+
+from ml_model import (BASE_DIR, DATA_FILE, PARITY_SAMPLE, _current_pipeline, atomic_write, build_pipeline,
+                      normalize_text, sha256_file)
+
+# modelul care invata din confirmarile/corecturile din tab-ul AI (separat de recycle_model.pkl)
+ONLINE_MODEL_FILE = os.path.join(BASE_DIR, "recycle_model_online.pkl")
+
+# HashingVectorizer nu are vocabular, deci cuvinte noi din corecturi nu cer refit;
+# alternate_sign=False ca features sa fie pozitive (cerinta MultinomialNB)
+HASHING_PARAMS = {"ngram_range": (1, 2), "n_features": 2 ** 16, "alternate_sign": False, "norm": "l2"}
+# pipeline-ul implicit (ca in ml_model.build_pipeline); ml_eval.py poate alege altul cu clasificator care are
+# partial_fit (ex: SGD logistic), pastrat in starea salvata si la refacerea modelului cand se schimba setul de baza
+ONLINE_PIPELINE = {"vectorizer": HASHING_PARAMS, "hashing": True, "classifier": "nb", "classifier_params": {}}
+
+# o corectura de la user cantareste cat cateva exemple din setul de baza, altfel nu s-ar simti
+FEEDBACK_WEIGHT = 5.0
+
+
+def _as_json(value):
+    # ce face: forma JSON (tuplurile devin liste), ca pipeline-urile din .pkl, .npz si cod sa se compare corect
+    return json.loads(json.dumps(value))
+
+
+class OnlineModel:
+    # params: model (clasificator cu partial_fit sau None), vectorizer (HashingVectorizer sau None), data_sha256 (str),
+    #         applied_id (int) -> ultimul id din ai_feedback deja invatat, model_file (str),
+    #         bundle (tuple sau None) -> scorer-ul deja incarcat (ex: din .npz),
+    #         pipeline (dict), selection (dict sau None) -> de ce a fost ales pipeline-ul (scris de ml_eval.py)
+    # ce face: model antrenat pe setul de baza, apoi incremental (partial_fit) pe feedback-ul userilor;
+    #          .bundle e compatibil cu ml_model.predict_proba / PredictionCache si e varianta compilata
+    #          (ml_compiled, doar NumPy) cand se poate. model/vectorizer sklearn se incarca din .pkl abia cand
+    #          trebuie invatat ceva, deci pornirea fara feedback nou nu importa sklearn/SciPy
+    def __init__(self, model, vectorizer, data_sha256, applied_id=0, model_file=ONLINE_MODEL_FILE, bundle=None,
+                 pipeline=ONLINE_PIPELINE, selection=None):
+        self.model = model
+        self.vectorizer = vectorizer
+        self.data_sha256 = data_sha256
+        self.applied_id = applied_id
+        self.model_file = model_file
+        self.pipeline = pipeline
+        self.selection = selection
+        self.dirty = False
+        self.compiled = True
+        self._lock = threading.Lock()
+        # acelasi tuplu pana la urmatoarea invatare, ca PredictionCache sa-l recunoasca (verifica identitatea)
+        # si sa se goleasca doar cand modelul chiar s-a schimbat
+        self.bundle = bundle or self._scorer(model)
+
+    @property
+    def classes(self):
+        return [str(c) for c in self.bundle[0].classes_]
+
+    # params: model (clasificator sklearn)
+    # ce face: bundle-ul pt predictii: compilat daca se poate (si daca a trecut verificarea de paritate), altfel sklearn
+    def _scorer(self, model):
+        from ml_compiled import can_compile, compile_bundle
+
+        bundle = (model, self.vectorizer)
+        return compile_bundle(bundle) if self.compiled and can_compile(bundle) else bundle
+
+    # params: none
+    # ce face: incarca modelul sklearn din .pkl daca pornirea a folosit doar varianta compilata
+    def _load_trainable(self):
+        import joblib # type: ignore
+
+        if self.model is None:
+            state = joblib.load(self.model_file)
+            self.model, self.vectorizer = state["model"], state["vectorizer"]
+
+    # params: data_file (str), model_file (str), pipeline (dict sau None -> ONLINE_PIPELINE), selection (dict sau None)
+    # ce face: model nou antrenat pe ml_recycle_data.json (fit; clasele de aici raman fixe pt partial_fit)
+    @classmethod
+    def bootstrap(cls, data_file=DATA_FILE, model_file=ONLINE_MODEL_FILE, pipeline=None, selection=None):
+        pipeline = pipeline or ONLINE_PIPELINE
+        if not pipeline.get("hashing"):
+            raise ValueError("modelul online are nevoie de HashingVectorizer (\"hashing\": true in pipeline)")
+        with open(data_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        texts = [normalize_text(d["text"]) for d in data]
+        labels = [d["label"].strip() for d in data]
+
+        model, vectorizer = build_pipeline(pipeline)
+        model.fit(vectorizer.transform(texts), labels)
+        online = cls(model, vectorizer, sha256_file(data_file), model_file=model_file, pipeline=pipeline,
+                     selection=selection)
+        if online.bundle[0] is not model:
+            from ml_compiled import parity_check
+
+            problems = parity_check((model, vectorizer), online.bundle, texts[::max(1, len(texts) // PARITY_SAMPLE)])
+            if problems:
+                print(f" Modelul online compilat nu corespunde cu sklearn ({len(problems)} diferente), "
+                      f"folosim sklearn: {problems[0]}", file=sys.stderr)
+                online.compiled = False
+                online.bundle = (model, vectorizer)
+        online.dirty = True
+        return online
+
+    # params: saved (dict) -> starea din .pkl sau meta din .npz, data_sha256 (str)
+    # ce face: true daca modelul salvat e facut din acelasi set de baza si cu pipeline-ul care ar fi folosit acum
+    #          (cel ales cu ml_eval.py, sau ONLINE_PIPELINE daca nu s-a ales nimic)
+    @staticmethod
+    def _up_to_date(saved, data_sha256):
+        return (saved.get("data_sha256") == data_sha256 and saved.get("pipeline") is not None
+                and _as_json(saved["pipeline"]) == _as_json(_current_pipeline(saved, ONLINE_PIPELINE)[0]))
+
+    # params: data_sha256 (str), model_file (str)
+    # ce face: modelul online din .npz (fara joblib/sklearn) daca e la zi si corespunde cu .pkl-ul de langa el
+    #          (marimea lui e in meta); None altfel
+    @classmethod
+    def load_compiled(cls, data_sha256, model_file=ONLINE_MODEL_FILE):
+        from ml_compiled import compiled_path, load_compiled, read_meta
+
+        path = compiled_path(model_file)
+        meta = read_meta(path)
+        if not meta or meta.get("kind") != "hashing" or not cls._up_to_date(meta, data_sha256):
+            return None
+        try:
+            if os.path.getsize(model_file) != meta.get("model_size"):
+                return None
+            bundle = load_compiled(path)
+        except (OSError, ValueError, KeyError):
+            return None
+        return cls(None, None, data_sha256, meta["applied_id"], model_file, bundle=bundle,
+                   pipeline=meta["pipeline"], selection=meta.get("selection"))
+
+    # params: data_file (str), model_file (str)
+    # ce face: incarca modelul online salvat (intai varianta compilata, apoi .pkl-ul); daca lipseste sau setul de baza
+    #          s-a schimbat, il reface de la zero (cu pipeline-ul ales cu ml_eval.py, daca exista)
+    @classmethod
+    def load_or_bootstrap(cls, data_file=DATA_FILE, model_file=ONLINE_MODEL_FILE):
+        from ml_compiled import compiled_path, read_meta
+
+        data_sha256 = sha256_file(data_file)
+        online = cls.load_compiled(data_sha256, model_file)
+        if online is not None:
+            return online
+
+        import joblib # type: ignore
+        try:
+            state = joblib.load(model_file)
+        except (OSError, EOFError, ValueError):
+            state = None
+        if state and cls._up_to_date(state, data_sha256):
+            return cls(state["model"], state["vectorizer"], data_sha256, state["applied_id"], model_file,
+                       pipeline=state["pipeline"], selection=state.get("selection"))
+        pipeline, selection = _current_pipeline(state or read_meta(compiled_path(model_file)), ONLINE_PIPELINE)
+        return cls.bootstrap(data_file=data_file, model_file=model_file, pipeline=pipeline, selection=selection)
+
+    # params: rows (list[(id, text, label)]) din DB.get_ai_feedback
+    # ce face: invata incremental (partial_fit) doar feedback-ul nou; lucreaza pe o copie a modelului si o
+    #          inlocuieste la final, ca predictiile care ruleaza in paralel sa vada ori modelul vechi, ori pe cel nou.
+    #          label-urile necunoscute se sar (partial_fit nu poate adauga clase dupa antrenare). intoarce cate a invatat
+    def learn(self, rows):
+        with self._lock:
+            known = set(self.classes)
+            fresh = [(i, t, lab) for i, t, lab in rows if i > self.applied_id]
+            usable = [(normalize_text(t), lab) for _, t, lab in fresh if lab in known]
+            if usable:
+                self._load_trainable()
+                model = copy.deepcopy(self.model)
+                X = self.vectorizer.transform([t for t, _ in usable])
+                model.partial_fit(X, [lab for _, lab in usable], sample_weight=[FEEDBACK_WEIGHT] * len(usable))
+                self.model = model
+                self.bundle = self._scorer(model)
+            if fresh:
+                self.applied_id = max(i for i, _, _ in fresh)
+                self.dirty = True
+            return len(usable)
+
+    # params: none
+    # ce face: salveaza modelul atomic (fisier temporar + os.replace), doar daca s-a schimbat ceva; langa .pkl scrie
+    #          si varianta compilata (.npz) folosita la pornire, cu starea modelului in meta
+    def save(self):
+        with self._lock:
+            if not self.dirty:
+                return
+            import joblib # type: ignore
+            from ml_compiled import compile_model, compiled_path
+
+            self._load_trainable()
+            self.dirty = False
+            saved = {"data_sha256": self.data_sha256, "pipeline": _as_json(self.pipeline), "selection": self.selection,
+                     "applied_id": self.applied_id}
+            state = {"model": self.model, "vectorizer": self.vectorizer, **saved}
+            atomic_write(self.model_file, lambda tmp: joblib.dump(state, tmp))
+            out = compiled_path(self.model_file)
+            if self.bundle[0] is not self.model:
+                extra = {**saved, "model_size": os.path.getsize(self.model_file)}
+                atomic_write(out, lambda tmp: compile_model((self.model, self.vectorizer), tmp, extra=extra))
+            elif os.path.exists(out):
+                os.remove(out)
+
+
+def load_online_model(db, data_file=DATA_FILE, model_file=ONLINE_MODEL_FILE):
+    # params: db (DB), data_file (str), model_file (str)
+    # ce face: modelul online sincronizat cu tabela ai_feedback (folosit de BackgroundLoader la pornire);
+    #          daca baza de date e mai noua/resetata fata de model (id-uri mai mici), reinvata tot feedback-ul
+    online = OnlineModel.load_or_bootstrap(data_file=data_file, model_file=model_file)
+    if db.last_ai_feedback_id() < online.applied_id:
+        online = OnlineModel.bootstrap(data_file=data_file, model_file=model_file, pipeline=online.pipeline,
+                                       selection=online.selection)
+    online.learn(db.get_ai_feedback(after_id=online.applied_id))
+    online.save()
+    return online
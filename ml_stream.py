@@ -0,0 +1,188 @@
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import datetime
+from itertools import islice
+
+from ml_model import atomic_write, sklearn_version, write_manifest
+from ml_online import HASHING_PARAMS
+
+# antrenare "out-of-core": corpusul (JSONL sau CSV, milioane de randuri) se citeste pe bucati, fiecare bucata trece prin
+# HashingVectorizer (fara vocabular tinut in memorie) si MultinomialNB.partial_fit. memoria depinde de chunk_size si
+# n_features, nu de marimea fisierului.
+STREAM_MODEL_FILE = os.path.join(os.path.dirname(__file__), "recycle_model_stream.pkl")
+# diacriticele se scot in vectorizer, deci modelul da acelasi rezultat pt "sticlă" si "sticla" oricine il apeleaza
+STREAM_PARAMS = dict(HASHING_PARAMS, strip_accents="unicode")
+CHUNK_SIZE = 20000
+
+
+# params: path (str) -> .csv (cu header) sau .jsonl; "-" = jsonl din stdin, text_column (str), label_column (str)
+# ce face: generator (text, label) rand cu rand; randurile fara text sau fara label se sar
+def read_labeled(path, text_column="text", label_column="label"):
+    is_csv = path.lower().endswith(".csv")
+    f = sys.stdin if path == "-" else open(path, "r", encoding="utf-8", newline="" if is_csv else None)
+    try:
+        rows = csv.DictReader(f) if is_csv else (json.loads(line) for line in f if line.strip())
+        for row in rows:
+            text, label = (row.get(text_column) or "").strip(), (row.get(label_column) or "").strip()
+            if text and label:
+                yield text, label
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+# params: path, text_column, label_column (ca la read_labeled)
+# ce face: o trecere doar prin label-uri (NB trebuie sa stie toate clasele la primul partial_fit)
+def scan_labels(path, text_column="text", label_column="label"):
+    return sorted({label for _, label in read_labeled(path, text_column, label_column)})
+
+
+# params: none
+# ce face: memoria maxima a procesului (MB) pana acum; None daca sistemul nu o raporteaza
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return _peak_rss_windows_mb()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux raporteaza in KB, macOS in bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _peak_rss_windows_mb():
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class Counters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+        counters = Counters()
+        counters.cb = ctypes.sizeof(Counters)
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return None
+        return counters.PeakWorkingSetSize / (1024 * 1024)
+    except (AttributeError, OSError):
+        return None
+
+
+# params: path (str) corpusul, model_file (str), chunk_size (int), classes (list[str] sau None -> citite din fisier),
+#         text_column, label_column (str), n_features (int sau None -> din HASHING_PARAMS), progress (fn(dict) sau None)
+# ce face: antreneaza pe bucati si salveaza (model, vectorizer) atomic + manifest cu statisticile;
+#          fiecare bucata e intai prezisa cu modelul de pana atunci (acuratete "progresiva", fara set separat de test)
+def train_stream(path, model_file=STREAM_MODEL_FILE, chunk_size=CHUNK_SIZE, classes=None,
+                 text_column="text", label_column="label", n_features=None, progress=None):
+    # cu chunk_size <= 0 islice n-ar da niciun rand si eroarea ar fi "niciun rand", deci verificam de la inceput
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size trebuie sa fie cel putin 1 (primit {chunk_size})")
+    import joblib # type: ignore
+    from sklearn.feature_extraction.text import HashingVectorizer # type: ignore
+    from sklearn.naive_bayes import MultinomialNB # type: ignore
+
+    start = time.perf_counter()
+    if classes is None:
+        classes = scan_labels(path, text_column, label_column)
+    if not classes:
+        raise ValueError(f"{path}: niciun rand cu '{text_column}' si '{label_column}'")
+    known = set(classes)
+    params = dict(STREAM_PARAMS, n_features=n_features or STREAM_PARAMS["n_features"])
+    vectorizer = HashingVectorizer(**params)
+    model = MultinomialNB()
+
+    rows = skipped = tested = correct = 0
+    it = read_labeled(path, text_column, label_column)
+    while True:
+        chunk = list(islice(it, chunk_size))
+        if not chunk:
+            break
+        usable = [(t, lab) for t, lab in chunk if lab in known]
+        skipped += len(chunk) - len(usable)
+        if not usable:
+            continue
+        texts, labels = [t for t, _ in usable], [lab for _, lab in usable]
+        X = vectorizer.transform(texts)
+        if rows:
+            correct += int((model.predict(X) == labels).sum())
+            tested += len(labels)
+        model.partial_fit(X, labels, classes=classes if not rows else None)
+        rows += len(labels)
+        if progress is not None:
+            elapsed = time.perf_counter() - start
+            progress({"rows": rows, "seconds": elapsed, "rows_per_s": rows / elapsed if elapsed else 0.0,
+                      "peak_rss_mb": peak_rss_mb()})
+    if not rows:
+        raise ValueError(f"{path}: niciun rand cu label-urile {classes}")
+
+    atomic_write(model_file, lambda tmp: joblib.dump((model, vectorizer), tmp))
+    elapsed = time.perf_counter() - start
+    st = os.stat(path) if path != "-" else None
+    stats = {
+        "kind": "stream",
+        "data": {"path": os.path.basename(path), "size": st.st_size if st else None,
+                 "mtime_ns": st.st_mtime_ns if st else None},
+        "params": {k: list(v) if isinstance(v, tuple) else v for k, v in params.items()},
+        "sklearn": sklearn_version(),
+        "model_size": os.path.getsize(model_file),
+        "n_samples": rows,
+        "skipped": skipped,
+        "classes": [str(c) for c in model.classes_],
+        "chunk_size": chunk_size,
+        "seconds": round(elapsed, 3),
+        "rows_per_s": round(rows / elapsed, 1) if elapsed else None,
+        "peak_rss_mb": round(peak, 1) if (peak := peak_rss_mb()) is not None else None,
+        "progressive_accuracy": round(correct / tested, 4) if tested else None,
+        "trained_at": datetime.datetime.now().isoformat(timespec="seconds"),
+    }
+    write_manifest(model_file, stats)
+    return stats
+
+
+def main(argv=None):
+    # params: argv (list[str] sau None)
+    # ce face: python ml_stream.py corpus.jsonl [-o recycle_model_stream.pkl] [--chunk-size 20000]
+    #          [--classes Plastic,Hartie,...] [--text-column text] [--label-column label] [--n-features 262144]
+    #          modelul rezultat merge cu python ml_model.py classify ... --model recycle_model_stream.pkl
+    parser = argparse.ArgumentParser(description="GreenVision - antrenare pe bucati din corpusuri mari (JSONL/CSV)")
+    parser.add_argument("input", help="fisier .jsonl sau .csv (cu header); '-' = jsonl din stdin (cere --classes)")
+    parser.add_argument("-o", "--output", default=STREAM_MODEL_FILE)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--classes", help="clasele separate prin virgula (altfel o trecere in plus prin fisier)")
+    parser.add_argument("--text-column", default="text")
+    parser.add_argument("--label-column", default="label")
+    parser.add_argument("--n-features", type=int, help=f"dimensiunea hashing-ului (implicit {HASHING_PARAMS['n_features']})")
+    parser.add_argument("--quiet", action="store_true", help="fara progres pe stderr")
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1:
+        parser.error("--chunk-size trebuie sa fie cel putin 1")
+    if args.input == "-" and not args.classes:
+        parser.error("din stdin fisierul nu poate fi citit de doua ori: da clasele cu --classes")
+
+    def show(p):
+        rss = f", memorie maxima {p['peak_rss_mb']:.0f} MB" if p["peak_rss_mb"] is not None else ""
+        print(f"  {p['rows']:>12,} randuri  {p['rows_per_s']:>10,.0f} randuri/s{rss}", file=sys.stderr)
+
+    classes = [c.strip() for c in args.classes.split(",") if c.strip()] if args.classes else None
+    try:
+        stats = train_stream(args.input, args.output, args.chunk_size, classes, args.text_column,
+                             args.label_column, args.n_features, progress=None if args.quiet else show)
+    except ValueError as e:
+        print(f" {e}", file=sys.stderr)
+        return 1
+    acc = stats["progressive_accuracy"]
+    print(f" Model salvat in {args.output}: {stats['n_samples']:,} randuri in {stats['seconds']:.1f}s "
+          f"({stats['rows_per_s']:,.0f} randuri/s), memorie maxima {stats['peak_rss_mb']} MB, "
+          f"acuratete progresiva {acc if acc is not None else '-'}, sarite {stats['skipped']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+import os #variabila de mediu GREENVISION_TRACE + pid in trace
+import sys #argv (--perf-trace)
+import json #export JSON / Chrome trace
+import time #perf_counter_ns
+import threading #lock pt statistici + numele thread-urilor in trace
+import functools
+from bisect import bisect_left
+from collections import deque
+
+# limitele histogramei (ms); ultimul bucket e "peste 5000 ms"
+BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+# cate evenimente individuale se pastreaza pt Chrome trace (cele mai vechi ies primele)
+MAX_EVENTS = 20000
+
+_enabled = "--perf-trace" in sys.argv or bool(os.environ.get("GREENVISION_TRACE"))
+_lock = threading.Lock()
+_stats = {}  # nume -> [count, total_ns, min_ns, max_ns, bucket counts]
+_events = deque(maxlen=MAX_EVENTS)  # (nume, start_ns, durata_ns, thread id)
+_threads = {}  # thread id -> nume thread
+_T0 = time.perf_counter_ns()
+
+
+# params: none
+# ce face: true daca masuratorile sunt pornite
+def enabled():
+    return _enabled
+
+
+# params: on=True (bool)
+# ce face: porneste/opreste masuratorile la runtime (din tab-ul de diagnoza); oprite costa doar un if per apel
+def enable(on=True):
+    global _enabled
+    _enabled = bool(on)
+
+
+# params: none
+# ce face: sterge tot ce s-a masurat pana acum (si numele thread-urilor, ca exportul urmator sa nu le mai arate)
+def reset():
+    with _lock:
+        _stats.clear()
+        _events.clear()
+        _threads.clear()
+
+
+# params: name (str), start_ns (int), end_ns (int)
+# ce face: adauga o durata in histograma numelui + evenimentul pt Chrome trace
+def record(name, start_ns, end_ns):
+    dur = end_ns - start_ns
+    tid = threading.get_ident()
+    bucket = bisect_left(BUCKETS_MS, dur / 1e6)
+    with _lock:
+        st = _stats.get(name)
+        if st is None:
+            st = _stats[name] = [0, 0, dur, dur, [0] * (len(BUCKETS_MS) + 1)]
+        st[0] += 1
+        st[1] += dur
+        if dur < st[2]:
+            st[2] = dur
+        if dur > st[3]:
+            st[3] = dur
+        st[4][bucket] += 1
+        _events.append((name, start_ns, dur, tid))
+        if tid not in _threads:
+            _threads[tid] = threading.current_thread().name
+
+
+class span:
+    # params: name (str)
+    # ce face: context manager care masoara blocul: with perf_trace.span("db.flush"): ...
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        if _enabled:
+            self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        if self.start is not None:
+            record(self.name, self.start, time.perf_counter_ns())
+        return False
+
+
+# params: name (str)
+# ce face: decorator care masoara fiecare apel al functiei sub numele dat
+def traced(name):
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, start, time.perf_counter_ns())
+        return wrapper
+    return decorate
+
+
+# params: prefix (str), exclude=("close",) (tuple)
+# ce face: decorator de clasa: masoara toate metodele publice ca "<prefix>.<metoda>" (ex: db.quiz_stats)
+def trace_methods(prefix, exclude=("close",)):
+    def decorate(cls):
+        for attr, value in list(vars(cls).items()):
+            if callable(value) and not attr.startswith("_") and attr not in exclude:
+                setattr(cls, attr, traced(f"{prefix}.{attr}")(value))
+        return cls
+    return decorate
+
+
+# params: counts (list[int]), total (int), q (float 0..1), max_ms (float)
+# ce face: percentila aproximata din histograma (limita de sus a bucket-ului in care cade)
+def _quantile(counts, total, q, max_ms):
+    target, seen = q * total, 0
+    for i, c in enumerate(counts):
+        seen += c
+        if c and seen >= target:
+            return round(min(BUCKETS_MS[i], max_ms) if i < len(BUCKETS_MS) else max_ms, 4)
+    return round(max_ms, 4)
+
+
+# params: none
+# ce face: {nume: count, total/medie/min/max ms, p50/p95 aproximate, histograma} sortat dupa timpul total
+def snapshot():
+    with _lock:
+        items = [(name, st[0], st[1], st[2], st[3], list(st[4])) for name, st in _stats.items()]
+    result = {}
+    for name, count, total, lo, hi, counts in sorted(items, key=lambda r: -r[2]):
+        max_ms = hi / 1e6
+        labels = [f"<={b}ms" for b in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}ms"]
+        result[name] = {
+            "count": count, "total_ms": round(total / 1e6, 3), "mean_ms": round(total / count / 1e6, 4),
+            "min_ms": round(lo / 1e6, 4), "max_ms": round(max_ms, 4),
+            "p50_ms": _quantile(counts, count, 0.5, max_ms), "p95_ms": _quantile(counts, count, 0.95, max_ms),
+            "histogram": {label: c for label, c in zip(labels, counts) if c},
+        }
+    return result
+
+
+# params: top=None (int sau None)
+# ce face: tabel text (pt tab-ul de diagnoza / consola)
+def report(top=None):
+    rows = list(snapshot().items())[:top]
+    lines = [f" {'operatie':<30} {'n':>7} {'total ms':>10} {'medie':>9} {'p50<=':>8} {'p95<=':>8} {'max':>9}"]
+    for name, st in rows:
+        lines.append(f" {name:<30} {st['count']:>7} {st['total_ms']:>10.1f} {st['mean_ms']:>9.3f} "
+                     f"{st['p50_ms']:>8g} {st['p95_ms']:>8g} {st['max_ms']:>9.2f}")
+    if not rows:
+        lines.append(" (nimic masurat inca)" if _enabled else " (masuratorile sunt oprite)")
+    return "\n".join(lines)
+
+
+# params: path (str)
+# ce face: scrie statisticile (histograme + contoare) ca JSON
+def export_json(path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"enabled": _enabled, "buckets_ms": list(BUCKETS_MS), "spans": snapshot()}, f, indent=2)
+    return path
+
+
+# params: path (str)
+# ce face: scrie ultimele evenimente in formatul Chrome trace (se deschide in chrome://tracing sau ui.perfetto.dev)
+def export_chrome_trace(path):
+    pid = os.getpid()
+    with _lock:
+        events = list(_events)
+        threads = dict(_threads)
+    trace = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+             for tid, name in threads.items()]
+    trace += [{"name": name, "cat": name.split(".", 1)[0], "ph": "X", "pid": pid, "tid": tid,
+               "ts": (start - _T0) / 1000, "dur": dur / 1000} for name, start, dur, tid in events]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+    return path
@@ -0,0 +1,202 @@
+import os #stat (mtime/marime) pe json, replace atomic
+import glob #curatare fisiere compilate vechi
+import json #sursa (collect_points.json) + tabela de tipuri
+import mmap #fisierul compilat e mapat in memorie, nu citit
+import struct #header-ul binar
+import hashlib #cheia fisierului = hash-ul json-ului sursa
+import tempfile #scriere atomica
+from array import array
+
+BASE_DIR = os.path.dirname(__file__)
+COLLECT_JSON = os.path.join(BASE_DIR, "collect_points.json")
+STORE_DIR = os.path.join(BASE_DIR, ".map_cache")
+
+# format: header | lat f64[n] | lon f64[n] | masca tipuri u64[n] | offset nume u64[n+1] | tipuri (json) | nume (utf-8)
+MAGIC = b"GVPOINTS"
+VERSION = 1
+# magic, versiune, n, mtime_ns sursa, marime sursa, sha256 sursa, lungime tabela tipuri, lungime nume
+HEADER = struct.Struct("<8sIIqQ32sQQ")
+# unde incepe (mtime_ns, marime) in header, pt actualizarea lui pe loc
+STAT_OFFSET = struct.calcsize("<8sII")
+MAX_TYPES = 64
+
+
+# params: n (int)
+# ce face: rotunjeste in sus la multiplu de 8 (sectiunile raman aliniate pt cast-ul la double/u64)
+def _align(n):
+    return (n + 7) & ~7
+
+
+# params: path (str)
+# ce face: (mtime_ns, marime) a fisierului sau None daca lipseste
+def _stat(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+# params: path (str)
+# ce face: sha256 (bytes) al fisierului; json lipsa -> hash-ul continutului gol
+def _sha256(path):
+    h = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+    except OSError:
+        pass
+    return h.digest()
+
+
+# params: points (list[dict]) ca in collect_points.json, out_path (str), source_stat (tuple), source_sha (bytes)
+# ce face: scrie fisierul binar pe coloane; fiecare tip apare o singura data in tabela, punctele au doar o masca de biti
+def compile_points(points, out_path, source_stat=(0, 0), source_sha=b"\0" * 32):
+    types, index = [], {}
+    lat, lon, masks = array("d"), array("d"), array("Q")
+    offsets, names = array("Q", [0]), bytearray()
+    for p in points:
+        mask = 0
+        for t in p.get("types", []):
+            t = t.strip()
+            if t not in index:
+                if len(types) == MAX_TYPES:
+                    raise ValueError(f"prea multe tipuri de puncte (maxim {MAX_TYPES})")
+                index[t] = len(types)
+                types.append(t)
+            mask |= 1 << index[t]
+        lat.append(float(p["lat"]))
+        lon.append(float(p["lon"]))
+        masks.append(mask)
+        names += p.get("name", "").encode("utf-8")
+        offsets.append(len(names))
+
+    types_blob = json.dumps(types, ensure_ascii=False).encode("utf-8")
+    header = HEADER.pack(MAGIC, VERSION, len(lat), source_stat[0], source_stat[1], source_sha,
+                         len(types_blob), len(names))
+    with open(out_path, "wb") as f:
+        f.write(header)
+        f.write(b"\0" * (_align(HEADER.size) - HEADER.size))
+        for column in (lat, lon, masks, offsets):
+            f.write(column.tobytes())
+        f.write(types_blob)
+        f.write(b"\0" * (_align(len(types_blob)) - len(types_blob)))
+        f.write(names)
+
+
+class PointStore:
+    # params: path (str) -> fisier scris de compile_points
+    # ce face: punctele de colectare mapate in memorie: lat/lon/masti sunt memoryview-uri direct peste fisier
+    #          (fara copie si fara dict-uri per punct), numele se decodeaza doar cand sunt cerute
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, n, mtime_ns, size, sha, types_len, names_len = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"{path}: nu este un fisier de puncte compilat (versiunea {VERSION})")
+        self.source_stat = (mtime_ns, size)
+        self.source_sha = sha
+
+        view = memoryview(self._mm)
+        pos = _align(HEADER.size)
+        self.lat = view[pos:pos + 8 * n].cast("d")
+        pos += 8 * n
+        self.lon = view[pos:pos + 8 * n].cast("d")
+        pos += 8 * n
+        self.masks = view[pos:pos + 8 * n].cast("Q")
+        pos += 8 * n
+        self._offsets = view[pos:pos + 8 * (n + 1)].cast("Q")
+        pos += 8 * (n + 1)
+        self.types = json.loads(bytes(view[pos:pos + types_len]).decode("utf-8"))
+        pos += _align(types_len)
+        self._names = view[pos:pos + names_len]
+        self._views = [self.lat, self.lon, self.masks, self._offsets, self._names, view]
+
+    def __len__(self):
+        return len(self.lat)
+
+    # params: i (int)
+    # ce face: numele punctului i (decodat din tabela de string-uri)
+    def name(self, i):
+        return bytes(self._names[self._offsets[i]:self._offsets[i + 1]]).decode("utf-8")
+
+    # params: i (int)
+    # ce face: tipurile acceptate de punctul i, in ordinea din tabela
+    def types_of(self, i):
+        mask = self.masks[i]
+        return tuple(t for b, t in enumerate(self.types) if mask >> b & 1)
+
+    # params: category (str)
+    # ce face: bitul tipului in masti (0 daca niciun punct nu are tipul)
+    def type_bit(self, category):
+        try:
+            return 1 << self.types.index(category)
+        except ValueError:
+            return 0
+
+    # params: i (int)
+    # ce face: punctul i ca dict, in forma din collect_points.json
+    def point(self, i):
+        return {"name": self.name(i), "lat": self.lat[i], "lon": self.lon[i], "types": list(self.types_of(i))}
+
+    def __iter__(self):
+        return (self.point(i) for i in range(len(self)))
+
+    # params: none
+    # ce face: elibereaza maparea (pe Windows fisierul nu se poate sterge cat e mapat)
+    def close(self):
+        for v in self._views:
+            v.release()
+        self._mm.close()
+
+
+# params: points_file (str), store_dir (str)
+# ce face: deschide fisierul compilat pt json-ul curent; il (re)compileaza doar daca json-ul s-a schimbat.
+#          daca mtime/marimea json-ului sunt cele din header nu se citeste deloc json-ul; altfel decide hash-ul
+def open_store(points_file=COLLECT_JSON, store_dir=STORE_DIR):
+    stat = _stat(points_file) or (0, 0)
+    candidates = sorted(glob.glob(os.path.join(store_dir, "points-*.bin")), key=os.path.getmtime, reverse=True)
+    for path in candidates[:1]:
+        try:
+            store = PointStore(path)
+        except (OSError, ValueError, struct.error):
+            continue
+        if store.source_stat == stat:
+            return store
+        store.close()
+
+    sha = _sha256(points_file)
+    path = os.path.join(store_dir, f"points-{sha.hex()[:16]}.bin")
+    if not os.path.exists(path):
+        try:
+            with open(points_file, "r", encoding="utf-8") as f:
+                points = json.load(f)
+        except Exception:
+            points = []
+        os.makedirs(store_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".tmp-", suffix=".bin", dir=store_dir)
+        os.close(fd)
+        try:
+            compile_points(points, tmp, stat, sha)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        for old in glob.glob(os.path.join(store_dir, "points-*.bin")):
+            if os.path.abspath(old) != os.path.abspath(path):
+                try:
+                    os.remove(old)
+                except OSError:
+                    pass  # inca mapat de alt proces (Windows); se sterge la urmatoarea recompilare
+    else:
+        # acelasi continut, dar json-ul a fost atins (ex: copiat din nou): actualizam stat-ul din header
+        # ca la urmatoarea pornire sa nu mai fie nevoie de hash
+        with open(path, "r+b") as f:
+            f.seek(STAT_OFFSET)
+            f.write(struct.pack("<qQ", *stat))
+    os.utime(path)
+    return PointStore(path)
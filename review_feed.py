@@ -0,0 +1,196 @@
+import math #ceil pt cate carduri incap in viewport
+import customtkinter as ctk #UI modern cu Tkinter
+
+CARD_HEIGHT = 92      # inaltimea fixa a unui card (unitati CTk, inainte de scaling)
+CARD_GAP = 12         # spatiu intre carduri
+MAX_COMMENT = 170     # comentariile lungi se taie ca sa incapa in cardul fix
+
+
+class FeedState:
+    # params: fetch_page (functie(before_id, limit) -> rows), fetch_newer (functie(after_id) -> rows), page_size (int),
+    #         row_height (float) -> un card + spatiul dintre carduri, in unitati CTk
+    # ce face: partea fara widget-uri a listei de recenzii: randurile incarcate (keyset pe reviews.id), offset-ul de
+    #          scroll si ce randuri se vad pt o inaltime data. ReviewFeed doar o deseneaza
+    def __init__(self, fetch_page, fetch_newer, page_size=50, row_height=CARD_HEIGHT + CARD_GAP):
+        self.fetch_page = fetch_page
+        self.fetch_newer = fetch_newer
+        self.page_size = page_size
+        self.row_height = row_height
+        self.rows = []
+        self.exhausted = False
+        self.offset = 0.0
+
+    # params: view_h (float) -> inaltimea vizibila
+    # ce face: cel mai mare offset (ultimul card lipit de marginea de jos)
+    def max_offset(self, view_h):
+        return max(0.0, len(self.rows) * self.row_height - view_h)
+
+    # params: none
+    # ce face: ia de la zero prima pagina (cele mai noi recenzii) si revine sus
+    def reload(self):
+        self.rows = list(self.fetch_page(None, self.page_size))
+        self.exhausted = len(self.rows) < self.page_size
+        self.offset = 0.0
+
+    # params: none
+    # ce face: aduce doar recenziile mai noi decat prima din lista si le pune deasupra; daca userul a dat scroll
+    #          in jos, offset-ul creste cu ele ca pe ecran sa ramana aceleasi carduri. intoarce cate au venit
+    def load_newer(self):
+        newest = self.rows[0][0] if self.rows else 0
+        fresh = list(self.fetch_newer(newest))
+        self.rows[:0] = fresh
+        if fresh and self.offset > 0:
+            self.offset += len(fresh) * self.row_height
+        return len(fresh)
+
+    # params: none
+    # ce face: urmatoarea pagina mai veche (WHERE id < ultimul id incarcat)
+    def load_more(self):
+        if self.exhausted or not self.rows:
+            return
+        page = list(self.fetch_page(self.rows[-1][0], self.page_size))
+        self.exhausted = len(page) < self.page_size
+        self.rows.extend(page)
+
+    # params: units (float), view_h (float)
+    # ce face: muta offset-ul, taiat intre 0 si max_offset
+    def scroll_by(self, units, view_h):
+        self.offset = min(max(0.0, self.offset + units), self.max_offset(view_h))
+
+    # params: fraction (float 0..1) -> de la scrollbar, view_h (float)
+    def move_to(self, fraction, view_h):
+        self.offset = min(max(0.0, fraction * len(self.rows) * self.row_height), self.max_offset(view_h))
+
+    # params: view_h (float)
+    # ce face: (first, shift, slots): primul rand vizibil, cat e tras in sus si cate carduri trebuie (pool-ul);
+    #          cand ecranul se apropie de capatul randurilor incarcate, aduce pagina urmatoare
+    def layout(self, view_h):
+        slots = math.ceil(view_h / self.row_height) + 1
+        first = int(self.offset // self.row_height)
+        if first + slots >= len(self.rows) - self.page_size // 2:
+            self.load_more()
+        self.offset = min(self.offset, self.max_offset(view_h))
+        first = int(self.offset // self.row_height)
+        return first, self.offset - first * self.row_height, slots
+
+    # params: view_h (float)
+    # ce face: (inceput, sfarsit) pt CTkScrollbar.set
+    def scrollbar(self, view_h):
+        total = len(self.rows) * self.row_height
+        if total <= view_h:
+            return 0.0, 1.0
+        return self.offset / total, (self.offset + view_h) / total
+
+
+class ReviewFeed(ctk.CTkFrame):
+    # params: master, fetch_page (functie(before_id, limit) -> rows), fetch_newer (functie(after_id) -> rows),
+    #         page_size (int), fonts (tuple(font_titlu, font_text)), text_color (str)
+    # ce face: lista virtualizata de recenzii: creeaza carduri doar pt ce se vede si le refoloseste la scroll;
+    #          paginile mai vechi se incarca la nevoie (keyset pe reviews.id), cele noi se pun deasupra fara rebuild.
+    #          randurile, paginarea si offset-ul sunt in FeedState
+    #          rows = (id, nickname, rating, comment, created_at), cele mai noi primele
+    def __init__(self, master, fetch_page, fetch_newer, page_size=50,
+                 fonts=(("Segoe UI", 16, "bold"), ("Segoe UI", 16)), text_color="#1B4332", **kwargs):
+        super().__init__(master, **kwargs)
+        self.state = FeedState(fetch_page, fetch_newer, page_size)
+        self.head_font, self.body_font = fonts
+        self.text_color = text_color
+        self.cards = []
+
+        self.viewport = ctk.CTkFrame(self, fg_color=self.cget("fg_color"))
+        self.viewport.pack(side="left", fill="both", expand=True)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.viewport.bind("<Configure>", lambda e: self._render())
+        self._bind_wheel(self.viewport)
+
+    # params: none
+    # ce face: pasul de scroll = un card + spatiul dintre carduri
+    @property
+    def row_height(self):
+        return self.state.row_height
+
+    # params: none
+    # ce face: inaltimea vizibila in unitati CTk (winfo_height e in pixeli reali, deja scalati)
+    def _view_height(self):
+        scaling = ctk.ScalingTracker.get_widget_scaling(self)
+        return max(1.0, self.viewport.winfo_height() / scaling)
+
+    # params: none
+    # ce face: prima pagina de la zero + redesenare
+    def reload(self):
+        self.state.reload()
+        self._render()
+
+    # params: none
+    # ce face: recenziile noi deasupra (vezi FeedState.load_newer); redeseneaza doar daca au venit
+    def load_newer(self):
+        if self.state.load_newer():
+            self._render()
+
+    # params: n (int)
+    # ce face: se asigura ca pool-ul are cel putin n carduri (create o singura data, apoi refolosite)
+    def _ensure_cards(self, n):
+        while len(self.cards) < n:
+            card = ctk.CTkFrame(self.viewport, height=CARD_HEIGHT, fg_color="#FFFFFF", corner_radius=14)
+            card.pack_propagate(False)
+            card.head = ctk.CTkLabel(card, text="", font=self.head_font, text_color=self.text_color)
+            card.head.pack(anchor="w", padx=10, pady=(8, 2))
+            card.body = ctk.CTkLabel(card, text="", justify="left", wraplength=900, font=self.body_font)
+            card.body.pack(anchor="w", padx=10, pady=(0, 10))
+            card.row_id = None
+            for w in (card, card.head, card.body):
+                self._bind_wheel(w)
+            self.cards.append(card)
+
+    # params: none
+    # ce face: pune cardurile din pool pe randurile vizibile (place la y calculat din offset)
+    def _render(self):
+        view_h = self._view_height()
+        first, shift, slots = self.state.layout(view_h)
+        rows = self.state.rows
+
+        self._ensure_cards(slots)
+        for i, card in enumerate(self.cards):
+            idx = first + i
+            if i >= slots or idx >= len(rows):
+                card.place_forget()
+                continue
+            self._bind_card(card, rows[idx])
+            card.place(relx=0.01, relwidth=0.98, y=i * self.row_height - shift + CARD_GAP / 2)
+        self.scrollbar.set(*self.state.scrollbar(view_h))
+
+    # params: card (CTkFrame), row (tuple)
+    # ce face: schimba textul cardului doar daca arata alt rand (fara widget-uri noi)
+    def _bind_card(self, card, row):
+        review_id, nick, rating, comment, _created_at = row
+        if card.row_id == review_id:
+            return
+        card.row_id = review_id
+        if len(comment) > MAX_COMMENT:
+            comment = comment[:MAX_COMMENT - 1].rstrip() + "…"
+        card.head.configure(text=f"{nick} – {'*'*rating}{'☆'*(5-rating)}")
+        card.body.configure(text=comment)
+
+    # params: units (float)
+    # ce face: muta lista cu un numar de unitati CTk si redeseneaza
+    def _scroll_by(self, units):
+        self.state.scroll_by(units, self._view_height())
+        self._render()
+
+    # params: *args -> ("moveto", fractie) sau ("scroll", n, "units"/"pages") de la CTkScrollbar
+    def _on_scrollbar(self, *args):
+        if args[0] == "moveto":
+            self.state.move_to(float(args[1]), self._view_height())
+            self._render()
+        elif args[0] == "scroll":
+            step = self._view_height() if args[2] == "pages" else self.row_height / 2
+            self._scroll_by(int(args[1]) * step)
+
+    # params: widget
+    # ce face: rotita mouse-ului (Windows/macOS: <MouseWheel>, Linux: Button-4/5)
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", lambda e: self._scroll_by((-1 if e.delta > 0 else 1) * self.row_height / 2), add="+")
+        widget.bind("<Button-4>", lambda e: self._scroll_by(-self.row_height / 2), add="+")
+        widget.bind("<Button-5>", lambda e: self._scroll_by(self.row_height / 2), add="+")
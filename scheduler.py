@@ -0,0 +1,121 @@
+import sys #erorile fara on_error ajung in stderr
+import queue #rezultatele trec de pe thread-urile de lucru pe thread-ul Tk
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Job:
+    # params: key (hashable sau None), future (Future)
+    # ce face: o sarcina trimisa la TkScheduler; callback-urile ruleaza pe thread-ul Tk, doar daca nu e anulata
+    def __init__(self, key, future):
+        self.key = key
+        self.future = future
+        self.callbacks = []  # (on_done, on_error)
+        self.cancelled = False
+
+    # params: none
+    # ce face: anuleaza sarcina; daca inca n-a pornit nu mai ruleaza deloc, altfel rezultatul e ignorat
+    def cancel(self):
+        self.cancelled = True
+        self.future.cancel()
+
+    def done(self):
+        return self.future.done()
+
+
+class TkScheduler:
+    # params: widget (fereastra Tk, pt after), workers=2 (int), interactive=1 (int) -> thread-uri pt lane-ul
+    #         "interactive", poll_ms=30 (int)
+    # ce face: ruleaza functii lente pe pool-uri de thread-uri si livreaza rezultatul pe thread-ul Tk printr-o coada
+    #          verificata cu after() cat timp sunt sarcini active. fiecare lane are pool-ul lui: ce asteapta userul
+    #          cand tasteaza (predictia, autocomplete) merge pe "interactive" si nu sta in coada dupa harta,
+    #          statistici sau invatare (lane-ul "background").
+    #          key = deduplicare: o sarcina cu aceeasi cheie care inca asteapta (n-a pornit) e refolosita;
+    #          replace=True anuleaza in schimb sarcina veche (conteaza doar ultima cerere, ex: ultima predictie)
+    def __init__(self, widget, workers=2, interactive=1, poll_ms=30):
+        self.widget = widget
+        self.poll_ms = poll_ms
+        self._lanes = {
+            "background": ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gv-task"),
+            "interactive": ThreadPoolExecutor(max_workers=interactive, thread_name_prefix="gv-interactive"),
+        }
+        self._results = queue.SimpleQueue()
+        self._pending = {}  # key -> Job (ultima sarcina trimisa cu cheia asta)
+        self._active = 0
+        self._polling = False
+
+    # params: fn (callable), *args, key=None, on_done=None (fn(rezultat)), on_error=None (fn(exceptie)),
+    #         replace=False (bool), lane="background" (str) -> sau "interactive"
+    # ce face: programeaza fn(*args) in fundal si intoarce Job-ul; apelat doar de pe thread-ul Tk
+    def submit(self, fn, *args, key=None, on_done=None, on_error=None, replace=False, lane="background"):
+        pool = self._lanes.get(lane)
+        if pool is None:
+            raise ValueError(f"lane necunoscut: {lane!r}")
+        old = self._pending.get(key) if key is not None else None
+        if old is not None and not old.cancelled and not old.done():
+            if replace:
+                old.cancel()
+            elif not old.future.running():
+                old.callbacks.append((on_done, on_error))
+                return old
+
+        job = Job(key, pool.submit(fn, *args))
+        job.callbacks.append((on_done, on_error))
+        if key is not None:
+            self._pending[key] = job
+        self._active += 1
+        job.future.add_done_callback(lambda _f, job=job: self._results.put(job))
+        if not self._polling:
+            self._polling = True
+            self.widget.after(self.poll_ms, self._poll)
+        return job
+
+    # params: key (hashable)
+    # ce face: anuleaza ultima sarcina trimisa cu cheia asta (daca mai e activa)
+    def cancel(self, key):
+        job = self._pending.pop(key, None)
+        if job is not None:
+            job.cancel()
+
+    # params: key (hashable)
+    # ce face: true daca exista o sarcina neterminata cu cheia asta
+    def busy(self, key):
+        job = self._pending.get(key)
+        return job is not None and not job.cancelled and not job.done()
+
+    def _poll(self):
+        while True:
+            try:
+                job = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._active -= 1
+            if self._pending.get(job.key) is job:
+                del self._pending[job.key]
+            if job.cancelled or job.future.cancelled():
+                continue
+            error = job.future.exception()
+            for on_done, on_error in job.callbacks:
+                try:
+                    if error is None:
+                        if on_done is not None:
+                            on_done(job.future.result())
+                    elif on_error is not None:
+                        on_error(error)
+                    else:
+                        traceback.print_exception(type(error), error, error.__traceback__, file=sys.stderr)
+                except Exception:
+                    traceback.print_exc(file=sys.stderr)
+        if self._active > 0:
+            self.widget.after(self.poll_ms, self._poll)
+        else:
+            self._polling = False
+
+    # params: none
+    # ce face: la inchidere: anuleaza ce n-a pornit si nu mai livreaza nimic pe Tk
+    def shutdown(self):
+        for job in list(self._pending.values()):
+            job.cancel()
+        self._pending.clear()
+        for pool in self._lanes.values():
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,356 @@
+import sys #erori neasteptate -> stderr
+import json #corpul cererilor/raspunsurilor
+import sqlite3 #erorile de CHECK din db (ex: rating in afara 1..5) -> 400
+import asyncio #serverul HTTP (doar stdlib, fara Tk)
+import argparse
+import threading
+import traceback
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qs
+from concurrent.futures import ThreadPoolExecutor
+
+from db import DB, DB_PATH
+from ml_model import ML_TO_UI_CAT, PredictionCache, normalize_text, predict_proba_batch
+from ml_online import ONLINE_MODEL_FILE, load_online_model
+from map_render import FOLIUM_OK, MapCache
+from geo_index import PointIndex
+
+MAX_BODY = 1 << 20  # 1 MB pe cerere
+MAX_BATCH = 5000  # texte intr-un singur /classify/batch
+MAX_HEADERS = 100
+KEEPALIVE_TIMEOUT = 15.0  # secunde de asteptare pe o conexiune keep-alive libera
+
+
+class HttpError(Exception):
+    # params: status (int), message (str)
+    # ce face: eroare trimisa clientului ca {"error": message} cu status-ul dat
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class GreenVisionService:
+    # params: db (DB), online (OnlineModel), points (PointIndex sau None), map_cache (MapCache sau None), workers (int)
+    # ce face: aceeasi logica ca aplicatia Tk (clasificare, statistici, recenzii, harta) expusa ca rute HTTP.
+    #          modelul e unul singur in memorie pt toate cererile; tot ce blocheaza (model, sqlite, folium)
+    #          ruleaza pe un pool de thread-uri, ca bucla asyncio sa ramana libera pt conexiuni
+    def __init__(self, db, online, points=None, map_cache=None, workers=8):
+        self.db = db
+        self.online = online
+        self.points = points
+        self.map_cache = map_cache
+        self.cache = PredictionCache(max_size=4096, model_file=online.model_file)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gv-http")
+        self._map_lock = threading.Lock()
+        self._map_html = (None, b"")
+        self.routes = {
+            ("GET", "/health"): self.health,
+            ("POST", "/classify"): self.classify,
+            ("POST", "/classify/batch"): self.classify_batch,
+            ("POST", "/feedback"): self.feedback,
+            ("GET", "/stats"): self.stats,
+            ("GET", "/reviews"): self.reviews,
+            ("POST", "/reviews"): self.add_review,
+            ("GET", "/points/nearest"): self.nearest,
+            ("GET", "/map"): self.map,
+        }
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    # params: method (str), path (str), query (dict), body (bytes)
+    # ce face: alege ruta si intoarce (status, content_type, bytes)
+    async def dispatch(self, method, path, query, body):
+        handler = self.routes.get((method, path.rstrip("/") or "/"))
+        if handler is None:
+            if any(p == (path.rstrip("/") or "/") for _, p in self.routes):
+                raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, f"metoda {method} nu e permisa pe {path}")
+            raise HttpError(HTTPStatus.NOT_FOUND, f"ruta necunoscuta: {path}")
+        result = await handler(query, body)
+        if isinstance(result, tuple):
+            return result
+        return HTTPStatus.OK, "application/json; charset=utf-8", _json_bytes(result)
+
+    async def health(self, query, body):
+        return {"status": "ok", "model_classes": self.online.classes, "points": len(self.points or ()),
+                "cache": self.cache.stats()}
+
+    # params: lat, lon (float), category (str), k (int)
+    # ce face: cele mai apropiate k puncte care accepta categoria, ca lista de dict-uri
+    def _nearest(self, lat, lon, category, k):
+        if self.points is None:
+            return []
+        return [{"name": p.name, "lat": p.lat, "lon": p.lon, "types": list(p.types),
+                 "distance_km": round(p.distance_km, 3)}
+                for p in self.points.nearest(lat, lon, k=k, category=category)]
+
+    # corp: {"text": str, "lat"?: float, "lon"?: float, "k"?: int}
+    # raspuns: {"label", "category", "confidence", "nearest"?}
+    async def classify(self, query, body):
+        data = _json_body(body)
+        text = _field(data, "text", str)
+        label, conf = await self._run(self.cache.predict_proba, text, self.online.bundle)
+        category = ML_TO_UI_CAT.get(label, label)
+        result = {"label": label, "category": category, "confidence": round(conf, 4)}
+        if "lat" in data and "lon" in data:
+            lat, lon = _number(data["lat"], "lat"), _number(data["lon"], "lon")
+            k = _int(data.get("k", 3), "k", 1, 50)
+            result["nearest"] = await self._run(self._nearest, lat, lon, category, k)
+        return result
+
+    # corp: {"texts": [str], "top_k"?: int}
+    # raspuns: {"results": [[{"label", "category", "confidence"}...]]} in ordinea textelor
+    async def classify_batch(self, query, body):
+        data = _json_body(body)
+        texts = _field(data, "texts", list)
+        if len(texts) > MAX_BATCH:
+            raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"maxim {MAX_BATCH} texte pe cerere")
+        if not all(isinstance(t, str) for t in texts):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "'texts' trebuie sa fie o lista de string-uri")
+        top_k = _int(data.get("top_k", 1), "top_k", 1, 20)
+
+        def score():
+            clean = [normalize_text(t) for t in texts]
+            return list(predict_proba_batch(clean, model_bundle=self.online.bundle, top_k=top_k))
+
+        rows = await self._run(score)
+        return {"results": [[{"label": lab, "category": ML_TO_UI_CAT.get(lab, lab), "confidence": round(p, 4)}
+                             for lab, p in row] for row in rows]}
+
+    # corp: {"text": str, "predicted": str, "label": str}
+    # ce face: salveaza confirmarea/corectura (ca in tab-ul AI) si invata din ea in fundal
+    async def feedback(self, query, body):
+        data = _json_body(body)
+        text, predicted, label = (_field(data, name, str) for name in ("text", "predicted", "label"))
+        await self._run(self.db.add_ai_feedback, text, predicted, label)
+
+        def learn():
+            self.online.learn(self.db.get_ai_feedback(after_id=self.online.applied_id))
+            self.online.save()
+
+        self.executor.submit(learn)
+        return HTTPStatus.ACCEPTED, "application/json; charset=utf-8", _json_bytes({"status": "accepted"})
+
+    async def stats(self, query, body):
+        def read():
+            best, avg, count = self.db.quiz_stats()
+            return {"stars": self.db.get_stars(),
+                    "quiz": {"best": best, "avg": avg, "count": count},
+                    "recycle_by_category": dict(self.db.recycle_by_category())}
+        return await self._run(read)
+
+    # query: before_id (int, optional), limit (int, implicit 50, maxim 200)
+    async def reviews(self, query, body):
+        before = query.get("before_id")
+        before = _int(before, "before_id") if before is not None else None
+        limit = _int(query.get("limit", 50), "limit", 1, 200)
+        rows = await self._run(self.db.get_reviews_page, before, limit)
+        return {"reviews": [{"id": i, "nickname": n, "rating": r, "comment": c, "created_at": t}
+                            for i, n, r, c, t in rows]}
+
+    # corp: {"nickname": str, "rating": 1..5, "comment": str}
+    async def add_review(self, query, body):
+        data = _json_body(body)
+        nickname = _field(data, "nickname", str).strip() or "Anonim"
+        rating = _int(data.get("rating"), "rating", 1, 5)
+        comment = _field(data, "comment", str)
+        try:
+            await self._run(self.db.add_review, nickname, rating, comment)
+        except sqlite3.IntegrityError as e:
+            raise HttpError(HTTPStatus.BAD_REQUEST, f"recenzie invalida: {e}")
+        return HTTPStatus.CREATED, "application/json; charset=utf-8", _json_bytes({"status": "created"})
+
+    # query: lat, lon (float), category (optional, ex "Hârtie"), k (int, implicit 3)
+    async def nearest(self, query, body):
+        if "lat" not in query or "lon" not in query:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "lipsesc parametrii 'lat' si 'lon'")
+        lat, lon = _number(query["lat"], "lat"), _number(query["lon"], "lon")
+        k = _int(query.get("k", 3), "k", 1, 50)
+        return {"points": await self._run(self._nearest, lat, lon, query.get("category") or None, k)}
+
+    # ce face: html-ul hartii (o singura randare per versiune a punctelor, tinut si in memorie);
+    #          filtrul se alege in pagina sau cu #filtru=<categorie> in URL
+    async def map(self, query, body):
+        if self.map_cache is None:
+            raise HttpError(HTTPStatus.SERVICE_UNAVAILABLE, "folium nu este instalat (pip install folium)")
+
+        def load():
+            with self._map_lock:
+                path = self.map_cache.get() or self.map_cache.render()
+                if self._map_html[0] != path:
+                    with open(path, "rb") as f:
+                        self._map_html = (path, f.read())
+                return self._map_html[1]
+
+        return HTTPStatus.OK, "text/html; charset=utf-8", await self._run(load)
+
+    # params: none
+    # ce face: opreste pool-ul de thread-uri si inchide baza de date (scrierile ramase se comit)
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.online.save()
+        self.db.close()
+
+
+def _json_bytes(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _json_body(body):
+    try:
+        data = json.loads(body.decode("utf-8") or "null")
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise HttpError(HTTPStatus.BAD_REQUEST, f"JSON invalid: {e}")
+    if not isinstance(data, dict):
+        raise HttpError(HTTPStatus.BAD_REQUEST, "corpul trebuie sa fie un obiect JSON")
+    return data
+
+
+def _field(data, name, kind):
+    value = data.get(name)
+    if not isinstance(value, kind):
+        raise HttpError(HTTPStatus.BAD_REQUEST, f"campul '{name}' lipseste sau are alt tip ({kind.__name__})")
+    return value
+
+
+def _number(value, name):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise HttpError(HTTPStatus.BAD_REQUEST, f"'{name}' trebuie sa fie un numar")
+
+
+def _int(value, name, lo=None, hi=None):
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise HttpError(HTTPStatus.BAD_REQUEST, f"'{name}' trebuie sa fie un numar intreg")
+    if (lo is not None and value < lo) or (hi is not None and value > hi):
+        raise HttpError(HTTPStatus.BAD_REQUEST, f"'{name}' trebuie sa fie intre {lo} si {hi}")
+    return value
+
+
+# params: reader (StreamReader)
+# ce face: citeste o cerere HTTP/1.1 -> (method, target, version, headers, body) sau None la conexiune inchisa
+async def _read_request(reader):
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, version = line.decode("latin-1").split()
+    except ValueError:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "linie de cerere invalida")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        if len(headers) >= MAX_HEADERS:
+            raise HttpError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "prea multe header-e")
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if headers.get("transfer-encoding", "identity").lower() != "identity":
+        # corpul chunked nu e citit; daca l-am ignora, bytes-ii lui ar fi luati drept cererea urmatoare.
+        # eroarea vine inainte sa stim keep-alive, deci conexiunea se inchide dupa raspuns
+        raise HttpError(HTTPStatus.LENGTH_REQUIRED, "Transfer-Encoding nu e suportat, trimite Content-Length")
+    length = _int(headers.get("content-length", 0), "content-length", 0)
+    if length > MAX_BODY:
+        raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"corp prea mare (maxim {MAX_BODY} bytes)")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target, version, headers, body
+
+
+def _response(status, content_type, payload, keep_alive, extra=()):
+    status = HTTPStatus(status)
+    head = [f"HTTP/1.1 {status.value} {status.phrase}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(payload)}",
+            "Access-Control-Allow-Origin: *",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}", *extra]
+    return ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + payload
+
+
+# params: service (GreenVisionService)
+# ce face: handler-ul de conexiune pt asyncio.start_server (keep-alive, mai multe cereri pe aceeasi conexiune)
+def connection_handler(service):
+    async def handle(reader, writer):
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await asyncio.wait_for(_read_request(reader), KEEPALIVE_TIMEOUT)
+                    if request is None:
+                        break
+                    method, target, version, headers, body = request
+                    conn = headers.get("connection", "").lower()
+                    keep_alive = conn == "keep-alive" if version == "HTTP/1.0" else conn != "close"
+                    if method == "OPTIONS":
+                        # preflight CORS pt un front-end web care trimite JSON
+                        writer.write(_response(HTTPStatus.NO_CONTENT, "text/plain", b"", keep_alive,
+                                               ("Access-Control-Allow-Methods: GET, POST, OPTIONS",
+                                                "Access-Control-Allow-Headers: Content-Type")))
+                    else:
+                        url = urlsplit(target)
+                        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                        status, ctype, payload = await service.dispatch(method, url.path, query, body)
+                        writer.write(_response(status, ctype, payload, keep_alive))
+                except HttpError as e:
+                    writer.write(_response(e.status, "application/json; charset=utf-8",
+                                           _json_bytes({"error": e.message}), keep_alive))
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+                    break
+                except Exception as e:
+                    traceback.print_exc(file=sys.stderr)
+                    writer.write(_response(HTTPStatus.INTERNAL_SERVER_ERROR, "application/json; charset=utf-8",
+                                           _json_bytes({"error": f"eroare interna: {type(e).__name__}"}), False))
+                    keep_alive = False
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            pass  # clientul a inchis conexiunea / serverul se opreste
+        finally:
+            writer.close()
+    return handle
+
+
+# params: db_path (str), workers (int), model_file (str)
+# ce face: construieste serviciul: db (pool sqlite), modelul online (o singura data), indexul de puncte, harta
+def build_service(db_path=DB_PATH, workers=8, model_file=ONLINE_MODEL_FILE):
+    db = DB(db_path)
+    online = load_online_model(db, model_file=model_file)
+    return GreenVisionService(db, online, points=PointIndex.from_file(),
+                              map_cache=MapCache() if FOLIUM_OK else None, workers=workers)
+
+
+async def serve(service, host, port):
+    server = await asyncio.start_server(connection_handler(service), host, port, backlog=1024)
+    addrs = ", ".join(str(s.getsockname()) for s in server.sockets)
+    print(f" GreenVision API pe {addrs}")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    # params: argv (list[str] sau None)
+    # ce face: python server.py [--host 127.0.0.1] [--port 8765] [--db greenvision.db] [--workers 8]
+    parser = argparse.ArgumentParser(description="GreenVision - serviciu HTTP fara interfata grafica")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--db", default=DB_PATH, help="baza de date SQLite (implicit greenvision.db)")
+    parser.add_argument("--workers", type=int, default=8, help="thread-uri pt model/db/harta")
+    args = parser.parse_args(argv)
+
+    service = build_service(args.db, workers=args.workers)
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+import os #variabila de mediu GREENVISION_STARTUP_TIMING
+import sys #sys.modules (ce module grele sunt deja importate) + argv
+import time #perf_counter pt timpii de pornire
+import builtins #__import__ inlocuit temporar pt profilul de importuri (pana apare UI-ul)
+import threading #fiecare thread are propria stiva de importuri
+
+# momentul zero = primul import al modulului (app.py il importa primul)
+T0 = time.perf_counter()
+# modulele grele pe care nu vrem sa le vedem importate inainte sa apara fereastra
+HEAVY_MODULES = ("sklearn", "scipy", "joblib", "matplotlib", "folium")
+
+MARKS = []
+# profilul de importuri (ca python -X importtime): (nume, ms proprii, ms cumulat, adancime, thread)
+IMPORTS = []
+_stacks = threading.local()
+_original_import = builtins.__import__
+
+
+# params: name (str)
+# ce face: noteaza un moment din pornire (ms de la T0) + ce module grele erau deja incarcate atunci
+def mark(name):
+    loaded = [m for m in HEAVY_MODULES if m in sys.modules]
+    MARKS.append((name, (time.perf_counter() - T0) * 1000, loaded))
+
+
+# params: none
+# ce face: true daca raportul de pornire a fost cerut (--startup-timing sau GREENVISION_STARTUP_TIMING=1)
+def enabled():
+    return "--startup-timing" in sys.argv or bool(os.environ.get("GREENVISION_STARTUP_TIMING"))
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    # importurile relative si modulele deja incarcate nu costa nimic, merg direct
+    if level or name in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+    stack = getattr(_stacks, "stack", None)
+    if stack is None:
+        stack = _stacks.stack = []
+    stack.append(0.0)
+    t = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        cumulative = time.perf_counter() - t
+        children = stack.pop()
+        if stack:
+            stack[-1] += cumulative
+        IMPORTS.append((name, (cumulative - children) * 1000, cumulative * 1000, len(stack),
+                        threading.current_thread().name))
+
+
+# params: none
+# ce face: porneste profilul de importuri (timp propriu + cumulat per modul, pe fiecare thread)
+def profile_imports():
+    builtins.__import__ = _timed_import
+
+
+# params: none
+# ce face: pune la loc __import__-ul original; dupa ce apare fereastra nu mai masuram (fiecare import ar plati hook-ul)
+def stop_profiling():
+    if builtins.__import__ is _timed_import:
+        builtins.__import__ = _original_import
+
+
+# params: top=20 (int)
+# ce face: cele mai scumpe importuri (dupa timpul cumulat), in formatul lui -X importtime, cu thread-ul pe care au rulat
+def import_report(top=20):
+    lines = [" Importuri (ms)       propriu |  cumulat | modul"]
+    for name, own, cumulative, depth, thread in sorted(IMPORTS, key=lambda r: -r[2])[:top]:
+        where = "" if thread == "MainThread" else f"   [{thread}]"
+        lines.append(f"  import time: {own:9.1f} | {cumulative:8.1f} | {'  ' * depth}{name}{where}")
+    return "\n".join(lines)
+
+
+# params: none
+# ce face: textul raportului: fiecare moment, cand a aparut si ce module grele erau importate (+ profilul de importuri)
+def report():
+    lines = [" Pornire GreenVision (ms de la primul import):"]
+    for name, ms, loaded in MARKS:
+        heavy = ", ".join(loaded) if loaded else "-"
+        lines.append(f"  {ms:9.1f}  {name:<28} module grele: {heavy}")
+    if IMPORTS:
+        lines.append(import_report())
+    return "\n".join(lines)
+
+
+if enabled():
+    profile_imports()
@@ -0,0 +1,78 @@
+import pytest
+from PIL import Image
+
+import assets_cache
+from assets_cache import ImageCache, zoom_sizes
+
+
+@pytest.fixture
+def images(tmp_path):
+    paths = []
+    for i, color in enumerate(("red", "green", "blue")):
+        path = str(tmp_path / f"img{i}.png")
+        Image.new("RGB", (64, 48), color).save(path)
+        paths.append(path)
+    return paths
+
+
+@pytest.fixture
+def opens(monkeypatch):
+    # numara decodarile (Image.open) ca sa se vada ce vine din cache
+    calls = []
+    real_open = Image.open
+
+    def counting_open(path, *args, **kwargs):
+        calls.append(path)
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr(assets_cache.Image, "open", counting_open)
+    return calls
+
+
+def test_resized_is_lru(images, opens):
+    cache = ImageCache(max_images=2)
+    a, b = images[:2]
+    first = cache.resized(a, (10, 10))
+    cache.resized(a, (20, 20))
+    assert cache.resized(a, (10, 10)) is first  # folosit recent: (20, 20) e acum cel mai vechi
+    cache.resized(b, (10, 10))
+    assert cache.ready(a, (20, 20)) is None
+    assert cache.ready(a, (10, 10)) is first and cache.ready(b, (10, 10)) is not None
+    assert cache.stats()["resized"] == 2
+    assert opens == [a, b]
+
+
+def test_decoded_images_are_bounded(images, opens):
+    cache = ImageCache(max_decoded=2)
+    a, b, c = images
+    for path, size in ((a, (8, 8)), (b, (8, 8)), (a, (4, 4)), (c, (8, 8))):
+        cache.resized(path, size)
+    assert cache.stats()["decoded"] == 2
+    cache.resized(a, (16, 16))  # a a fost decodat din nou recent, deci b a iesit la venirea lui c
+    assert opens == [a, b, c]
+    cache.resized(b, (16, 16))
+    assert opens == [a, b, c, b]
+    cache.resized(b, (8, 8))  # marimea veche e inca in cache, fara decodare
+    assert opens == [a, b, c, b] and cache.stats()["decoded"] == 2
+
+
+def test_ready_before_and_after_prefetch(images):
+    cache = ImageCache()
+    sizes = [(32, 24), (16, 12)]
+    assert all(cache.ready(images[0], s) is None for s in sizes)
+    cache.prefetch(images[0], sizes).result()
+    assert [cache.ready(images[0], s).size for s in sizes] == sizes
+    assert cache.ready(images[0], sizes[0], Image.BILINEAR) is None  # alt filtru = alta intrare
+
+
+def test_zoom_frames_use_bilinear_keys(images):
+    cache = ImageCache()
+    sizes = zoom_sizes(start=0.9, step=0.03, base=100)
+    assert sizes == [93, 96, 99, 102]
+    path = images[0]
+    cache.zoom_frames(path, sizes).result()
+    for s in sizes:
+        assert cache.ready(path, (s, s), Image.BILINEAR).size == (s, s)
+    top = max(sizes)
+    # cadrul cel mai mare e chiar varianta LANCZOS, restul se fac din ea
+    assert cache.ready(path, (top, top), Image.BILINEAR) is cache.ready(path, (top, top))
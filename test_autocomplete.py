@@ -0,0 +1,52 @@
+from autocomplete import QUERY_WEIGHT, Autocomplete
+from text_index import TextIndex, build_index
+
+
+def _index(tmp_path):
+    path = str(tmp_path / "index.npz")
+    build_index([("sticla de plastic", "Plastic")] * 2 + [("doza aluminiu", "Metal"), ("folie aluminiu", "Metal")],
+                path)
+    return TextIndex(path)
+
+
+def test_history_matches_word_starts():
+    auto = Autocomplete()
+    auto.load(None, [("Doza  Aluminiu", 2), ("cutie de carton mare", 1)])
+    assert [c.text for c in auto.complete("alu")] == ["doza aluminiu"]
+    assert [c.text for c in auto.complete("doza")] == ["doza aluminiu"]
+    assert [c.text for c in auto.complete("carton m")] == ["cutie de carton mare"]
+    assert auto.complete("luminiu") == [] and auto.complete("a") == []
+
+
+def test_history_counts_add_up(tmp_path):
+    auto = Autocomplete()
+    auto.load(_index(tmp_path), [("folie aluminiu", 1)])
+    auto.add_query("folie aluminiu")
+    auto.add_query("aluminiu si alama")
+    found = {c.text: c.count for c in auto.complete("al", k=10)}
+    # fiecare cerere apare o singura data, chiar daca prefixul se potriveste la mai multe cuvinte
+    assert found == {"folie aluminiu": 1 + 2 * QUERY_WEIGHT, "aluminiu si alama": QUERY_WEIGHT, "doza aluminiu": 1}
+    assert auto.complete("alu", k=1)[0].text == "folie aluminiu"
+
+
+def test_corpus_without_history(tmp_path):
+    auto = Autocomplete()
+    auto.load(_index(tmp_path))
+    assert [c.text for c in auto.complete("st")] == ["sticla de plastic"]
+    assert [c.text for c in auto.complete("plas")] == ["sticla de plastic"]
+
+
+def test_live_hint_matches_final_prediction(tmp_path):
+    # partea fara Tk din tab-ul AI (ca in bench.py): hint-ul live si rezultatul de la Enter trebuie sa coincida
+    from types import SimpleNamespace
+
+    from app import GreenVision
+    from ml_model import DATA_FILE, PredictionCache
+    from ml_online import OnlineModel
+
+    online = OnlineModel.bootstrap(data_file=DATA_FILE, model_file=str(tmp_path / "online.pkl"))
+    cache = PredictionCache(model_file=str(tmp_path / "online.pkl"))
+    app = SimpleNamespace(autocomplete=Autocomplete())
+    for text in ("sticlă", "hârtie", "borcan de sticlă", "pungă", "Doză  Aluminiu"):
+        _, live = GreenVision._ai_complete_compute(app, text, online.bundle)
+        assert live == cache.predict_proba(text, online.bundle)
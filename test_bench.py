@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+import bench
+
+TINY = {"quiz": 200, "reviews": 100, "recycle": 500, "points": 300, "corpus": 300, "batch": 50}
+
+
+@pytest.fixture
+def tiny(monkeypatch, tmp_path):
+    monkeypatch.setitem(bench.SCALES, "tiny", TINY)
+    return tmp_path
+
+
+def test_bench_runs_and_writes_results(tiny):
+    out = tiny / "results.json"
+    assert bench.main(["--scale", "tiny", "--quick", "--only", "db,ml,map,ui", "--data-dir", str(tiny),
+                       "--out", str(out), "--save-baseline", str(tiny / "baseline.json")]) == 0
+    report = json.loads(out.read_text(encoding="utf-8"))
+    assert report["meta"]["sizes"] == TINY
+    results = report["results"]
+    for name in ("db.quiz_stats", "ui.read_stats", "ml.predict_proba_compiled", "ml.online_predict_proba_compiled",
+                 "ml.similar", "ml.complete", "map.nearest"):
+        assert results[name]["median_ms"] >= 0
+    assert results["ml.predict_proba_batch"]["items_per_s"] > 0
+    # datele generate se refolosesc, iar fata de propriul baseline nu e nicio regresie (sau e doar zgomot)
+    assert bench.main(["--scale", "tiny", "--quick", "--only", "db", "--data-dir", str(tiny),
+                       "--out", str(out), "--baseline", str(tiny / "baseline.json"), "--threshold", "100"]) == 0
+
+
+def test_compare_flags_regressions():
+    baseline = {"results": {"a": {"median_ms": 1.0}, "b": {"median_ms": 1.0}, "c": {"median_ms": 0.01}}}
+    results = {"a": {"median_ms": 2.0}, "b": {"median_ms": 0.5}, "c": {"median_ms": 0.03}, "d": {"median_ms": 1.0}}
+    rows, regressions = bench.compare(results, baseline)
+    assert regressions == ["a"]
+    assert {name: status for name, *_, status in rows} == {"a": "REGRESIE", "b": "mai rapid", "c": "ok", "d": "nou"}
+
+
+def test_unknown_group_is_rejected(tiny):
+    with pytest.raises(SystemExit):
+        bench.main(["--scale", "tiny", "--only", "db,gpu", "--data-dir", str(tiny)])
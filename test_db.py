@@ -0,0 +1,221 @@
+import time
+import sqlite3
+import threading
+import datetime as dt
+
+import pytest
+
+from db import (DB, MIGRATIONS, QUIZ_DAILY_FROM_RAW, QUIZ_SUMMARY_FROM_RAW, RECYCLE_DAILY_FROM_RAW, SCHEMA_VERSION,
+                SQLitePool)
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = SQLitePool(str(tmp_path / "pool.db"), batch_window=0.01)
+    pool.write("schema", [("CREATE TABLE t (x INTEGER NOT NULL CHECK (x >= 0))", ())], wait=True)
+    yield pool
+    pool.close()
+
+
+def _values(pool):
+    # citirile nu asteapta coada writer-ului: testele vor sa vada tot ce au scris
+    pool.flush()
+    return [x for (x,) in pool.read("values", "SELECT x FROM t ORDER BY x")]
+
+
+def test_flush_makes_queued_writes_visible(pool):
+    for i in range(50):
+        pool.write("insert", [("INSERT INTO t VALUES (?)", (i,))])
+    assert _values(pool) == list(range(50))
+
+
+def test_read_does_not_wait_for_queued_writes(tmp_path):
+    pool = SQLitePool(str(tmp_path / "pool.db"), batch_window=2.0)
+    try:
+        pool.write("schema", [("CREATE TABLE t (x INTEGER)", ())], wait=True)
+        start = time.perf_counter()
+        job = pool.write("insert", [("INSERT INTO t VALUES (?)", (1,))])
+        assert pool.read("values", "SELECT x FROM t") == []
+        assert time.perf_counter() - start < 1.0 and not job.done.is_set()
+        # citirea nu pune marcaj in coada, deci batch-ul ramane deschis pt scrierile de dupa
+        pool.write("insert", [("INSERT INTO t VALUES (?)", (2,))])
+        pool.flush()
+        assert sorted(pool.read("values", "SELECT x FROM t")) == [(1,), (2,)]
+    finally:
+        pool.close()
+
+
+def test_failed_job_does_not_spoil_its_batch(pool):
+    pool.write("ok", [("INSERT INTO t VALUES (?)", (1,))])
+    bad = pool.write("bad", [("INSERT INTO t VALUES (?)", (-1,))])
+    pool.write("ok", [("INSERT INTO t VALUES (?)", (2,))])
+    assert _values(pool) == [1, 2]
+    assert isinstance(bad.error, sqlite3.IntegrityError)
+
+
+def test_writer_survives_non_sqlite_errors(pool):
+    # un int peste 64 de biti nu e sqlite3.Error, ci OverflowError; writer-ul trebuie sa ramana viu
+    with pytest.raises(OverflowError):
+        pool.write("overflow", [("INSERT INTO t VALUES (?)", (2 ** 70,))], wait=True)
+    job = pool.write("overflow", [("INSERT INTO t VALUES (?)", (2 ** 70,))])
+    pool.write("ok", [("INSERT INTO t VALUES (?)", (3,))], wait=True)
+    assert isinstance(job.error, OverflowError)
+    assert _values(pool) == [3]
+
+
+def test_concurrent_writers(pool):
+    def work(base):
+        for i in range(100):
+            pool.write("insert", [("INSERT INTO t VALUES (?)", (base + i,))], wait=(i % 25 == 0))
+
+    threads = [threading.Thread(target=work, args=(n * 1000,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(_values(pool)) == 400
+    assert pool.latency_report()["insert"]["count"] == 400
+
+
+def test_close_commits_pending_writes(tmp_path):
+    path = str(tmp_path / "pool.db")
+    pool = SQLitePool(path, batch_window=1.0)
+    pool.write("schema", [("CREATE TABLE t (x INTEGER)", ())])
+    pool.write("insert", [("INSERT INTO t VALUES (?)", (7,))])
+    pool.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        pool.write("insert", [("INSERT INTO t VALUES (?)", (8,))])
+    con = sqlite3.connect(path)
+    assert con.execute("SELECT x FROM t").fetchall() == [(7,)]
+    con.close()
+
+
+# schema si formatul datelor din versiunea de dinainte de migratii (created_at = datetime.now().isoformat())
+BASELINE_SCHEMA = [
+    "CREATE TABLE stats(id INTEGER PRIMARY KEY CHECK (id=1), stars INTEGER DEFAULT 0)",
+    "INSERT INTO stats(id, stars) VALUES (1, 7)",
+    "CREATE TABLE recycle(category TEXT, created_at TEXT)",
+    "CREATE TABLE quiz(score INT, total INT, created_at TEXT)",
+    "CREATE TABLE reviews(id INTEGER PRIMARY KEY AUTOINCREMENT, nickname TEXT NOT NULL, "
+    "rating INTEGER NOT NULL CHECK(rating BETWEEN 1 AND 5), comment TEXT NOT NULL, created_at TEXT NOT NULL)",
+]
+# ora locala, cu microsecunde; cateva chiar langa miezul noptii (ziua nu are voie sa se mute la migrare)
+RECYCLE_ROWS = [("Plastic", "2024-03-01T23:59:59.999999"), ("Plastic", "2024-03-02T00:00:00.000001"),
+                ("Hârtie", "2024-03-02T12:30:15.123456"), ("Sticlă", "2024-07-15T00:10:00.500000"),
+                ("Plastic", "2024-07-15T23:50:00.250000")]
+QUIZ_ROWS = [(3, 5, "2024-03-01T23:59:59.999999"), (5, 5, "2024-03-02T00:00:00.000001"),
+             (0, 5, "2024-03-02T08:00:00.654321"), (4, 0, "2024-03-03T10:00:00.000000"),
+             (2, 4, "2024-07-15T00:00:30.100000")]
+
+
+@pytest.fixture
+def bucharest_tz(monkeypatch):
+    # ziua "localtime" din SQLite si datetime.timestamp() folosesc amandoua TZ-ul procesului
+    monkeypatch.setenv("TZ", "Europe/Bucharest")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def _baseline_db(path):
+    con = sqlite3.connect(path)
+    for sql in BASELINE_SCHEMA:
+        con.execute(sql)
+    con.executemany("INSERT INTO recycle VALUES (?, ?)", RECYCLE_ROWS)
+    con.executemany("INSERT INTO quiz VALUES (?, ?, ?)", QUIZ_ROWS)
+    con.execute("INSERT INTO reviews(nickname, rating, comment, created_at) VALUES ('Ana', 5, 'super', ?)",
+                ("2024-03-02T10:00:00.000001",))
+    con.commit()
+    con.close()
+
+
+def test_migrations_from_baseline_schema(tmp_path, bucharest_tz):
+    path = str(tmp_path / "old.db")
+    _baseline_db(path)
+    db = DB(path)
+    try:
+        assert db.schema_version() == SCHEMA_VERSION
+        read = db.pool.read
+
+        # timestamp-urile ISO (ora locala) devin epoch, fara sa piarda secunde sau sa schimbe ordinea
+        expected = [int(dt.datetime.fromisoformat(t).timestamp()) for _, t in RECYCLE_ROWS]
+        assert [t for (t,) in read("t", "SELECT created_at FROM recycle ORDER BY id")] == expected
+        expected = [int(dt.datetime.fromisoformat(t).timestamp()) for _, _, t in QUIZ_ROWS]
+        assert [t for (t,) in read("t", "SELECT created_at FROM quiz ORDER BY id")] == expected
+
+        # rollup-urile = ce rezulta din tabelele brute, iar zilele sunt cele locale din textul original
+        assert read("t", "SELECT count, best, sum_ratio FROM quiz_summary", one=True) == \
+            read("t", QUIZ_SUMMARY_FROM_RAW, one=True)
+        assert sorted(read("t", "SELECT day, count, best, sum_ratio FROM quiz_daily")) == \
+            sorted(read("t", QUIZ_DAILY_FROM_RAW))
+        assert sorted(read("t", "SELECT day, category, n FROM recycle_daily")) == sorted(read("t", RECYCLE_DAILY_FROM_RAW))
+        assert db.verify_quiz_summary() == []
+        assert [(d, c) for d, c, _, _ in db.quiz_daily_stats()] == [("2024-03-01", 1), ("2024-03-02", 2),
+                                                                      ("2024-07-15", 1)]
+        assert db.recycle_by_day() == [("2024-03-01", 1), ("2024-03-02", 2), ("2024-07-15", 2)]
+        assert db.recycle_by_category() == [("Plastic", 3), ("Hârtie", 1), ("Sticlă", 1)]
+        assert db.quiz_stats() == (5, pytest.approx((3 / 5 + 1 + 0 + 2 / 4) / 4 * 100), 4)
+
+        # datele care nu se migreaza raman neatinse, iar tabelele noi sunt goale
+        assert db.get_stars() == 7
+        assert [(n, r) for _, n, r, _, _ in db.get_reviews_page(None, 10)] == [("Ana", 5)]
+        assert db.last_ai_feedback_id() == 0 and db.top_ai_queries() == []
+    finally:
+        db.close()
+
+    # a doua deschidere nu mai ruleaza nimic
+    db = DB(path)
+    try:
+        assert db.schema_version() == SCHEMA_VERSION
+        assert db.recycle_count() == len(RECYCLE_ROWS)
+    finally:
+        db.close()
+
+
+def test_new_writes_keep_rollups_in_sync(tmp_path, bucharest_tz):
+    path = str(tmp_path / "old.db")
+    _baseline_db(path)
+    db = DB(path)
+    try:
+        for score, total in ((1, 5), (5, 5), (2, 0)):
+            db.log_quiz(score, total)
+        for cat in ("Metal", "Plastic", "Metal"):
+            db.log_recycle(cat)
+        read = db.pool.read
+        assert db.verify_quiz_summary() == []
+        assert sorted(read("t", "SELECT day, category, n FROM recycle_daily")) == sorted(read("t", RECYCLE_DAILY_FROM_RAW))
+    finally:
+        db.close()
+
+
+def test_ai_queries_seeded_from_feedback(tmp_path):
+    path = str(tmp_path / "v4.db")
+    _baseline_db(path)
+    # baza la versiunea 4 cu feedback dat inainte de tabela ai_queries
+    con = sqlite3.connect(path)
+    for version, statements in MIGRATIONS[:4]:
+        for sql in statements:
+            con.execute(sql)
+        con.execute(f"PRAGMA user_version = {version}")
+    con.executemany("INSERT INTO ai_feedback(text, predicted, label, created_at) VALUES (?, 'x', 'y', 1)",
+                    [(" Doza ",), ("doza",), ("Sticla",)])
+    con.commit()
+    con.close()
+
+    db = DB(path)
+    try:
+        assert db.schema_version() == SCHEMA_VERSION
+        assert sorted(db.top_ai_queries()) == [("doza", 2), ("sticla", 1)]
+    finally:
+        db.close()
+
+
+def test_ai_feedback_without_wait_is_visible_after_flush(tmp_path):
+    db = DB(str(tmp_path / "feedback.db"))
+    try:
+        db.add_ai_feedback("doza", "Metal", "Metal", wait=False)
+        db.flush()
+        assert [(text, label) for _, text, label in db.get_ai_feedback()] == [("doza", "Metal")]
+    finally:
+        db.close()
@@ -0,0 +1,88 @@
+import json
+import random
+
+import pytest
+
+from geo_index import PointIndex, haversine_km
+from point_store import PointStore, compile_points, open_store
+
+TYPES = ["Plastic", "Hârtie", "Sticlă", "Metal", "Baterii"]
+
+
+def _points(seed, n):
+    rnd = random.Random(seed)
+    points = []
+    for i in range(n):
+        # cateva clustere dese (ca in oras) + puncte imprastiate, ca celulele grilei sa fie inegale
+        if rnd.random() < 0.7:
+            lat, lon = 45.75 + rnd.gauss(0, 0.01), 21.23 + rnd.gauss(0, 0.015)
+        else:
+            lat, lon = rnd.uniform(44.0, 47.5), rnd.uniform(20.0, 26.0)
+        points.append({"name": f"punct {i}", "lat": lat, "lon": lon,
+                       "types": rnd.sample(TYPES, rnd.randint(1, 3))})
+    return points
+
+
+def _brute_force(points, lat, lon, k, category=None):
+    found = sorted((haversine_km(lat, lon, p["lat"], p["lon"]), p["name"]) for p in points
+                   if category is None or category in p["types"])
+    return found[:k]
+
+
+@pytest.fixture
+def store(tmp_path):
+    points = _points(7, 400)
+    path = str(tmp_path / "points.bin")
+    compile_points(points, path)
+    store = PointStore(path)
+    yield store, points
+    store.close()
+
+
+@pytest.mark.parametrize("category", [None, "Plastic", "Baterii"])
+def test_nearest_matches_brute_force(store, category):
+    store, points = store
+    index = PointIndex(store)
+    rnd = random.Random(11)
+    # locatii in clustere, in zone rare si in afara grilei
+    queries = [(45.75, 21.23), (45.7592, 21.2276), (43.0, 19.0), (48.5, 27.0)]
+    queries += [(rnd.uniform(44.0, 47.5), rnd.uniform(20.0, 26.0)) for _ in range(30)]
+    for lat, lon in queries:
+        for k in (1, 3, 10):
+            got = [(r.distance_km, r.name) for r in index.nearest(lat, lon, k=k, category=category)]
+            expected = _brute_force(points, lat, lon, k, category)
+            assert [name for _, name in got] == [name for _, name in expected]
+            assert [d for d, _ in got] == pytest.approx([d for d, _ in expected], abs=1e-9)
+
+
+def test_nearest_returns_point_data(store):
+    store, points = store
+    index = PointIndex(store)
+    (hit,) = index.nearest(points[5]["lat"], points[5]["lon"], k=1)
+    assert hit.distance_km == pytest.approx(0.0, abs=1e-9)
+    assert (hit.name, hit.lat, hit.lon) == (points[5]["name"], points[5]["lat"], points[5]["lon"])
+    assert set(hit.types) == set(points[5]["types"])
+
+
+def test_edge_cases(store):
+    store, points = store
+    index = PointIndex(store)
+    assert index.nearest(45.75, 21.23, k=0) == []
+    assert index.nearest(45.75, 21.23, category="Nu exista") == []
+    assert len(index.nearest(45.75, 21.23, k=len(points) + 5)) == len(points)
+    assert index.categories() == sorted(TYPES)
+
+
+def test_open_store_recompiles_when_json_changes(tmp_path):
+    points_file = tmp_path / "points.json"
+    store_dir = str(tmp_path / "store")
+    points_file.write_text(json.dumps(_points(1, 20)), encoding="utf-8")
+    store = open_store(str(points_file), store_dir)
+    assert len(store) == 20
+    store.close()
+
+    points_file.write_text(json.dumps(_points(2, 25)), encoding="utf-8")
+    store = open_store(str(points_file), store_dir)
+    index = PointIndex(store)
+    assert len(index) == 25
+    index.store.close()
@@ -1,16 +1,12 @@
-import folium, json, os
+import folium, os
+from point_store import open_store
 
 COLLECT_JSON = "collect_points.json"
 MAP_HTML = "map_test.html"
 # param: none
-# incearca sa incarce punctele din JSON; daca nu merge, continua cu lista goala
+# incarca punctele din fisierul compilat (recompilat din JSON doar daca s-a schimbat); JSON stricat -> lista goala
 
-try:
-    with open(COLLECT_JSON, "r", encoding="utf-8") as f:
-        points = json.load(f)
-except Exception as e:
-    print(" Nu pot citi JSON:", e)
-    points = []
+points = open_store(COLLECT_JSON)
 
 print(f"Puncte încărcate: {len(points)}")
 # param: none
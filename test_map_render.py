@@ -0,0 +1,34 @@
+import re
+from urllib.parse import unquote
+
+import pytest
+
+from map_render import FOLIUM_OK, MapCache, filter_page
+
+
+def test_filter_page_redirects_with_fragment(tmp_path):
+    map_path = tmp_path / "map-1a2b3c4d5e6f7a8b.html"
+    map_path.write_text("<html></html>", encoding="utf-8")
+    page = filter_page(str(map_path), "Hârtie")
+    assert page == str(tmp_path / "open-map.html")
+    html = (tmp_path / "open-map.html").read_text(encoding="utf-8")
+    targets = re.findall(r'(map-1a2b3c4d5e6f7a8b\.html#filtru=[^"\s]*)"', html)
+    assert targets and all(unquote(t.split("#filtru=")[1]) == "Hârtie" for t in targets)
+    # a doua deschidere suprascrie filtrul
+    filter_page(str(map_path), "Toate")
+    assert "#filtru=Toate" in (tmp_path / "open-map.html").read_text(encoding="utf-8")
+
+
+@pytest.mark.skipif(not FOLIUM_OK, reason="folium nu este instalat")
+def test_cache_keeps_filter_page(tmp_path):
+    points = tmp_path / "points.json"
+    points.write_text('[{"name": "Retim", "lat": 45.75, "lon": 21.22, "types": ["Plastic"]}]', encoding="utf-8")
+    cache = MapCache(str(points), str(tmp_path / "cache"))
+    assert cache.get() is None
+    path = cache.render()
+    assert cache.get() == path
+    page = filter_page(path, "Plastic")
+    points.write_text('[{"name": "Retim", "lat": 45.76, "lon": 21.22, "types": ["Plastic"]}]', encoding="utf-8")
+    new_path = cache.render()
+    assert new_path != path and cache.get() == new_path
+    assert (tmp_path / "cache" / "open-map.html").exists() and page.endswith("open-map.html")
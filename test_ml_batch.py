@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from ml_model import (DATA_FILE, load_model, manifest_path, model_is_stale, predict_proba, predict_proba_batch,
+                      read_manifest, train_model)
+
+TEXTS = ["sticla de plastic", "ziar vechi", "baterie AA", "doza de aluminiu", "", "borcan de sticla"]
+
+
+@pytest.fixture
+def model_file(tmp_path):
+    path = str(tmp_path / "model.pkl")
+    train_model(data_file=DATA_FILE, model_file=path)
+    return path
+
+
+@pytest.mark.parametrize("kwargs", [{"top_k": 0}, {"top_k": -2}, {"chunk_size": 0}])
+def test_invalid_arguments_fail_immediately(model_file, kwargs):
+    with pytest.raises(ValueError):
+        predict_proba_batch(TEXTS, load_model(model_file), **kwargs)
+
+
+def test_batch_matches_single_predictions(model_file):
+    bundle = load_model(model_file)
+    rows = list(predict_proba_batch(TEXTS, bundle, top_k=3, chunk_size=4))
+    assert len(rows) == len(TEXTS)
+    for text, top in zip(TEXTS, rows):
+        label, conf = predict_proba(text, bundle)
+        assert top[0] == (str(label), pytest.approx(conf))
+        assert len(top) == 3 and [p for _, p in top] == sorted((p for _, p in top), reverse=True)
+
+
+def test_workers_retrain_stale_model(model_file):
+    manifest = read_manifest(model_file)
+    good = manifest["fingerprint"]
+    manifest["fingerprint"] = "vechi"
+    with open(manifest_path(model_file), "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    assert model_is_stale(model_file=model_file)
+
+    rows = list(predict_proba_batch(TEXTS, top_k=1, chunk_size=2, workers=2, model_file=model_file))
+    assert len(rows) == len(TEXTS)
+    assert read_manifest(model_file)["fingerprint"] == good
+    assert not model_is_stale(model_file=model_file)
+
+
+def test_missing_data_file_keeps_existing_model(model_file, tmp_path):
+    assert model_is_stale(model_file=model_file, data_file=str(tmp_path / "lipseste.json")) is False
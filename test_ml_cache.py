@@ -0,0 +1,37 @@
+from ml_model import DATA_FILE, PredictionCache
+from ml_online import OnlineModel
+
+
+def _online(tmp_path):
+    return OnlineModel.bootstrap(data_file=DATA_FILE, model_file=str(tmp_path / "online.pkl"))
+
+
+def test_repeated_queries_hit_cache(tmp_path):
+    online = _online(tmp_path)
+    cache = PredictionCache(model_file=str(tmp_path / "online.pkl"))
+    first = cache.predict_proba("Sticla de plastic", online.bundle)
+    assert cache.predict_proba("sticla de plastic", online.bundle) == first
+    assert cache.predict_proba("  STICLA   de plastic ", online.bundle) == first
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+
+
+def test_learning_invalidates_cache(tmp_path):
+    online = _online(tmp_path)
+    cache = PredictionCache(model_file=str(tmp_path / "online.pkl"))
+    before = online.bundle
+    cache.predict_proba("sticla de plastic", online.bundle)
+    assert online.learn([(1, "sticla de plastic", online.classes[0])]) == 1
+    assert online.bundle is not before
+    cache.predict_proba("sticla de plastic", online.bundle)
+    assert cache.stats()["misses"] == 2
+
+
+def test_lru_evicts_oldest(tmp_path):
+    online = _online(tmp_path)
+    cache = PredictionCache(max_size=2, model_file=str(tmp_path / "online.pkl"))
+    for text in ("doza", "hartie", "baterie"):
+        cache.predict_proba(text, online.bundle)
+    cache.predict_proba("doza", online.bundle)
+    stats = cache.stats()
+    assert stats["evictions"] == 2 and stats["size"] == 2 and stats["hits"] == 0
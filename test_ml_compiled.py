@@ -0,0 +1,94 @@
+import os
+import sys
+import json
+import random
+import subprocess
+
+import numpy as np
+import pytest
+
+from ml_model import DATA_FILE, load_model, normalize_text, train_model
+from ml_compiled import CompiledHashingVectorizer, compiled_path, load_compiled, murmurhash3_32, parity_check
+from ml_online import OnlineModel
+
+with open(DATA_FILE, "r", encoding="utf-8") as f:
+    TRAIN_TEXTS = [d["text"] for d in json.load(f)]
+# cuvinte care nu apar la antrenare, texte goale, diacritice, repetitii, cifre
+OOV_TEXTS = ["", "   ", "zzz qqq xyz", "telefon mobil vechi cu ecran spart", "ăîșțâ ŞŢ", "a b c d e f g h",
+             "sticla sticla sticla sticla", "123 456", "CUTIE de Carton MARE", "x" * 300]
+
+
+def test_murmurhash_matches_sklearn():
+    from sklearn.utils import murmurhash3_32 as reference
+
+    rng = random.Random(0)
+    keys = [""] + ["".join(rng.choice("abcăîș xyz0") for _ in range(rng.randint(1, 23))) for _ in range(2000)]
+    expected = [reference(k.encode("utf-8"), seed=0) for k in keys]
+    assert murmurhash3_32([k.encode("utf-8") for k in keys]).tolist() == expected
+
+
+def test_tfidf_parity(tmp_path):
+    model_file = str(tmp_path / "model.pkl")
+    train_model(data_file=DATA_FILE, model_file=model_file)
+    import joblib
+
+    reference = joblib.load(model_file)
+    compiled = load_model(model_file)
+    assert type(compiled[0]).__name__ == "CompiledNB"
+    assert parity_check(reference, compiled, TRAIN_TEXTS) == []
+    assert parity_check(reference, compiled, OOV_TEXTS) == []
+
+
+def test_online_parity_after_learning(tmp_path):
+    online = OnlineModel.bootstrap(data_file=DATA_FILE, model_file=str(tmp_path / "online.pkl"))
+    texts = [normalize_text(t) for t in TRAIN_TEXTS + OOV_TEXTS]
+    assert type(online.bundle[0]).__name__ == "CompiledNB"
+    assert parity_check((online.model, online.vectorizer), online.bundle, texts) == []
+
+    online.learn([(1, "telefon mobil vechi", online.classes[0]), (2, "zzz qqq", online.classes[-1])])
+    assert parity_check((online.model, online.vectorizer), online.bundle, texts) == []
+    online.save()
+    assert parity_check((online.model, online.vectorizer), load_compiled(compiled_path(online.model_file)),
+                        texts) == []
+
+
+@pytest.mark.parametrize("params", [
+    {"n_features": 2 ** 16, "alternate_sign": False, "norm": "l2", "ngram_range": (1, 2)},
+    {"n_features": 2 ** 10, "alternate_sign": True, "norm": "l1", "ngram_range": (1, 3)},
+    {"n_features": 2 ** 8, "alternate_sign": True, "norm": None, "ngram_range": (2, 2), "lowercase": False},
+])
+def test_hashing_vectorizer_matches_sklearn(params):
+    from sklearn.feature_extraction.text import HashingVectorizer
+
+    vectorizer = HashingVectorizer(**params)
+    # coloane identitate: fara renumerotarea compacta, ca sa comparam direct cu matricea sklearn
+    compiled = CompiledHashingVectorizer(np.arange(vectorizer.n_features, dtype=np.int32), vectorizer.n_features,
+                                         vectorizer.ngram_range, vectorizer.token_pattern, vectorizer.lowercase,
+                                         vectorizer.norm, vectorizer.alternate_sign)
+    texts = TRAIN_TEXTS + OOV_TEXTS
+    X = compiled.transform(texts)
+    actual = np.zeros((len(texts), vectorizer.n_features))
+    np.add.at(actual, (np.repeat(np.arange(len(texts)), np.diff(X.indptr)), X.indices), X.data)
+    np.testing.assert_allclose(actual, vectorizer.transform(texts).toarray(), atol=1e-12)
+
+
+def test_startup_loads_compiled_without_sklearn(tmp_path):
+    model_file = str(tmp_path / "online.pkl")
+    OnlineModel.bootstrap(data_file=DATA_FILE, model_file=model_file).save()
+    code = ("import sys; from ml_online import OnlineModel\n"
+            f"m = OnlineModel.load_or_bootstrap(model_file={model_file!r})\n"
+            "print(type(m.bundle[0]).__name__, [n for n in ('sklearn', 'scipy', 'joblib') if n in sys.modules])")
+    out = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.abspath(__file__)),
+                         capture_output=True, text=True, check=True).stdout.split()
+    assert out == ["CompiledNB", "[]"]
+
+
+def test_stale_compiled_online_model_is_ignored(tmp_path):
+    model_file = str(tmp_path / "online.pkl")
+    online = OnlineModel.bootstrap(data_file=DATA_FILE, model_file=model_file)
+    online.save()
+    assert OnlineModel.load_compiled(online.data_sha256, model_file) is not None
+    assert OnlineModel.load_compiled("alt-set-de-date", model_file) is None
+    with open(model_file, "ab") as f:
+        f.write(b"0")
+    assert OnlineModel.load_compiled(online.data_sha256, model_file) is None
@@ -0,0 +1,66 @@
+import json
+
+import ml_eval
+from ml_model import DATA_FILE
+from ml_online import ONLINE_PIPELINE, OnlineModel
+
+
+def _result(accuracy, proba, single_ms=1.0):
+    return {"accuracy": accuracy, "f1_macro": accuracy, "single_ms": single_ms, "batch_us_per_item": 10.0,
+            "size_kb": 100.0, "proba": proba}
+
+
+def test_select_respects_budget_and_proba():
+    results = {"svm": _result(0.9, False), "logreg": _result(0.8, True, 5.0), "nb": _result(0.7, True, 0.2)}
+    assert ml_eval.select(results) == "svm"
+    assert ml_eval.select(results, require_proba=True) == "logreg"
+    assert ml_eval.select(results, max_single_ms=1.0, require_proba=True) == "nb"
+    assert ml_eval.select(results, max_single_ms=0.1) is None
+
+
+def test_online_candidates_can_learn_incrementally():
+    for name, pipeline in ml_eval.candidates(target="online").items():
+        assert pipeline["hashing"] and pipeline["classifier"] in ("nb", "sgd"), name
+        assert "sublinear_tf" not in pipeline["vectorizer"]
+
+
+def test_save_writes_the_online_model_with_proba_by_default(tmp_path):
+    model_file = str(tmp_path / "online.pkl")
+    out = str(tmp_path / "eval.json")
+    # svm (hinge) e mai precis aici, dar nu are predict_proba, deci --save trebuie sa aleaga logreg
+    code = ml_eval.main(["--featurizers", "char_wb25", "--classifiers", "svm,logreg", "--folds", "2",
+                         "--repeats", "1", "--workers", "1", "--model", model_file, "--out", out, "--save"])
+    assert code == 0
+    with open(out, "r", encoding="utf-8") as f:
+        report = json.load(f)
+    assert report["target"] == "online" and report["budget"]["require_proba"] is True
+    assert report["best"] == "char_wb25+logreg"
+
+    online = OnlineModel.load_or_bootstrap(data_file=DATA_FILE, model_file=model_file)
+    assert online.selection["candidate"] == "char_wb25+logreg"
+    assert online.pipeline["classifier_params"]["loss"] == "log_loss"
+    assert online.learn([(1, "doza de aluminiu", online.classes[0])]) == 1
+
+
+def test_selected_pipeline_survives_new_training_data(tmp_path):
+    with open(DATA_FILE, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    data_file = tmp_path / "data.json"
+    data_file.write_text(json.dumps(data), encoding="utf-8")
+    model_file = str(tmp_path / "online.pkl")
+    pipeline = ml_eval.candidates(["word1"], ["logreg"])["word1+logreg"]
+    OnlineModel.bootstrap(str(data_file), model_file, pipeline=pipeline, selection={"candidate": "word1+logreg"}).save()
+
+    data_file.write_text(json.dumps(data + [{"text": "capac de borcan", "label": data[0]["label"]}]), encoding="utf-8")
+    online = OnlineModel.load_or_bootstrap(str(data_file), model_file)
+    assert online.applied_id == 0 and online.dirty  # refacut pe setul nou ...
+    assert online.selection == {"candidate": "word1+logreg"}  # ... dar cu pipeline-ul ales
+    assert online.pipeline["classifier"] == "sgd"
+
+
+def test_default_online_model_is_used_without_selection(tmp_path):
+    online = OnlineModel.bootstrap(DATA_FILE, str(tmp_path / "online.pkl"))
+    online.save()
+    again = OnlineModel.load_or_bootstrap(DATA_FILE, str(tmp_path / "online.pkl"))
+    assert not again.dirty and again.selection is None
+    assert json.loads(json.dumps(again.pipeline)) == json.loads(json.dumps(ONLINE_PIPELINE))
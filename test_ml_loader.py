@@ -0,0 +1,41 @@
+import threading
+
+import pytest
+
+from ml_model import BackgroundLoader
+
+
+def test_loader_runs_in_background_and_keeps_the_bundle():
+    release = threading.Event()
+    seen = {}
+
+    def load():
+        seen["thread"] = threading.current_thread().name
+        release.wait(5)
+        return ("model", "vectorizer")
+
+    loader = BackgroundLoader(load=load, name="text-index-loader").start()
+    assert not loader.done.is_set() and loader.bundle is None  # start() nu asteapta incarcarea
+    with pytest.raises(TimeoutError, match="text-index-loader"):
+        loader.result(timeout=0.01)
+    release.set()
+    assert loader.result(timeout=5) == ("model", "vectorizer")
+    assert loader.done.is_set() and loader.error is None and loader.seconds >= 0
+    assert seen["thread"] == "text-index-loader"
+
+
+def test_default_thread_name():
+    loader = BackgroundLoader(load=lambda: None)
+    assert loader.name == loader._thread.name == "ml-loader"
+
+
+def test_load_failure_is_kept_for_the_ui():
+    def load():
+        raise OSError("recycle_model_online.npz lipseste")
+
+    loader = BackgroundLoader(load=load, name="point-index-loader").start()
+    assert loader.done.wait(5)
+    # UI-ul citeste .error dupa .done; result() ridica aceeasi eroare
+    assert isinstance(loader.error, OSError) and loader.bundle is None and loader.seconds is not None
+    with pytest.raises(OSError, match="lipseste"):
+        loader.result()
@@ -0,0 +1,110 @@
+import json
+import threading
+
+import pytest
+
+import perf_trace
+
+MS = 1_000_000  # ns
+
+
+@pytest.fixture(autouse=True)
+def tracing():
+    was = perf_trace.enabled()
+    perf_trace.reset()
+    perf_trace.enable(True)
+    yield
+    perf_trace.enable(was)
+    perf_trace.reset()
+
+
+def _record_ms(name, *durations_ms):
+    start = perf_trace._T0
+    for d in durations_ms:
+        perf_trace.record(name, start, start + int(d * MS))
+        start += int(d * MS) + MS
+
+
+def test_snapshot_counts_and_quantiles():
+    # 100 apeluri: 90 de 0.3 ms (bucket <=0.5), 9 de 7 ms (<=10), unul de 3000 ms (<=5000)
+    _record_ms("db.quiz_stats", *([0.3] * 90 + [7] * 9 + [3000]))
+    _record_ms("map.nearest", 0.04)
+    snap = perf_trace.snapshot()
+    st = snap["db.quiz_stats"]
+    assert st["count"] == 100
+    assert (st["min_ms"], st["max_ms"]) == (0.3, 3000.0)
+    assert st["total_ms"] == pytest.approx(90 * 0.3 + 9 * 7 + 3000)
+    assert (st["p50_ms"], st["p95_ms"]) == (0.5, 10)
+    assert st["histogram"] == {"<=0.5ms": 90, "<=10ms": 9, "<=5000ms": 1}
+    # percentila nu trece de maximul masurat; sortat dupa timpul total
+    assert snap["map.nearest"]["p50_ms"] == 0.04
+    assert list(snap) == ["db.quiz_stats", "map.nearest"]
+
+
+def test_quantile_overflow_bucket():
+    _record_ms("ml.train_model", 6000, 8000)
+    st = perf_trace.snapshot()["ml.train_model"]
+    assert st["p50_ms"] == 8000 and st["p95_ms"] == 8000
+    assert st["histogram"] == {">5000ms": 2}
+
+
+def test_traced_span_and_disabled():
+    @perf_trace.traced("app._ai_compute")
+    def work(x):
+        return x * 2
+
+    assert work(2) == 4
+    with perf_trace.span("db.flush"):
+        pass
+    perf_trace.enable(False)
+    work(3)
+    with perf_trace.span("db.flush"):
+        pass
+    snap = perf_trace.snapshot()
+    assert snap["app._ai_compute"]["count"] == 1 and snap["db.flush"]["count"] == 1
+
+
+def test_report_table():
+    assert "nimic masurat" in perf_trace.report()
+    _record_ms("db.get_stars", 1, 2)
+    _record_ms("db.quiz_stats", 10)
+    lines = perf_trace.report().splitlines()
+    assert "operatie" in lines[0]
+    assert lines[1].split()[:2] == ["db.quiz_stats", "1"] and lines[2].split()[:2] == ["db.get_stars", "2"]
+    assert len(perf_trace.report(top=1).splitlines()) == 2
+
+
+def test_export_json(tmp_path):
+    _record_ms("db.get_stars", 1)
+    data = json.loads(open(perf_trace.export_json(str(tmp_path / "perf.json")), encoding="utf-8").read())
+    assert data["enabled"] is True and data["buckets_ms"] == list(perf_trace.BUCKETS_MS)
+    assert data["spans"]["db.get_stars"]["count"] == 1
+
+
+def test_export_chrome_trace(tmp_path):
+    _record_ms("db.get_stars", 2)
+    worker = threading.Thread(target=_record_ms, args=("map.generate_map", 5), name="map-worker")
+    worker.start()
+    worker.join()
+    trace = json.loads(open(perf_trace.export_chrome_trace(str(tmp_path / "t.json")), encoding="utf-8").read())
+    assert trace["displayTimeUnit"] == "ms"
+    meta = [e for e in trace["traceEvents"] if e["ph"] == "M"]
+    spans = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    assert {e["args"]["name"] for e in meta} == {threading.current_thread().name, "map-worker"}
+    assert all(e["name"] == "thread_name" for e in meta)
+    by_name = {e["name"]: e for e in spans}
+    assert by_name["db.get_stars"]["ts"] == 0 and by_name["db.get_stars"]["dur"] == 2000  # microsecunde
+    assert by_name["map.generate_map"]["cat"] == "map" and by_name["map.generate_map"]["dur"] == 5000
+    assert by_name["db.get_stars"]["tid"] != by_name["map.generate_map"]["tid"]
+    assert {e["tid"] for e in meta} == {e["tid"] for e in spans}
+
+
+def test_reset_forgets_threads(tmp_path):
+    worker = threading.Thread(target=_record_ms, args=("map.generate_map", 5), name="old-worker")
+    worker.start()
+    worker.join()
+    perf_trace.reset()
+    _record_ms("db.get_stars", 1)
+    trace = json.loads(open(perf_trace.export_chrome_trace(str(tmp_path / "t.json")), encoding="utf-8").read())
+    names = {e["args"]["name"] for e in trace["traceEvents"] if e["ph"] == "M"}
+    assert names == {threading.current_thread().name}
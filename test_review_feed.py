@@ -0,0 +1,132 @@
+from types import SimpleNamespace
+
+from review_feed import CARD_GAP, CARD_HEIGHT, MAX_COMMENT, FeedState, ReviewFeed
+
+ROW = CARD_HEIGHT + CARD_GAP
+
+
+class FakeReviews:
+    # tabela reviews in memorie, cu aceleasi interogari keyset ca db.get_reviews_page / get_reviews_since
+    def __init__(self, n):
+        self.rows = [(i, f"user{i}", 1 + i % 5, f"comentariu {i}", "2024-03-02T10:00:00") for i in range(1, n + 1)]
+        self.calls = []
+
+    def page(self, before_id, limit):
+        self.calls.append(("page", before_id, limit))
+        older = [r for r in self.rows if before_id is None or r[0] < before_id]
+        return sorted(older, reverse=True)[:limit]
+
+    def newer(self, after_id):
+        self.calls.append(("newer", after_id))
+        return sorted((r for r in self.rows if r[0] > after_id), reverse=True)
+
+    def add(self, n):
+        start = self.rows[-1][0] + 1 if self.rows else 1
+        self.rows += [(i, f"user{i}", 5, "nou", "2024-03-03T10:00:00") for i in range(start, start + n)]
+
+
+def _feed(n, page_size=10):
+    db = FakeReviews(n)
+    return db, FeedState(db.page, db.newer, page_size)
+
+
+def test_keyset_paging_until_exhausted():
+    db, state = _feed(25)
+    state.reload()
+    assert [r[0] for r in state.rows] == list(range(25, 15, -1)) and not state.exhausted
+    state.load_more()
+    state.load_more()
+    assert [r[0] for r in state.rows] == list(range(25, 0, -1)) and state.exhausted
+    assert db.calls == [("page", None, 10), ("page", 16, 10), ("page", 6, 10)]
+    state.load_more()
+    assert len(db.calls) == 3  # epuizat: nu mai intreaba db-ul
+
+
+def test_exact_page_multiple_needs_one_empty_fetch():
+    db, state = _feed(20)
+    state.reload()
+    state.load_more()
+    assert not state.exhausted
+    state.load_more()
+    assert state.exhausted and len(state.rows) == 20
+
+
+def test_layout_loads_more_near_the_end():
+    db, state = _feed(100, page_size=20)
+    state.reload()
+    view_h = 3.5 * ROW
+    first, shift, slots = state.layout(view_h)
+    assert (first, shift, slots) == (0, 0.0, 5)
+    assert len(state.rows) == 20  # pagina a doua se cere doar cand ecranul ajunge la jumatatea paginii
+    state.scroll_by(4.5 * ROW, view_h)
+    assert state.layout(view_h) == (4, ROW / 2, 5) and len(state.rows) == 20
+    state.scroll_by(ROW, view_h)
+    assert state.layout(view_h)[0] == 5 and len(state.rows) == 40
+    assert db.calls[-1] == ("page", 81, 20)
+
+
+def test_scroll_is_clamped():
+    _, state = _feed(3)
+    state.reload()
+    view_h = 2 * ROW
+    state.scroll_by(-50, view_h)
+    assert state.offset == 0
+    state.scroll_by(100 * ROW, view_h)
+    assert state.offset == state.max_offset(view_h) == ROW
+    state.move_to(0.0, view_h)
+    assert state.offset == 0 and state.scrollbar(view_h) == (0.0, 2 / 3)
+    assert state.scrollbar(10 * ROW) == (0.0, 1.0)
+
+
+def test_load_newer_keeps_the_visible_cards():
+    db, state = _feed(30)
+    state.reload()
+    view_h = 3 * ROW
+    state.scroll_by(4 * ROW, view_h)
+    first = state.layout(view_h)[0]
+    shown = state.rows[first]
+    db.add(3)
+    assert state.load_newer() == 3
+    assert [r[0] for r in state.rows[:3]] == [33, 32, 31]
+    assert state.rows[state.layout(view_h)[0]] == shown
+    assert db.calls[-1] == ("newer", 30)
+    assert state.load_newer() == 0
+
+
+def test_load_newer_at_top_stays_at_top():
+    db, state = _feed(5)
+    state.reload()
+    db.add(2)
+    state.load_newer()
+    assert state.offset == 0 and state.rows[0][0] == 7
+
+
+class FakeLabel:
+    def __init__(self):
+        self.configured = []
+
+    def configure(self, **kw):
+        self.configured.append(kw["text"])
+
+
+def test_card_is_rebound_only_for_another_row():
+    card = SimpleNamespace(row_id=None, head=FakeLabel(), body=FakeLabel())
+    row = (7, "Ana", 4, "x" * 300, "2024-03-02T10:00:00")
+    ReviewFeed._bind_card(None, card, row)
+    ReviewFeed._bind_card(None, card, row)
+    assert card.row_id == 7 and len(card.head.configured) == 1
+    assert card.head.configured[0] == "Ana – ****☆"
+    assert len(card.body.configured[0]) == MAX_COMMENT and card.body.configured[0].endswith("…")
+    ReviewFeed._bind_card(None, card, (8, "Ion", 5, "scurt", "2024-03-02T10:00:00"))
+    assert card.head.configured[-1] == "Ion – *****" and card.body.configured[-1] == "scurt"
+
+
+def test_card_pool_size_depends_only_on_view_height():
+    _, state = _feed(500, page_size=50)
+    state.reload()
+    view_h = 4.2 * ROW
+    slots = {state.layout(view_h)[2]}
+    for _ in range(200):
+        state.scroll_by(ROW / 3, view_h)
+        slots.add(state.layout(view_h)[2])
+    assert slots == {6} and len(state.rows) > 50
@@ -0,0 +1,65 @@
+import threading
+import time
+
+import pytest
+
+from scheduler import TkScheduler
+
+
+class FakeTk:
+    # after() doar tine minte callback-urile; testul le ruleaza ca mainloop-ul Tk
+    def __init__(self):
+        self.calls = []
+
+    def after(self, ms, fn):
+        self.calls.append(fn)
+
+    def run_until(self, cond, timeout=5.0):
+        end = time.monotonic() + timeout
+        while not cond() and time.monotonic() < end:
+            calls, self.calls = self.calls, []
+            for fn in calls:
+                fn()
+            time.sleep(0.005)
+        return cond()
+
+
+@pytest.fixture
+def tasks():
+    tk = FakeTk()
+    tasks = TkScheduler(tk, workers=1, poll_ms=1)
+    yield tk, tasks
+    tasks.shutdown()
+
+
+def test_interactive_lane_does_not_wait_for_background(tasks):
+    tk, tasks = tasks
+    release = threading.Event()
+    done = []
+    tasks.submit(release.wait, 5, key="map-render", on_done=lambda _: done.append("map"))
+    tasks.submit(lambda: "sticla", key="ai-predict", lane="interactive", on_done=done.append)
+    assert tk.run_until(lambda: done == ["sticla"])
+    release.set()
+    assert tk.run_until(lambda: done == ["sticla", "map"])
+
+
+def test_replace_cancels_old_job(tasks):
+    tk, tasks = tasks
+    release = threading.Event()
+    done = []
+    tasks.submit(release.wait, 5, lane="interactive")
+    tasks.submit(lambda: "sti", key="ai-complete", lane="interactive", replace=True, on_done=done.append)
+    tasks.submit(lambda: "sticla", key="ai-complete", lane="interactive", replace=True, on_done=done.append)
+    release.set()
+    assert tk.run_until(lambda: not tasks.busy("ai-complete") and done)
+    assert done == ["sticla"]
+
+
+def test_errors_and_unknown_lane(tasks):
+    tk, tasks = tasks
+    errors = []
+    tasks.submit(lambda: 1 / 0, on_error=errors.append)
+    assert tk.run_until(lambda: errors)
+    assert isinstance(errors[0], ZeroDivisionError)
+    with pytest.raises(ValueError):
+        tasks.submit(print, lane="process")
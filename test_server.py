@@ -0,0 +1,105 @@
+import json
+import asyncio
+
+import pytest
+
+from db import DB
+from ml_model import DATA_FILE
+from ml_online import OnlineModel
+from server import GreenVisionService, MAX_BODY, connection_handler
+
+
+@pytest.fixture
+def service(tmp_path):
+    online = OnlineModel.bootstrap(data_file=DATA_FILE, model_file=str(tmp_path / "online.pkl"))
+    service = GreenVisionService(DB(str(tmp_path / "test.db")), online, workers=2)
+    yield service
+    service.close()
+
+
+def _request(method, path, body=b"", headers=()):
+    head = [f"{method} {path} HTTP/1.1", "Host: test", f"Content-Length: {len(body)}", *headers]
+    return ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body
+
+
+def _exchange(service, raw, timeout=10.0):
+    # trimite bytes-ii asa cum sunt si citeste pana cand serverul inchide conexiunea
+    async def run():
+        server = await asyncio.start_server(connection_handler(service), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(raw)
+            await writer.drain()
+            data = await asyncio.wait_for(reader.read(), timeout)
+            writer.close()
+            return data
+    return asyncio.run(run())
+
+
+def _responses(data):
+    out = []
+    for part in data.split(b"HTTP/1.1 ")[1:]:
+        head, _, body = part.partition(b"\r\n\r\n")
+        length = int([h for h in head.split(b"\r\n") if h.lower().startswith(b"content-length:")][0].split(b":")[1])
+        out.append((int(head[:3]), json.loads(body[:length] or b"null")))
+    return out
+
+
+def _one(service, method, path, body=b"", headers=()):
+    responses = _responses(_exchange(service, _request(method, path, body, ("Connection: close", *headers))))
+    assert len(responses) == 1
+    return responses[0]
+
+
+def test_classify_ok_and_cached(service):
+    body = json.dumps({"text": "sticla de plastic"}).encode()
+    raw = _request("POST", "/classify", body) * 2 + _request("GET", "/health", headers=("Connection: close",))
+    (s1, r1), (s2, r2), (s3, health) = _responses(_exchange(service, raw))
+    assert (s1, s2, s3) == (200, 200, 200)
+    assert r1 == r2 and r1["label"] in service.online.classes
+    assert (health["cache"]["hits"], health["cache"]["misses"]) == (1, 1)
+
+
+@pytest.mark.parametrize("method, path, body, status", [
+    ("GET", "/nu-exista", b"", 404),
+    ("GET", "/classify", b"", 405),
+    ("POST", "/classify", b"{nu e json", 400),
+    ("POST", "/classify", b"[1, 2]", 400),
+    ("POST", "/classify", b'{"text": 5}', 400),
+    ("POST", "/classify/batch", b'{"texts": ["a", 1]}', 400),
+    ("POST", "/classify/batch", b'{"texts": ["a"], "top_k": 0}', 400),
+    ("GET", "/points/nearest?lat=45.7", b"", 400),
+    ("GET", "/reviews?limit=abc", b"", 400),
+    ("POST", "/reviews", b'{"nickname": "x", "rating": 9, "comment": "c"}', 400),
+    ("GET", "/map", b"", 503),
+])
+def test_error_paths(service, method, path, body, status):
+    got, payload = _one(service, method, path, body)
+    assert got == status
+    assert isinstance(payload["error"], str)
+
+
+def test_body_too_large(service):
+    raw = b"POST /classify HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % (MAX_BODY + 1)
+    [(status, payload)] = _responses(_exchange(service, raw))
+    assert status == 413
+
+
+def test_bad_request_line(service):
+    [(status, _)] = _responses(_exchange(service, b"GARBAGE\r\n\r\n"))
+    assert status == 400
+
+
+def test_chunked_body_rejected_and_connection_closed(service):
+    chunk = json.dumps({"text": "doza"}).encode()
+    raw = (b"POST /classify HTTP/1.1\r\nHost: test\r\nTransfer-Encoding: chunked\r\n\r\n"
+           + b"%x\r\n" % len(chunk) + chunk + b"\r\n0\r\n\r\n")
+    # un singur raspuns (411), iar bucatile corpului nu sunt interpretate ca o a doua cerere
+    [(status, payload)] = _responses(_exchange(service, raw))
+    assert status == 411 and "Transfer-Encoding" in payload["error"]
+
+
+def test_keep_alive_serves_several_requests(service):
+    raw = _request("GET", "/health") * 3 + _request("GET", "/health", headers=("Connection: close",))
+    assert [s for s, _ in _responses(_exchange(service, raw))] == [200] * 4
@@ -0,0 +1,52 @@
+import sys
+import types
+import builtins
+
+import pytest
+
+import startup
+
+
+@pytest.fixture
+def clean(monkeypatch):
+    monkeypatch.setattr(startup, "MARKS", [])
+    monkeypatch.setattr(startup, "IMPORTS", [])
+    for name in startup.HEAVY_MODULES:
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    yield monkeypatch
+    startup.stop_profiling()
+
+
+def test_mark_and_report_list_heavy_modules(clean):
+    startup.mark("fereastra Tk creata")
+    clean.setitem(sys.modules, "sklearn", types.ModuleType("sklearn"))
+    clean.setitem(sys.modules, "folium", types.ModuleType("folium"))
+    startup.mark("model ML gata")
+
+    (first, t1, loaded1), (second, t2, loaded2) = startup.MARKS
+    assert (first, loaded1) == ("fereastra Tk creata", [])
+    assert (second, loaded2) == ("model ML gata", ["sklearn", "folium"])
+    assert 0 <= t1 <= t2
+
+    lines = startup.report().splitlines()
+    assert lines[0].startswith(" Pornire GreenVision")
+    assert "fereastra Tk creata" in lines[1] and lines[1].endswith("module grele: -")
+    assert "model ML gata" in lines[2] and lines[2].endswith("module grele: sklearn, folium")
+    assert len(lines) == 3  # fara importuri masurate nu apare profilul
+
+
+def test_import_profile_is_removed_after_first_window(clean):
+    clean.delitem(sys.modules, "colorsys", raising=False)
+    startup.profile_imports()
+    assert builtins.__import__ is startup._timed_import
+    __import__("colorsys")  # trece prin builtins.__import__, ca un import obisnuit
+    startup.stop_profiling()
+    assert builtins.__import__ is startup._original_import
+    assert [name for name, *_ in startup.IMPORTS] == ["colorsys"]
+    assert "colorsys" in startup.report()
+
+    clean.delitem(sys.modules, "colorsys")
+    __import__("colorsys")
+    assert len(startup.IMPORTS) == 1  # dupa stop_profiling importurile nu mai sunt masurate
+    startup.stop_profiling()  # a doua oara nu schimba nimic
+    assert builtins.__import__ is startup._original_import
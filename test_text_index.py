@@ -0,0 +1,138 @@
+import random
+from collections import Counter
+
+import pytest
+
+import text_index
+from ml_model import normalize_text
+from text_index import TextIndex, build_index, open_index, trigrams
+
+WORDS = ["sticla", "plastic", "doza", "aluminiu", "hartie", "carton", "baterie", "cutie", "borcan", "ziar",
+         "punga", "folie", "telefon", "bec", "ulei", "uzat", "de", "mic", "mare", "verde"]
+LABELS = ["Plastic", "Hârtie", "Sticlă", "Metal", "Electronice"]
+
+
+def _corpus(seed, n):
+    rnd = random.Random(seed)
+    return [(" ".join(rnd.choice(WORDS) for _ in range(rnd.randint(1, 4))), rnd.choice(LABELS)) for _ in range(n)]
+
+
+def _dice(a, b):
+    ga, gb = trigrams(a), trigrams(b)
+    return 2 * len(ga & gb) / (len(ga) + len(gb))
+
+
+def _brute_force(corpus, query, label=None):
+    labels = {}
+    for text, lab in corpus:
+        labels.setdefault(normalize_text(text), Counter())[lab] += 1
+    query = normalize_text(query)
+    return sorted((round(_dice(query, t), 4) for t, c in labels.items()
+                   if label is None or c.most_common(1)[0][0] == label), reverse=True)
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    corpus = _corpus(3, 600)
+    path = str(tmp_path / "index.npz")
+    build_index(corpus, path)
+    return corpus, TextIndex(path)
+
+
+def _queries():
+    rnd = random.Random(5)
+    queries = ["sitcla plastik", "doza alumniu", "ziar", "telefon mare verde", "bateri"]
+    for _ in range(20):
+        words = [rnd.choice(WORDS) for _ in range(rnd.randint(1, 3))]
+        # o litera stearsa dintr-un cuvant (greseala de tastare)
+        w = rnd.randrange(len(words))
+        if len(words[w]) > 3:
+            c = rnd.randrange(len(words[w]))
+            words[w] = words[w][:c] + words[w][c + 1:]
+        queries.append(" ".join(words))
+    return queries
+
+
+@pytest.mark.parametrize("label", [None, "Metal"])
+def test_similar_matches_brute_force_dice(corpus, label):
+    corpus, index = corpus
+    for query in _queries():
+        for k in (1, 5):
+            got = index.similar(query, k=k, label=label)
+            expected = _brute_force(corpus, query, label)[:k]
+            # fereastra cea mai larga (Dice >= WINDOWS[0]) e exacta; sub prag indexul poate rata texte
+            if expected[-1] >= text_index.WINDOWS[0]:
+                assert [s.score for s in got] == expected
+            for s in got:
+                assert s.score == round(_dice(normalize_text(query), s.text), 4)
+                assert label is None or s.label == label
+
+
+def test_similar_with_long_lists(corpus, monkeypatch):
+    corpus, index = corpus
+    # listele trigramelor nu mai incap in MAX_SCAN: cele lungi se verifica prin cautare binara
+    monkeypatch.setattr(text_index, "MAX_SCAN", 40)
+    for query in _queries():
+        got = index.similar(query, k=3)
+        expected = _brute_force(corpus, query)[:3]
+        if expected[-1] >= text_index.WINDOWS[-1]:
+            assert [s.score for s in got] == expected
+    text = normalize_text(corpus[0][0])
+    assert index.similar(text, k=1)[0][:2] == (1.0, text)
+
+
+def test_long_query_does_not_overflow(corpus):
+    _, index = corpus
+    rnd = random.Random(1)
+    query = "sticla plastic " + "".join(chr(rnd.randint(0x4E00, 0x9FFF)) for _ in range(40000))
+    assert len(trigrams(normalize_text(query))) > 32767
+    # niciun text cunoscut nu are marime apropiata de cerere
+    assert index.similar(query, k=3) == []
+
+
+def test_suggest(corpus):
+    corpus, index = corpus
+    text = normalize_text(corpus[0][0])
+    assert index.suggest(text) is None
+    assert index.suggest("qqqq xxxx") is None
+    assert index.similar("", k=3) == [] and index.similar("sticla", k=0) == []
+
+
+def test_open_index_rebuilds_on_change(tmp_path):
+    data = tmp_path / "data.jsonl"
+    data.write_text('{"text": "sticla de plastic", "label": "Plastic"}\n', encoding="utf-8")
+    index = open_index(str(data), str(tmp_path / "cache"))
+    assert len(index) == 1
+    data.write_text('{"text": "sticla de plastic", "label": "Plastic"}\n'
+                    '{"text": "doza aluminiu", "label": "Metal"}\n', encoding="utf-8")
+    index = open_index(str(data), str(tmp_path / "cache"))
+    assert len(index) == 2 and index.similar("doza alumniu", k=1)[0].label == "Metal"
+
+
+def _completions(corpus, prefix):
+    counts = Counter(normalize_text(t) for t, _ in corpus)
+    found = {}
+    for text, n in counts.items():
+        words = text.split(" ")
+        starts = [" ".join(words[j:]) for j in range(min(len(words), text_index.PREFIX_WORDS))]
+        if any(s.startswith(prefix) for s in starts):
+            found[text] = n
+    return found
+
+
+def test_complete_matches_brute_force(corpus):
+    corpus, index = corpus
+    for prefix in ("st", "alu", "doza al", "verde ", "mare mic", "ca", "zzz"):
+        for k in (1, 5, 50):
+            got = index.complete(prefix, k=k)
+            expected = _completions(corpus, prefix)
+            assert len(got) == min(k, len(expected))
+            assert all(expected[c.text] == c.count for c in got)
+            # la egalitate de frecventa ordinea depinde de pozitia prefixului, deci se compara doar frecventele
+            assert [c.count for c in got] == sorted(expected.values(), reverse=True)[:k]
+
+
+def test_complete_trailing_space(corpus):
+    _, index = corpus
+    assert all(c.text.startswith("de ") or " de " in c.text for c in index.complete("de ", k=20))
+    assert index.complete("", k=3) == [] and index.complete("st", k=0) == []
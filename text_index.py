@@ -0,0 +1,328 @@
+import os #stat (mtime/marime) pe sursa, replace atomic
+import glob #curatare indecsi vechi
+import json #sursa (ml_recycle_data.json) + meta-datele indexului
+import hashlib #cheia indexului = hash-ul fisierului sursa
+import tempfile #scriere atomica
+from array import array
+from collections import Counter, namedtuple
+
+import numpy as np # type: ignore
+
+from ml_model import BASE_DIR, DATA_FILE, normalize_text
+
+# index inversat pe trigrame de caractere peste textele de antrenare: pt o cerere cu greseli ("sitcla", "dosa aluminu")
+# gaseste cele mai asemanatoare texte cunoscute (cu label-ul lor) fara sa compare cererea cu tot corpusul
+INDEX_DIR = os.path.join(BASE_DIR, ".ml_cache")
+FORMAT_VERSION = 3
+# cate id-uri (maxim) se citesc din listele de trigrame ale unei cereri; la 1M texte listele trigramelor comune
+# ("de ", " pl") ar costa cat tot corpusul, asa ca se citesc doar texte de marime apropiata si intai listele scurte
+MAX_SCAN = 30000
+# cati candidati (maxim) se verifica in listele prea lungi ca sa fie citite (cand nici fereastra cea mai stransa
+# nu incape in MAX_SCAN)
+CANDIDATES = 4096
+# pragurile Dice pt ferestrele de marime incercate (de la cea mai larga la cea mai stransa); sub prag rezultatele
+# pot rata texte de marime foarte diferita, dar acelea oricum nu sunt "asemanatoare"
+WINDOWS = np.array([0.3, 0.45, 0.6, 0.75])
+# de la ce scor (Dice pe trigrame) un text cunoscut e propus ca "ai vrut sa scrii"
+SUGGEST_MIN = 0.5
+
+# pt autocomplete: fiecare text se poate completa de la inceput sau de la unul din primele PREFIX_WORDS cuvinte
+# ("alum" -> "doza aluminiu")
+PREFIX_WORDS = 4
+
+# un rezultat din similar(): scor 0..1, textul cunoscut (normalizat), label-ul majoritar, de cate ori apare in corpus
+Similar = namedtuple("Similar", "score text label count")
+# un rezultat din complete(): textul cunoscut (normalizat) + ponderea lui (de cate ori apare)
+Completion = namedtuple("Completion", "text count")
+
+
+# params: text (str) deja normalizat
+# ce face: trigramele distincte ale textului, cu un spatiu la capete (ca si cuvintele scurte sa aiba trigrame)
+def trigrams(text):
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+# params: text (str) -> ce a scris userul pana acum
+# ce face: prefixul normalizat ca textele din index; un spatiu la final ramane ("pet " nu mai completeaza "petarda")
+def normalize_prefix(text):
+    key = normalize_text(text)
+    return key + " " if key and text[-1:].isspace() else key
+
+
+# params: path (str)
+# ce face: (mtime_ns, marime) a fisierului sau None daca lipseste
+def _stat(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+# params: path (str)
+# ce face: sha256 (hex) al fisierului
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+# params: path (str) -> .json (lista ca ml_recycle_data.json), .jsonl sau .csv (ca la ml_stream.py)
+# ce face: generator (text, label)
+def read_examples(path):
+    if path.lower().endswith((".jsonl", ".csv")):
+        from ml_stream import read_labeled
+        yield from read_labeled(path)
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for d in json.load(f):
+            yield d["text"], d["label"].strip()
+
+
+# params: examples (iterable[(text, label)]), out_path (str), source (dict) -> stat/hash-ul sursei, pt meta
+# ce face: scrie indexul .npz (fara pickle): textele unice normalizate (blob + offset-uri), label-ul majoritar si
+#          frecventa fiecaruia, trigramele sortate (blob) si listele de id-uri pe trigrama (CSR: ptr + ids)
+def build_index(examples, out_path, source=None):
+    seen = {}  # text normalizat -> Counter(label)
+    for text, label in examples:
+        key = normalize_text(text)
+        if key and label:
+            seen.setdefault(key, Counter())[label] += 1
+    # id-urile textelor in ordinea numarului de trigrame: o fereastra de marimi e un interval de id-uri,
+    # deci in fiecare lista (sortata dupa id) se poate taia doar felia cu texte de marime apropiata de cerere
+    texts = sorted(seen, key=lambda t: (len(trigrams(t)), t))
+    labels = sorted({label for c in seen.values() for label in c})
+    label_id = {label: i for i, label in enumerate(labels)}
+
+    gram_id = {}
+    gram_of, ids = array("i"), array("i")  # ~20 trigrame pe text: array-uri compacte, nu liste de int-uri
+    for i, text in enumerate(texts):
+        for g in trigrams(text):
+            j = gram_id.get(g)
+            if j is None:
+                j = gram_id[g] = len(gram_id)
+            gram_of.append(j)
+            ids.append(i)
+    grams = sorted(gram_id)
+    # id-urile trigramelor renumerotate in ordinea sortata, apoi postarile grupate pe trigrama (id-urile textelor
+    # raman crescatoare in fiecare lista datorita sortarii stabile, deci se poate cauta binar in ele)
+    rank = np.empty(len(grams), dtype=np.int32)
+    rank[[gram_id[g] for g in grams]] = np.arange(len(grams), dtype=np.int32)
+    gram_of = rank[np.frombuffer(gram_of, dtype=np.int32)]
+    ids = np.frombuffer(ids, dtype=np.int32)
+    order = np.argsort(gram_of, kind="stable")
+    postings = ids[order]
+    ptr = np.zeros(len(grams) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(gram_of, minlength=len(grams)), out=ptr[1:])
+    # int32: marimea cererii se aduna cu sizes (q + sizes), iar un text sau o cerere lunga trece de 32767 trigrame
+    sizes = np.bincount(ids, minlength=len(texts)).astype(np.int32)
+
+    # intrarile pt autocomplete: (text, offset in bytes al cuvantului) sortate dupa textul de la offset incolo;
+    # ordinea bytes-ilor utf-8 e ordinea caracterelor, deci se poate cauta binar direct in blob
+    encoded = [t.encode("utf-8") for t in texts]
+    entries = sorted((b[o:], i, o) for i, b in enumerate(encoded)
+                     for o in ([0] + [j + 1 for j, c in enumerate(b) if c == 32])[:PREFIX_WORDS])
+    prefix_ids = np.array([i for _, i, _ in entries], dtype=np.int32)
+    prefix_offs = np.array([o for _, _, o in entries], dtype=np.int32)
+    del entries
+
+    blob = b"\n".join(encoded)
+    offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+    if texts:
+        np.cumsum([len(b) + 1 for b in encoded], out=offsets[1:])
+    meta = {"format": FORMAT_VERSION, "labels": labels, "source": source or {}}
+    with open(out_path, "wb") as f:
+        np.savez(f,
+                 meta=np.frombuffer(json.dumps(meta, ensure_ascii=False).encode("utf-8"), dtype=np.uint8),
+                 texts=np.frombuffer(blob, dtype=np.uint8), offsets=offsets,
+                 labels=np.array([label_id[seen[t].most_common(1)[0][0]] for t in texts], dtype=np.int16),
+                 counts=np.array([sum(seen[t].values()) for t in texts], dtype=np.int32),
+                 sizes=sizes, grams=np.frombuffer("\n".join(grams).encode("utf-8"), dtype=np.uint8),
+                 gram_ptr=ptr, postings=postings, prefix_ids=prefix_ids, prefix_offs=prefix_offs)
+
+
+class TextIndex:
+    # params: path (str) -> fisierul .npz scris de build_index
+    # ce face: cautare de texte asemanatoare: trigramele cererii -> din lista fiecareia doar felia cu texte de marime
+    #          apropiata (max MAX_SCAN id-uri in total) -> numarul de trigrame comune -> scor Dice exact. daca feliile nu
+    #          incap, cele lungi se verifica prin cautare binara doar pt cei mai buni CANDIDATES. costul depinde de
+    #          MAX_SCAN, nu de marimea corpusului; textele raman un blob utf-8 decodat doar pt rezultate
+    def __init__(self, path):
+        with np.load(path, allow_pickle=False) as z:
+            meta = json.loads(z["meta"].tobytes().decode("utf-8"))
+            if meta.get("format") != FORMAT_VERSION:
+                raise ValueError(f"{path}: format de index necunoscut ({meta.get('format')})")
+            self._blob = z["texts"].tobytes()
+            self._offsets = z["offsets"]
+            self._labels = z["labels"]
+            self._counts = z["counts"]
+            self._sizes = z["sizes"]
+            gram_blob = z["grams"].tobytes().decode("utf-8")
+            self._ptr = z["gram_ptr"]
+            self._postings = z["postings"]
+            self._prefix_ids = z["prefix_ids"]
+            self._prefix_offs = z["prefix_offs"]
+        self.path = path
+        self.source = meta.get("source", {})
+        self.labels = meta["labels"]
+        grams = gram_blob.split("\n") if gram_blob else []
+        self._gram_row = dict(zip(grams, range(len(grams))))
+        # primul id cu fiecare marime (numar de trigrame); sizes e crescator datorita ordinii din build_index
+        # (int32 ca postarile: searchsorted cu alt tip ar converti toata lista la fiecare cautare)
+        self._size_start = np.searchsorted(self._sizes, np.arange(int(self._sizes.max(initial=0)) + 2)).astype(np.int32)
+
+    # params: data_file (str), index_dir (str)
+    # ce face: indexul pt fisierul de date curent (reconstruit doar daca datele s-au schimbat)
+    @classmethod
+    def from_file(cls, data_file=DATA_FILE, index_dir=INDEX_DIR):
+        return open_index(data_file, index_dir)
+
+    def __len__(self):
+        return len(self._counts)
+
+    # params: i (int)
+    # ce face: textul normalizat cu id-ul i (decodat din blob doar la cerere)
+    def text(self, i):
+        return self._blob[self._offsets[i]:self._offsets[i + 1] - 1].decode("utf-8")
+
+    # params: text (str), k=5 (int), label=None (str) -> doar exemple cu label-ul dat (ex: categoria prezisa)
+    # ce face: cele mai asemanatoare k texte cunoscute, sortate dupa scor (list[Similar]); [] daca nicio trigrama
+    #          a cererii nu apare in corpus
+    def similar(self, text, k=5, label=None):
+        query = normalize_text(text)
+        grams = trigrams(query) if query else set()
+        rows = [r for r in map(self._gram_row.get, grams) if r is not None]
+        if not rows or k <= 0:
+            return []
+        q = len(grams)
+        # ferestre de marimi: un text cu Dice >= t are intre q*t/(2-t) si q*(2-t)/t trigrame. se alege cea mai larga
+        # pt care feliile incap in MAX_SCAN (la corpusuri mici ramane cea mai larga, la 1M texte se strange)
+        top = len(self._size_start) - 1
+        lo = np.minimum(np.ceil(q * WINDOWS / (2 - WINDOWS)).astype(np.int64), top)
+        hi = np.minimum((q * (2 - WINDOWS) / WINDOWS).astype(np.int64) + 1, top)
+        bounds = np.concatenate((self._size_start[lo], self._size_start[hi]))
+        postings = [self._postings[self._ptr[r]:self._ptr[r + 1]] for r in rows]
+        cuts = np.array([p.searchsorted(bounds) for p in postings])
+        n = len(WINDOWS)
+        fits = np.flatnonzero((cuts[:, n:] - cuts[:, :n]).sum(axis=0) <= MAX_SCAN)
+        w = fits[0] if len(fits) else n - 1
+        slices = [p[c[w]:c[n + w]] for p, c in zip(postings, cuts)]
+        slices.sort(key=len)
+        chunks, scanned = [], 0
+        for piece in slices:
+            if chunks and scanned + len(piece) > MAX_SCAN:
+                break
+            chunks.append(piece)
+            scanned += len(piece)
+        rest = slices[len(chunks):]
+        ids, hits = np.unique(np.concatenate(chunks), return_counts=True)
+        if label is not None:
+            keep = self._labels[ids] == (self.labels.index(label) if label in self.labels else -1)
+            ids, hits = ids[keep], hits[keep]
+        # feliile prea lungi ramase se verifica (cautare binara, sunt sortate) doar pt candidatii care mai pot intra in
+        # top k: scorul maxim posibil (daca toate feliile ramase ar fi comune) >= al k-lea cel mai bun scor sigur
+        size = q + self._sizes[ids]
+        for left, piece in enumerate(rest[::-1], 1):
+            if len(ids) > k:
+                low = hits / size
+                keep = (hits + left) / size >= np.partition(low, len(low) - k)[len(low) - k]
+                ids, hits, size = ids[keep], hits[keep], size[keep]
+                if len(ids) > CANDIDATES:
+                    pick = np.argpartition(-(hits + left) / size, CANDIDATES - 1)[:CANDIDATES]
+                    ids, hits, size = ids[pick], hits[pick], size[pick]
+            pos = np.minimum(piece.searchsorted(ids), len(piece) - 1)
+            hits = hits + (piece[pos] == ids)
+        # Dice pe trigrame: 2 * |comune| / (|cerere| + |text|)
+        scores = 2.0 * hits / (q + self._sizes[ids])
+        order = np.lexsort((-self._counts[ids], -scores))[:k]
+        return [Similar(round(float(scores[j]), 4), self.text(int(ids[j])), self.labels[self._labels[ids[j]]],
+                        int(self._counts[ids[j]])) for j in order]
+
+    # params: key (bytes)
+    # ce face: prima pozitie din intrarile de autocomplete al carei text (de la offset) e >= key (cautare binara)
+    def _prefix_search(self, key):
+        ids, offs, offsets, blob = self._prefix_ids, self._prefix_offs, self._offsets, self._blob
+        lo, hi = 0, len(ids)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            i = ids[mid]
+            if blob[offsets[i] + offs[mid]:offsets[i + 1] - 1] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    # params: prefix (str) -> ce a scris userul, k=5 (int)
+    # ce face: textele cunoscute care incep cu prefixul (sau au un cuvant care incepe cu el), cele mai frecvente primele;
+    #          la egalitate cele care incep cu prefixul, apoi cele scurte (list[Completion])
+    def complete(self, prefix, k=5):
+        key = normalize_prefix(prefix).encode("utf-8")
+        if not key or k <= 0:
+            return []
+        # 0xff nu apare in utf-8: tot ce incepe cu key e intre key si key + 0xff
+        lo, hi = self._prefix_search(key), self._prefix_search(key + b"\xff")
+        ids, offs = self._prefix_ids[lo:hi], self._prefix_offs[lo:hi]
+        weight = self._counts[ids].astype(np.int64) * 2 + (offs == 0)
+        if len(ids) > 4 * k:
+            pick = np.argpartition(-weight, 4 * k - 1)[:4 * k]
+            ids, weight = ids[pick], weight[pick]
+        found, seen = [], set()
+        for j in np.lexsort((ids, self._sizes[ids], -weight)):
+            i = int(ids[j])
+            if i not in seen:
+                seen.add(i)
+                found.append(Completion(self.text(i), int(self._counts[i])))
+                if len(found) == k:
+                    break
+        return found
+
+    # params: text (str), found (list[Similar] sau None) -> rezultatul lui similar(text) daca e deja calculat,
+    #         min_score=SUGGEST_MIN (float)
+    # ce face: "ai vrut sa scrii ...?": cel mai apropiat text cunoscut daca e destul de apropiat si nu e chiar cererea
+    def suggest(self, text, found=None, min_score=SUGGEST_MIN):
+        best = self.similar(text, k=1) if found is None else found
+        if best and best[0].score >= min_score and best[0].text != normalize_text(text):
+            return best[0]
+        return None
+
+
+# params: data_file (str), index_dir (str)
+# ce face: deschide indexul pt datele curente; il (re)construieste doar daca s-au schimbat.
+#          daca mtime/marimea sursei sunt cele din meta nu se citeste deloc sursa; altfel decide hash-ul
+def open_index(data_file=DATA_FILE, index_dir=INDEX_DIR):
+    stat = _stat(data_file)
+    if stat is None:
+        raise FileNotFoundError(data_file)
+    pattern = os.path.join(index_dir, f"{os.path.basename(data_file)}-*.npz")
+    for path in sorted(glob.glob(pattern), key=os.path.getmtime, reverse=True)[:1]:
+        try:
+            index = TextIndex(path)
+        except (OSError, ValueError, KeyError):
+            continue
+        if (index.source.get("mtime_ns"), index.source.get("size")) == stat:
+            return index
+
+    sha = _sha256(data_file)
+    path = os.path.join(index_dir, f"{os.path.basename(data_file)}-{sha[:16]}.npz")
+    source = {"path": os.path.basename(data_file), "sha256": sha, "mtime_ns": stat[0], "size": stat[1]}
+    os.makedirs(index_dir, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".tmp-", suffix=".npz", dir=index_dir)
+    os.close(fd)
+    try:
+        # acelasi continut (ex: fisier copiat din nou) se reconstruieste oricum: e rar si tine stat-ul la zi
+        build_index(read_examples(data_file), tmp, source)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    for old in glob.glob(pattern):
+        if os.path.abspath(old) != os.path.abspath(path):
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+    return TextIndex(path)